@@ -6,8 +6,10 @@
 import os
 from app import create_app
 
-# Crear la aplicación
-app = create_app()
+# Crear la aplicación (los procesos del pool de generación importan este
+# módulo como __mp_main__ y crean su propia aplicación sin hilos de fondo)
+if __name__ != "__mp_main__":
+    app = create_app()
 
 if __name__ == "__main__":
     # Obtener configuración del entorno
@@ -1,11 +1,17 @@
 import os
-import logging
 from flask import Flask
 from config.settings import get_config
 
 
-def create_app():
-    """Factory para crear la aplicación Flask"""
+def create_app(config_overrides: dict = None, background_services: bool = True):
+    """
+    Factory para crear la aplicación Flask
+
+    Args:
+        config_overrides: Valores que reemplazan la configuración (opcional)
+        background_services: Iniciar hilos en segundo plano (cola de copias).
+            Los procesos auxiliares (pool de generación, CLI) lo desactivan.
+    """
 
     BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
@@ -18,63 +24,197 @@ def create_app():
     # Cargar configuración
     config_class = get_config()
     app.config.from_object(config_class)
+    app.config.update(config_overrides or {})
     config_class.init_app(app)
 
     # Configurar logging
     setup_logging(app)
 
+    # Sesiones en el servidor
+    register_sessions(app)
+
+    # Métricas de latencia por etapa y por ruta
+    register_metrics(app)
+
+    # Perfilado opcional de peticiones
+    register_profiler(app)
+
     # Registrar blueprints
     register_blueprints(app)
 
     # Registrar filtros de templates
     register_template_filters(app)
 
+    # Bytecode de plantillas Jinja compartido entre procesos
+    register_jinja_cache(app)
+
+    # Caché HTTP de páginas y estáticos
+    register_http_cache(app)
+
+    # Definiciones de checklists con recarga en caliente
+    register_checklists(app)
+
+    # Caché de plantillas Excel
+    register_template_cache(app)
+
+    # Tiempo máximo y circuito para la compartida
+    register_circuit_breaker(app)
+
+    # Configurar pool de generación de Excel
+    register_generation_pool(app)
+
+    # Registro indexado de envíos
+    register_submission_store(app)
+
+    # Iniciar cola de copias a red
+    if background_services:
+        register_copy_queue(app)
+
+    # Retención del directorio de salida (programada solo con hilos de fondo)
+    register_retention(app, programar=background_services)
+
+    # Sincronización periódica con la compartida
+    register_sync(app, programar=background_services)
+
+    # Importaciones, plantillas Jinja y workbooks antes de la primera petición
+    register_warmup(app)
+
     app.logger.info("Aplicación iniciada correctamente")
 
     return app
 
 
 def setup_logging(app):
-    """Configurar sistema de logs"""
-    import os
+    """Configurar sistema de logs (cola en segundo plano y archivo rotativo)"""
+    from app.services.log_pipeline import configurar_logger
 
-    log_level = getattr(logging, app.config["LOG_LEVEL"])
+    configurar_logger(app.logger, app.config)
 
-    # Asegurar que el directorio de logs existe
-    log_file_path = app.config["LOG_FILE"]
-    log_dir = os.path.dirname(log_file_path)
 
-    if log_dir and not os.path.exists(log_dir):
-        os.makedirs(log_dir, exist_ok=True)
+def register_sessions(app):
+    """Configurar el almacén de sesiones del servidor"""
+    from app.services.session_store import SesionesServidor
 
-    # Formato de logs
-    formatter = logging.Formatter(
-        "[%(asctime)s] %(levelname)s in %(module)s: %(message)s"
-    )
+    SesionesServidor.init_app(app)
+
+
+def register_metrics(app):
+    """Configurar el registro de métricas"""
+    from app.services.metrics import metricas
 
-    # Handler para archivo
-    file_handler = logging.FileHandler(log_file_path)
-    file_handler.setLevel(log_level)
-    file_handler.setFormatter(formatter)
+    metricas.init_app(app)
 
-    # Handler para consola
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(log_level)
-    console_handler.setFormatter(formatter)
 
-    # Agregar handlers
-    app.logger.addHandler(file_handler)
-    app.logger.addHandler(console_handler)
-    app.logger.setLevel(log_level)
+def register_profiler(app):
+    """Configurar el perfilado de peticiones por muestreo"""
+    from app.services.profiler import profiler
+
+    profiler.init_app(app)
 
 
 def register_blueprints(app):
     """Registrar blueprints de la aplicación"""
     from app.routes.main import main_bp
     from app.routes.checklist import checklist_bp
+    from app.routes.api import api_bp
 
     app.register_blueprint(main_bp)
     app.register_blueprint(checklist_bp)
+    app.register_blueprint(api_bp)
+
+
+def register_checklists(app):
+    """Cargar las definiciones de checklists y programar su recarga"""
+    from app.models.checklist_data import configurar
+
+    configurar(
+        app.config.get("CHECKLISTS_DIR"),
+        app.config.get("CHECKLISTS_RELOAD_INTERVAL", 0),
+        app.logger,
+    )
+
+
+def register_template_cache(app):
+    """Configurar el caché de plantillas Excel"""
+    from app.models.checklist_data import al_recargar
+    from app.services.template_cache import TemplateCache
+    from app.services.template_layout import LayoutCache
+
+    TemplateCache.init_app(app)
+
+    if app.config.get("TEMPLATE_CACHE_WARMUP", True):
+        # Validar de nuevo las plantillas contra las definiciones recargadas
+        al_recargar(
+            "layouts",
+            lambda definiciones: LayoutCache.precargar(
+                app.config["TEMPLATES_DIR"], definiciones.checklists, app.logger
+            ),
+        )
+
+
+def register_generation_pool(app):
+    """Configurar el pool acotado de generación de Excel"""
+    from app.services.generation_pool import generation_pool
+
+    generation_pool.init_app(app)
+
+
+def register_submission_store(app):
+    """Configurar el registro de envíos"""
+    from app.services.submission_store import submission_store
+
+    submission_store.init_app(app)
+
+
+def register_circuit_breaker(app):
+    """Configurar el circuito de acceso a la carpeta compartida"""
+    from app.services.circuit_breaker import circuito_red
+
+    circuito_red.init_app(app)
+
+
+def register_copy_queue(app):
+    """Configurar la cola de copias a la carpeta compartida"""
+    from app.services.copy_queue import copy_queue
+
+    copy_queue.init_app(app)
+
+
+def register_retention(app, programar: bool = True):
+    """Configurar la limpieza programada del directorio de salida"""
+    from app.services.retention import retencion
+
+    retencion.init_app(app, programar=programar)
+
+
+def register_warmup(app):
+    """Precalentar la aplicación (una vez en el proceso principal con preload)"""
+    from app.services.warmup import precalentar
+
+    if app.config.get("WARMUP_ENABLED", True):
+        precalentar(app)
+
+
+def register_sync(app, programar: bool = True):
+    """Configurar la sincronización por manifiesto con la compartida"""
+    from app.services.share_sync import sincronizacion
+
+    sincronizacion.init_app(app, programar=programar)
+
+
+def register_jinja_cache(app):
+    """Guardar y reutilizar el bytecode de las plantillas Jinja en disco"""
+    from app.services import jinja_cache
+
+    jinja_cache.init_app(app)
+
+
+def register_http_cache(app):
+    """Configurar huellas de estáticos y caché de páginas renderizadas"""
+    from app.services.http_cache import StaticFingerprint, PageCache
+
+    StaticFingerprint.init_app(app)
+    PageCache.init_app(app)
 
 
 def register_template_filters(app):
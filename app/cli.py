@@ -0,0 +1,389 @@
+"""
+Comandos de línea para tareas sin navegador
+
+Uso:
+    python -m app.cli lote registros.json -o checklists.zip
+    python -m app.cli generar inventario.csv --red --rechazos rechazos.csv
+    python -m app.cli retencion --dry-run --max-dias 30
+    python -m app.cli migrar --red --workers 16
+    python -m app.cli sincronizar --dry-run
+    python -m app.cli compilar-plantillas
+    python -m app.cli reporte pc --desde 2026-07-01 --hasta 2026-09-30
+    python -m app.cli leer -o registros.jsonl
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+
+def comando_lote(args) -> int:
+    """Generar checklists en lote desde un archivo JSON"""
+    from app.services.bulk_service import BulkService
+
+    registros = BulkService.leer_registros(args.registros)
+    resumen = BulkService.generar_lote(registros, args.salida, args.workers)
+
+    for item in resumen["items"]:
+        if not item["ok"]:
+            print(f"  [ERROR] registro {item['indice']}: {item['error']}")
+
+    print(
+        f"{resumen['exitosos']}/{resumen['total']} checklists en "
+        f"{resumen['segundos']}s ({resumen['checklists_por_segundo']}/s) "
+        f"-> {args.salida}"
+    )
+
+    return 0 if not resumen["fallidos"] else 1
+
+
+def comando_generar(args) -> int:
+    """Generar checklists en OUTPUT_DIR desde un CSV o JSONL, en flujo"""
+    from app.services.bulk_service import (
+        BulkService,
+        ArchivoRechazos,
+        FORMATOS,
+    )
+
+    formato = args.formato or FORMATOS.get(os.path.splitext(args.entrada)[1].lower())
+    if formato not in ("csv", "jsonl"):
+        print(f"Formato de entrada no soportado: {args.entrada} (usar --formato)")
+        return 2
+
+    base, _ = os.path.splitext(args.entrada)
+    ruta_rechazos = args.rechazos or f"{base}.rechazos.{formato}"
+    ultimo = [time.monotonic()]
+
+    def al_avanzar(resumen):
+        # A lo sumo una línea de progreso por intervalo
+        if time.monotonic() - ultimo[0] < args.progreso:
+            return
+        ultimo[0] = time.monotonic()
+        print(
+            f"  {resumen['total']} leídos, {resumen['exitosos']} generados, "
+            f"{resumen['rechazados']} rechazados "
+            f"({resumen['checklists_por_segundo']}/s)",
+            file=sys.stderr,
+        )
+
+    with ArchivoRechazos(ruta_rechazos, formato) as rechazos:
+        resumen = BulkService.generar_flujo(
+            BulkService.iterar_registros(args.entrada, formato),
+            rechazos=rechazos,
+            copiar_red=args.red,
+            max_workers=args.workers,
+            al_avanzar=al_avanzar,
+        )
+
+    print(
+        f"{resumen['exitosos']}/{resumen['total']} checklists en "
+        f"{resumen['segundos']}s ({resumen['checklists_por_segundo']}/s)"
+    )
+    if args.red:
+        print(
+            f"  copiados a la compartida: {resumen['copiados_red']}"
+            f" (fallidos: {resumen['copias_fallidas']})"
+        )
+    if resumen["rechazados"]:
+        print(f"  rechazados: {resumen['rechazados']} -> {ruta_rechazos}")
+
+    return 0 if not resumen["rechazados"] else 1
+
+
+def comando_retencion(args) -> int:
+    """Aplicar (o simular) la retención del directorio de salida"""
+    from dataclasses import replace
+    from flask import current_app
+    from app.services.retention import limpiar_directorio, politica_desde_config
+
+    config = current_app.config
+    cambios = {
+        campo: valor
+        for campo, valor in (
+            ("max_dias", args.max_dias),
+            ("max_mb", args.max_mb),
+            ("max_por_activo", args.por_activo),
+            ("archivar_en", args.archivar_en),
+        )
+        if valor is not None
+    }
+    politica = replace(politica_desde_config(config), **cambios)
+
+    reporte = limpiar_directorio(
+        str(config["OUTPUT_DIR"]),
+        politica,
+        journal_copias=str(config["COPY_QUEUE_DIR"]),
+        simulacion=args.dry_run,
+    )
+
+    if args.reporte:
+        with open(args.reporte, "w", encoding="utf-8") as f:
+            json.dump(reporte, f, ensure_ascii=False, indent=2)
+
+    accion = "se eliminarían" if args.dry_run else "eliminados"
+    print(
+        f"{reporte['eliminados']} de {reporte['escaneados']} archivos {accion} "
+        f"({reporte['mb_liberados']} MB) en {reporte['segundos']}s"
+    )
+    for motivo, detalle in reporte["por_motivo"].items():
+        print(f"  {motivo}: {detalle['archivos']} ({detalle['mb']} MB)")
+    if reporte["omitidos_copia_pendiente"]:
+        print(f"  con copia pendiente: {reporte['omitidos_copia_pendiente']}")
+
+    return 0
+
+
+def comando_migrar(args) -> int:
+    """Mover los archivos sueltos a la disposición de OUTPUT_LAYOUT"""
+    from flask import current_app
+    from app.services.path_layout import disposicion
+
+    config = current_app.config
+    layout = disposicion(config)
+    if layout.plana:
+        print("OUTPUT_LAYOUT está vacío: no hay disposición a la cual migrar")
+        return 1
+
+    raices = [("salida", str(config["OUTPUT_DIR"]))]
+    if args.red:
+        raices.append(("compartida", str(config["SHARED_NETWORK_PATH"])))
+
+    errores = 0
+    for etiqueta, raiz in raices:
+        reporte = layout.migrar(raiz, args.workers, simulacion=args.dry_run)
+        accion = "se moverían" if args.dry_run else "movidos"
+        print(
+            f"{etiqueta}: {reporte['movidos']} archivos {accion} a "
+            f"{layout.patron} en {reporte['segundos']}s "
+            f"({reporte['conflictos']} ya existían, {reporte['errores']} errores)"
+        )
+        errores += reporte["errores"]
+
+    return 0 if not errores else 1
+
+
+def comando_sincronizar(args) -> int:
+    """Copiar a la compartida lo que falta o cambió según el manifiesto"""
+    from app.services.share_sync import sincronizacion
+
+    reporte = sincronizacion.ejecutar(simulacion=args.dry_run, workers=args.workers)
+    if reporte is None:
+        print("Otra sincronización está en curso")
+        return 1
+
+    if args.reporte:
+        with open(args.reporte, "w", encoding="utf-8") as f:
+            json.dump(reporte, f, ensure_ascii=False, indent=2)
+
+    accion = "se copiarían" if args.dry_run else "copiados"
+    copiar = reporte["faltantes"] + reporte["cambiados"]
+    print(
+        f"{copiar} de {reporte['locales']} archivos {accion} "
+        f"({reporte['faltantes']} faltantes, {reporte['cambiados']} cambiados, "
+        f"{reporte['mb_copiados']} MB) en {reporte['segundos']}s"
+    )
+    print(f"  al día: {reporte['al_dia']}")
+    print(f"  solo en la compartida: {reporte['solo_remotos']}")
+    if reporte["omitidos_copia_pendiente"]:
+        print(f"  con copia pendiente: {reporte['omitidos_copia_pendiente']}")
+    if reporte["omitidos_recientes"]:
+        print(f"  modificados recién: {reporte['omitidos_recientes']}")
+    if reporte["errores"]:
+        print(f"  errores: {reporte['errores']}")
+
+    return 0 if not reporte["errores"] else 1
+
+
+def comando_compilar_plantillas(args) -> int:
+    """Llenar el caché de bytecode Jinja (p. ej. al construir la imagen)"""
+    from flask import current_app
+    from app.services.jinja_cache import compilar
+
+    try:
+        reporte = compilar(current_app)
+    except RuntimeError as e:
+        print(str(e))
+        return 1
+
+    print(
+        f"{reporte['plantillas']} plantillas compiladas en {reporte['segundos']}s "
+        f"-> {reporte['directorio']} ({reporte['archivos']} archivos)"
+    )
+    if reporte["errores"]:
+        print(f"  errores: {reporte['errores']}")
+
+    return 0 if not reporte["errores"] else 1
+
+
+def comando_reporte(args) -> int:
+    """Consolidar los checklists de un tipo en un solo workbook"""
+    from app.services.report_service import ReportService
+
+    salida = args.salida or f"reporte_{args.tipo}.xlsx"
+    try:
+        resumen = ReportService.generar_reporte(
+            args.tipo,
+            salida,
+            fuente=args.fuente,
+            desde=args.desde,
+            hasta=args.hasta,
+            todos=args.todos,
+        )
+    except ValueError as e:
+        print(str(e))
+        return 2
+
+    print(
+        f"{resumen['filas']} filas ({resumen['fuente']}) en "
+        f"{resumen['segundos']}s -> {salida}"
+    )
+    return 0
+
+
+def comando_leer(args) -> int:
+    """Leer los checklists generados (solo los nuevos o cambiados se abren)"""
+    from flask import current_app
+    from app.services.lector_checklist import LectorChecklists
+
+    inicio = time.perf_counter()
+    lector = LectorChecklists(current_app.config, args.workers)
+    salida = open(args.salida, "w", encoding="utf-8") if args.salida else None
+
+    try:
+        for registro in lector.recorrer(args.directorio):
+            if salida is not None:
+                salida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    finally:
+        if salida is not None:
+            salida.close()
+
+    e = lector.estadisticas
+    print(
+        f"{e['total']} checklists en {time.perf_counter() - inicio:.3f}s "
+        f"({e['en_cache']} del caché, {e['leidos']} leídos, "
+        f"{e['errores']} errores)" + (f" -> {args.salida}" if args.salida else "")
+    )
+    for ruta, error in lector.fallidos:
+        print(f"  [ERROR] {ruta}: {error}")
+
+    return 0 if not e["errores"] else 1
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """Construir el parser de argumentos"""
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli", description="Comandos de App Checklist PQN"
+    )
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    lote = subparsers.add_parser("lote", help="Generar checklists en lote")
+    lote.add_argument("registros", help="Archivo JSON con la lista de registros")
+    lote.add_argument("-o", "--salida", default="checklists_lote.zip")
+    lote.add_argument("-w", "--workers", type=int, default=None)
+    lote.set_defaults(func=comando_lote)
+
+    generar = subparsers.add_parser(
+        "generar",
+        aliases=["generate"],
+        help="Generar checklists desde un CSV o JSONL (en flujo, a OUTPUT_DIR)",
+    )
+    generar.add_argument("entrada", help="Archivo .csv o .jsonl con los registros")
+    generar.add_argument("--formato", choices=("csv", "jsonl"), default=None)
+    generar.add_argument(
+        "--red", action="store_true", help="Copiar cada checklist a la compartida"
+    )
+    generar.add_argument(
+        "--rechazos", help="Archivo de rechazos (por defecto, <entrada>.rechazos)"
+    )
+    generar.add_argument("-w", "--workers", type=int, default=None)
+    generar.add_argument(
+        "--progreso", type=float, default=2.0, help="Segundos entre líneas de avance"
+    )
+    generar.set_defaults(func=comando_generar)
+
+    retencion = subparsers.add_parser(
+        "retencion", help="Limpiar el directorio de salida según la retención"
+    )
+    retencion.add_argument(
+        "--dry-run", action="store_true", help="Solo reportar, sin eliminar"
+    )
+    retencion.add_argument("--max-dias", type=float, default=None)
+    retencion.add_argument("--max-mb", type=float, default=None)
+    retencion.add_argument("--por-activo", type=int, default=None)
+    retencion.add_argument("--archivar-en", default=None)
+    retencion.add_argument("--reporte", help="Guardar el reporte en un JSON")
+    retencion.set_defaults(func=comando_retencion)
+
+    migrar = subparsers.add_parser(
+        "migrar", help="Mover archivos sueltos a la disposición de OUTPUT_LAYOUT"
+    )
+    migrar.add_argument(
+        "--red", action="store_true", help="Migrar también la carpeta compartida"
+    )
+    migrar.add_argument("-w", "--workers", type=int, default=8)
+    migrar.add_argument("--dry-run", action="store_true", help="Solo contar, sin mover")
+    migrar.set_defaults(func=comando_migrar)
+
+    sincronizar = subparsers.add_parser(
+        "sincronizar", help="Copiar a la compartida lo que falta o cambió"
+    )
+    sincronizar.add_argument(
+        "--dry-run", action="store_true", help="Solo reportar, sin copiar"
+    )
+    sincronizar.add_argument("-w", "--workers", type=int, default=None)
+    sincronizar.add_argument("--reporte", help="Guardar el reporte en un JSON")
+    sincronizar.set_defaults(func=comando_sincronizar)
+
+    compilar = subparsers.add_parser(
+        "compilar-plantillas", help="Compilar las plantillas Jinja al caché en disco"
+    )
+    compilar.set_defaults(func=comando_compilar_plantillas)
+
+    reporte = subparsers.add_parser(
+        "reporte", help="Consolidar los checklists de un tipo en un workbook"
+    )
+    reporte.add_argument("tipo", help="Tipo de checklist (pc, macos, ...)")
+    reporte.add_argument("-o", "--salida", default=None)
+    reporte.add_argument(
+        "--fuente",
+        choices=("envios", "archivos"),
+        default="envios",
+        help="Registro de envíos u OUTPUT_DIR",
+    )
+    reporte.add_argument("--desde", help="Fecha inicial AAAA-MM-DD")
+    reporte.add_argument("--hasta", help="Fecha final AAAA-MM-DD (inclusive)")
+    reporte.add_argument(
+        "--todos",
+        action="store_true",
+        help="Todos los checklists, no solo el último de cada equipo",
+    )
+    reporte.set_defaults(func=comando_reporte)
+
+    leer = subparsers.add_parser(
+        "leer", help="Leer respuestas y validación de los checklists generados"
+    )
+    leer.add_argument(
+        "directorio", nargs="?", default=None, help="Por defecto, OUTPUT_DIR"
+    )
+    leer.add_argument("-o", "--salida", help="Guardar los registros en un JSONL")
+    leer.add_argument("-w", "--workers", type=int, default=None)
+    leer.set_defaults(func=comando_leer)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    """Punto de entrada de la línea de comandos"""
+    from app import create_app
+
+    args = crear_parser().parse_args(argv)
+
+    app = create_app(background_services=False)
+    with app.app_context():
+        return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+import tempfile
+from flask import Blueprint, request, current_app, jsonify, send_file
+from app.services.bulk_service import BulkService
+from app.services.report_service import ReportService
+from app.services.generation_pool import generation_pool
+from app.services.submission_store import submission_store, FILTROS
+from app.utils.helpers import create_response_data
+
+api_bp = Blueprint("api", __name__, url_prefix="/api")
+
+
+@api_bp.route("/lote", methods=["POST"])
+def generar_lote():
+    """Generar checklists en lote y devolverlos en un zip"""
+    datos = request.get_json(silent=True)
+    registros = datos.get("registros") if isinstance(datos, dict) else datos
+
+    if not isinstance(registros, list) or not registros:
+        return (
+            jsonify(create_response_data(False, "Se esperaba una lista de registros")),
+            400,
+        )
+
+    max_items = current_app.config["BULK_MAX_ITEMS"]
+    if len(registros) > max_items:
+        return (
+            jsonify(
+                create_response_data(
+                    False, f"El lote supera el máximo de {max_items} registros"
+                )
+            ),
+            413,
+        )
+
+    destino = tempfile.TemporaryFile()
+    resumen = BulkService.generar_lote(registros, destino)
+
+    if not resumen["exitosos"]:
+        destino.close()
+        return (
+            jsonify(
+                create_response_data(False, "No se generó ningún checklist", resumen)
+            ),
+            422,
+        )
+
+    destino.seek(0)
+    response = send_file(
+        destino,
+        mimetype="application/zip",
+        as_attachment=True,
+        download_name="checklists_lote.zip",
+    )
+    response.headers["X-Lote-Total"] = str(resumen["total"])
+    response.headers["X-Lote-Fallidos"] = str(resumen["fallidos"])
+    response.headers["X-Lote-Checklists-Por-Segundo"] = str(
+        resumen["checklists_por_segundo"]
+    )
+
+    return response
+
+
+@api_bp.route("/pool", methods=["GET"])
+def estado_pool():
+    """Profundidad de cola y tiempos de espera del pool de generación"""
+    return jsonify(create_response_data(True, "ok", generation_pool.estadisticas()))
+
+
+@api_bp.route("/envios", methods=["GET"])
+def buscar_envios():
+    """Buscar envíos por activo, tipo, técnico, estado y rango de fechas"""
+    if not submission_store.habilitado:
+        return jsonify(create_response_data(False, "Registro deshabilitado")), 404
+
+    maximo = current_app.config.get("SUBMISSIONS_PAGE_SIZE", 50)
+    filtros = {campo: request.args.get(campo) for campo in FILTROS}
+
+    try:
+        resultado = submission_store.buscar(
+            **filtros,
+            desde=request.args.get("desde"),
+            hasta=request.args.get("hasta"),
+            cursor=request.args.get("cursor", type=int),
+            limite=min(max(request.args.get("limite", maximo, type=int), 1), maximo),
+        )
+    except ValueError:
+        return (
+            jsonify(create_response_data(False, "Las fechas deben ser AAAA-MM-DD")),
+            400,
+        )
+
+    return jsonify(create_response_data(True, "ok", resultado))
+
+
+@api_bp.route("/reporte/<tipo>", methods=["GET"])
+def descargar_reporte(tipo):
+    """Reporte consolidado de un tipo: una fila por equipo, una por pregunta"""
+    destino = tempfile.TemporaryFile()
+
+    try:
+        resumen = ReportService.generar_reporte(
+            tipo,
+            destino,
+            fuente=request.args.get("fuente", "envios"),
+            desde=request.args.get("desde"),
+            hasta=request.args.get("hasta"),
+            todos=request.args.get("todos", "false").lower() in ("1", "true"),
+        )
+    except ValueError as e:
+        destino.close()
+        return jsonify(create_response_data(False, str(e))), 400
+
+    destino.seek(0)
+    periodo = "_".join(
+        filter(None, (request.args.get("desde"), request.args.get("hasta")))
+    )
+    response = send_file(
+        destino,
+        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        as_attachment=True,
+        download_name=f"reporte_{tipo}{'_' + periodo if periodo else ''}.xlsx",
+    )
+    response.headers["X-Reporte-Filas"] = str(resumen["filas"])
+
+    return response
+
+
+@api_bp.route("/envios/<int:envio_id>", methods=["GET"])
+def obtener_envio(envio_id):
+    """Detalle de un envío con sus respuestas"""
+    envio = submission_store.obtener(envio_id) if submission_store.habilitado else None
+    if envio is None:
+        return jsonify(create_response_data(False, "Envío no encontrado")), 404
+
+    return jsonify(create_response_data(True, "ok", envio))
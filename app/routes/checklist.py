@@ -6,16 +6,23 @@ from flask import (
     redirect,
     url_for,
     current_app,
+    jsonify,
+    send_file,
 )
-from app.models.checklist_data import get_checklist, checklist_exists
-from app.services.excel_service import ExcelService
+from app.models.checklist_data import get_checklist, get_preguntas, checklist_exists
+from app.services.copy_queue import copy_queue
+from app.services.generation_pool import generation_pool, PoolSaturado
 from app.services.file_service import FileService
-from app.utils.helpers import session_required
+from app.services.submission_store import submission_store
+from app.utils.helpers import session_required, cached_page, create_response_data
 
 checklist_bp = Blueprint("checklist", __name__, url_prefix="/checklist")
 
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
 
 @checklist_bp.route("/formulario/<tipo>", methods=["GET", "POST"])
+@cached_page
 def formulario(tipo):
     """Formulario para capturar datos iniciales del checklist"""
     if not checklist_exists(tipo):
@@ -53,14 +60,11 @@ def mostrar_checklist(tipo):
     mensaje = request.args.get("mensaje")
     archivo = request.args.get("archivo")
 
-    # Enumerar preguntas
-    preguntas_enumeradas = list(enumerate(config["preguntas"], 1))
-
     return render_template(
         "pages/checklist.html",
         checklist=config,
         tipo=tipo,
-        preguntas=preguntas_enumeradas,
+        preguntas=get_preguntas(tipo),
         session=session,
         mensaje=mensaje,
         archivo=archivo,
@@ -90,17 +94,24 @@ def guardar_checklist(tipo):
             "tecnico": session.get("tecnico"),
         }
 
-        # Generar Excel
-        archivo_local, nombre_archivo = ExcelService.generar_excel(
+        if current_app.config.get("EXCEL_DELIVERY", "redirect") == "download":
+            return _descargar_checklist(tipo, respuestas, session_data)
+
+        # Generar Excel en el pool acotado
+        archivo_local, nombre_archivo = generation_pool.generar(
             tipo, respuestas, session_data
         )
+        _registrar_envio(tipo, session_data, respuestas, nombre_archivo)
 
-        # Intentar copiar a carpeta compartida
-        copia_exitosa = FileService.copiar_a_red(archivo_local, nombre_archivo)
+        # Copiar a carpeta compartida (en segundo plano si la cola está activa)
+        if current_app.config.get("COPY_QUEUE_ENABLED", False):
+            copy_queue.encolar(archivo_local, nombre_archivo)
+            mensaje_status = "2"
+        else:
+            copia_exitosa = FileService.copiar_a_red(archivo_local, nombre_archivo)
+            mensaje_status = "1" if copia_exitosa else "0"
 
         # Redirigir con mensaje
-        mensaje_status = "1" if copia_exitosa else "0"
-
         return redirect(
             url_for(
                 "checklist.mostrar_checklist",
@@ -110,8 +121,75 @@ def guardar_checklist(tipo):
             )
         )
 
+    except PoolSaturado as e:
+        current_app.logger.warning(f"Generación rechazada, pool saturado: {tipo}")
+        return (
+            render_template("errors/503.html", retry_after=e.retry_after),
+            503,
+            {"Retry-After": str(e.retry_after)},
+        )
+
     except Exception as e:
         current_app.logger.error(f"Error al guardar checklist: {e}")
         return redirect(
             url_for("checklist.mostrar_checklist", tipo=tipo, mensaje="error")
         )
+
+
+def _descargar_checklist(tipo: str, respuestas: dict, session_data: dict):
+    """
+    Generar el checklist en memoria y devolverlo como descarga
+
+    La copia local y la copia a la compartida son opcionales; si no se guarda
+    copia local, la compartida se escribe directamente desde el mismo buffer.
+    """
+    buffer, nombre_archivo = generation_pool.generar(
+        tipo, respuestas, session_data, en_memoria=True
+    )
+    _registrar_envio(tipo, session_data, respuestas, nombre_archivo)
+
+    archivo_local = None
+    if current_app.config.get("DOWNLOAD_SAVE_LOCAL", True):
+        archivo_local = FileService.guardar_local(buffer, nombre_archivo)
+
+    if not current_app.config.get("DOWNLOAD_COPY_TO_SHARE", True):
+        estado_copia = "omitida"
+    elif archivo_local and current_app.config.get("COPY_QUEUE_ENABLED", False):
+        copy_queue.encolar(archivo_local, nombre_archivo)
+        estado_copia = "pendiente"
+    else:
+        if archivo_local:
+            copia_exitosa = FileService.copiar_a_red(archivo_local, nombre_archivo)
+        else:
+            copia_exitosa = FileService.escribir_en_red(buffer, nombre_archivo)
+        estado_copia = "copiado" if copia_exitosa else "fallido"
+
+    respuesta = send_file(
+        buffer,
+        mimetype=XLSX_MIMETYPE,
+        as_attachment=True,
+        download_name=nombre_archivo,
+    )
+    respuesta.headers["X-Checklist-Copia"] = estado_copia
+
+    return respuesta
+
+
+def _registrar_envio(tipo, session_data, respuestas, nombre_archivo):
+    """Registrar el envío; una falla del registro no afecta al usuario"""
+    try:
+        submission_store.registrar(tipo, session_data, respuestas, nombre_archivo)
+    except Exception as e:
+        current_app.logger.error(f"Error al registrar envío {nombre_archivo}: {e}")
+
+
+@checklist_bp.route("/estado-copia/<path:nombre_archivo>", methods=["GET"])
+def estado_copia(nombre_archivo):
+    """Consultar si un archivo ya llegó a la carpeta compartida"""
+    estado = copy_queue.estado(nombre_archivo)
+
+    return jsonify(
+        create_response_data(
+            True, estado, {"nombre_archivo": nombre_archivo, "estado": estado}
+        )
+    )
@@ -1,10 +1,21 @@
-from flask import Blueprint, render_template, session, redirect, url_for
+from flask import (
+    Blueprint,
+    render_template,
+    session,
+    redirect,
+    url_for,
+    current_app,
+    abort,
+)
 from app.models.checklist_data import get_all_checklists
+from app.services.metrics import metricas
+from app.utils.helpers import cached_page
 
 main_bp = Blueprint("main", __name__)
 
 
 @main_bp.route("/")
+@cached_page
 def index():
     """Página principal con listado de checklists"""
     checklists = get_all_checklists()
@@ -18,6 +29,19 @@ def limpiar():
     return redirect(url_for("main.index"))
 
 
+@main_bp.route("/metrics")
+def metrics():
+    """Métricas en formato de texto de Prometheus"""
+    if not current_app.config.get("METRICS_ENABLED", True):
+        abort(404)
+
+    return (
+        metricas.exponer(),
+        200,
+        {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+    )
+
+
 @main_bp.errorhandler(404)
 def not_found(error):
     """Página de error 404"""
@@ -0,0 +1,416 @@
+import os
+import csv
+import json
+import time
+import zipfile
+from concurrent.futures import as_completed, wait, FIRST_COMPLETED
+from flask import current_app
+from app.models.checklist_data import get_checklist
+from app.services.excel_service import ExcelService
+from app.services import worker_pool
+
+CAMPOS_SESION = ("activo_fijo", "propietario", "cargo", "tecnico")
+
+# Formatos de entrada de la generación en flujo, por extensión
+FORMATOS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+# Columnas CSV con la respuesta de cada pregunta (como el formulario web)
+PREFIJO_PREGUNTA = "pregunta_"
+
+
+class RegistroInvalido(ValueError):
+    """Una línea de la entrada que no se pudo leer como registro"""
+
+
+class BulkService:
+    """Servicio para generar checklists en lote"""
+
+    @staticmethod
+    def generar_lote(registros: list, destino_zip, max_workers: int = None) -> dict:
+        """
+        Generar los checklists de un lote en un pool de procesos y empaquetarlos
+
+        Cada checklist se genera en memoria y va directo al zip: el lote no
+        escribe en OUTPUT_DIR, así no pisa checklists ya generados con el
+        mismo nombre.
+
+        Args:
+            registros: Lista de registros {tipo, activo_fijo, propietario,
+                cargo, tecnico, respuestas}
+            destino_zip: Ruta o buffer binario donde escribir el zip
+            max_workers: Procesos del pool (por defecto, núcleos disponibles)
+
+        Returns:
+            dict: Resumen con el resultado de cada registro y el throughput
+        """
+        inicio = time.perf_counter()
+        items = [None] * len(registros)
+        tareas = {}
+        nombres = set()
+
+        # Validar en el proceso principal para reportar errores sin usar el pool
+        for indice, registro in enumerate(registros):
+            try:
+                tipo, respuestas, session_data = BulkService.preparar_registro(registro)
+                nombre = ExcelService._generar_nombre_archivo(
+                    get_checklist(tipo), session_data
+                )
+                if nombre in nombres:
+                    raise ValueError(
+                        f"Nombre de archivo duplicado en el lote: {nombre}"
+                    )
+                nombres.add(nombre)
+            except (ValueError, TypeError) as e:
+                items[indice] = {"indice": indice, "ok": False, "error": str(e)}
+                continue
+
+            tareas[indice] = (tipo, respuestas, session_data)
+
+        with zipfile.ZipFile(destino_zip, "w", zipfile.ZIP_STORED) as zout:
+            if tareas:
+                pool = worker_pool.obtener_pool(
+                    current_app.config,
+                    max_workers or current_app.config.get("BULK_WORKERS"),
+                )
+                futuros = {
+                    pool.submit(
+                        worker_pool.generar_checklist, *args, en_memoria=True
+                    ): indice
+                    for indice, args in tareas.items()
+                }
+
+                for futuro in as_completed(futuros):
+                    indice = futuros[futuro]
+                    try:
+                        buffer, nombre_archivo = futuro.result()
+                        zout.writestr(nombre_archivo, buffer.getvalue())
+                        items[indice] = {
+                            "indice": indice,
+                            "ok": True,
+                            "nombre_archivo": nombre_archivo,
+                        }
+                    except Exception as e:
+                        items[indice] = {"indice": indice, "ok": False, "error": str(e)}
+
+            segundos = time.perf_counter() - inicio
+            exitosos = sum(1 for item in items if item["ok"])
+
+            resumen = {
+                "total": len(registros),
+                "exitosos": exitosos,
+                "fallidos": len(registros) - exitosos,
+                "segundos": round(segundos, 3),
+                "checklists_por_segundo": (
+                    round(exitosos / segundos, 2) if segundos > 0 else 0
+                ),
+                "items": items,
+            }
+
+            zout.writestr(
+                "resumen.json", json.dumps(resumen, ensure_ascii=False, indent=2)
+            )
+
+        current_app.logger.info(
+            f"Lote generado: {exitosos}/{len(registros)} checklists "
+            f"en {segundos:.2f}s ({resumen['checklists_por_segundo']}/s)"
+        )
+
+        return resumen
+
+    @staticmethod
+    def generar_flujo(
+        registros,
+        rechazos=None,
+        copiar_red: bool = False,
+        max_workers: int = None,
+        al_avanzar=None,
+    ) -> dict:
+        """
+        Generar checklists en OUTPUT_DIR a partir de un flujo de registros
+
+        Los registros se consumen a medida que el pool se libera (a lo sumo
+        dos tareas por proceso en vuelo), así una entrada de cualquier tamaño
+        no se carga completa en memoria. Cada proceso del pool genera con
+        ExcelService y, con copiar_red, copia con FileService.
+
+        Args:
+            registros: Iterable de (linea, registro o RegistroInvalido,
+                original), como lo entrega iterar_registros
+            rechazos: ArchivoRechazos donde anotar los registros fallidos
+            copiar_red: Copiar cada checklist a la compartida
+            max_workers: Procesos del pool (por defecto, BULK_WORKERS o núcleos)
+            al_avanzar: Función llamada con el resumen parcial tras cada registro
+
+        Returns:
+            dict: Resumen {total, exitosos, rechazados, copiados_red,
+                copias_fallidas, segundos, checklists_por_segundo}
+        """
+        config = current_app.config
+        max_workers = max_workers or config.get("BULK_WORKERS") or os.cpu_count() or 1
+        pool = worker_pool.obtener_pool(config, max_workers)
+        os.makedirs(config["OUTPUT_DIR"], exist_ok=True)
+
+        inicio = time.perf_counter()
+        resumen = {
+            "total": 0,
+            "exitosos": 0,
+            "rechazados": 0,
+            "copiados_red": 0,
+            "copias_fallidas": 0,
+        }
+        en_vuelo = {}
+        nombres = set()
+
+        def rechazar(linea, registro, error):
+            resumen["rechazados"] += 1
+            if rechazos is not None:
+                rechazos.agregar(linea, registro, str(error))
+
+        def avanzar():
+            segundos = time.perf_counter() - inicio
+            resumen["segundos"] = round(segundos, 3)
+            resumen["checklists_por_segundo"] = (
+                round(resumen["exitosos"] / segundos, 2) if segundos > 0 else 0
+            )
+            if al_avanzar is not None:
+                al_avanzar(resumen)
+
+        def recoger(futuros):
+            for futuro in futuros:
+                linea, original = en_vuelo.pop(futuro)
+                try:
+                    _, _, copiado = futuro.result()
+                except Exception as e:
+                    rechazar(linea, original, e)
+                else:
+                    resumen["exitosos"] += 1
+                    if copiado is True:
+                        resumen["copiados_red"] += 1
+                    elif copiado is False:
+                        resumen["copias_fallidas"] += 1
+                avanzar()
+
+        for linea, registro, original in registros:
+            resumen["total"] += 1
+            try:
+                if isinstance(registro, RegistroInvalido):
+                    raise registro
+                tipo, respuestas, session_data = BulkService.preparar_registro(registro)
+                nombre = ExcelService._generar_nombre_archivo(
+                    get_checklist(tipo), session_data
+                )
+                if nombre in nombres:
+                    raise ValueError(f"Nombre de archivo duplicado: {nombre}")
+            except (ValueError, TypeError) as e:
+                rechazar(linea, original, e)
+                avanzar()
+                continue
+
+            nombres.add(nombre)
+            futuro = pool.submit(
+                worker_pool.generar_y_copiar, tipo, respuestas, session_data, copiar_red
+            )
+            en_vuelo[futuro] = (linea, original)
+
+            if len(en_vuelo) >= 2 * max_workers:
+                listos, _ = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                recoger(listos)
+
+        recoger(list(as_completed(list(en_vuelo))))
+        avanzar()
+
+        current_app.logger.info(
+            f"Generación en flujo: {resumen['exitosos']}/{resumen['total']} "
+            f"checklists en {resumen['segundos']}s "
+            f"({resumen['checklists_por_segundo']}/s), "
+            f"{resumen['rechazados']} rechazados"
+        )
+
+        return resumen
+
+    @staticmethod
+    def iterar_registros(ruta: str, formato: str = None):
+        """
+        Leer registros de un CSV o JSONL línea a línea
+
+        En CSV las columnas son los campos del registro y las respuestas van
+        en columnas pregunta_<n> (vacías = N/A) o en una columna respuestas
+        con JSON. Una línea ilegible no corta la lectura: se entrega como
+        RegistroInvalido para que vaya a los rechazos.
+
+        Args:
+            ruta: Archivo de entrada
+            formato: "csv" o "jsonl" (por defecto, según la extensión)
+
+        Yields:
+            tuple: (número de línea, registro o RegistroInvalido, original);
+                original es la fila o el objeto leído, para los rechazos
+        """
+        formato = formato or FORMATOS.get(os.path.splitext(ruta)[1].lower())
+        if formato not in ("csv", "jsonl"):
+            raise ValueError(f"Formato de entrada no soportado: {ruta}")
+
+        with open(ruta, encoding="utf-8-sig", newline="") as f:
+            if formato == "jsonl":
+                for linea, texto in enumerate(f, 1):
+                    if not texto.strip():
+                        continue
+                    try:
+                        registro = json.loads(texto)
+                    except json.JSONDecodeError as e:
+                        texto = texto.rstrip("\r\n")
+                        yield linea, RegistroInvalido(f"JSON inválido: {e}"), texto
+                    else:
+                        yield linea, registro, registro
+                return
+
+            lector = csv.DictReader(f)
+            for fila in lector:
+                try:
+                    registro = BulkService._registro_csv(fila)
+                except ValueError as e:
+                    registro = RegistroInvalido(str(e))
+                yield lector.line_num, registro, fila
+
+    @staticmethod
+    def _registro_csv(fila: dict) -> dict:
+        """Convertir una fila CSV en un registro del lote"""
+        registro = {}
+        respuestas = {}
+
+        for columna, valor in fila.items():
+            if columna is None:
+                raise ValueError("La fila tiene más columnas que el encabezado")
+            columna = columna.strip()
+            valor = (valor or "").strip()
+
+            if columna.startswith(PREFIJO_PREGUNTA):
+                numero = columna[len(PREFIJO_PREGUNTA) :]
+                if valor and numero.isdigit():
+                    respuestas[int(numero)] = valor
+            elif columna == "respuestas":
+                if valor:
+                    try:
+                        registro["respuestas"] = json.loads(valor)
+                    except json.JSONDecodeError as e:
+                        raise ValueError(f"respuestas no es JSON válido: {e}")
+            else:
+                registro[columna] = valor
+
+        if respuestas:
+            if "respuestas" in registro:
+                raise ValueError("Usar columnas pregunta_<n> o respuestas, no ambas")
+            registro["respuestas"] = respuestas
+
+        return registro
+
+    @staticmethod
+    def preparar_registro(registro: dict) -> tuple:
+        """
+        Validar un registro y convertirlo a los argumentos de generar_excel
+
+        Args:
+            registro: Registro del lote
+
+        Returns:
+            tuple: (tipo, respuestas, session_data)
+        """
+        if not isinstance(registro, dict):
+            raise TypeError("Cada registro debe ser un objeto")
+
+        tipo = registro.get("tipo")
+        config = get_checklist(tipo) if isinstance(tipo, str) else None
+        if not config:
+            raise ValueError(f"Checklist tipo '{tipo}' no encontrado")
+
+        session_data = {}
+        for campo in CAMPOS_SESION:
+            valor = str(registro.get(campo) or "").strip()
+            if not valor:
+                raise ValueError(f"Campo requerido vacío: {campo}")
+            session_data[campo] = valor
+
+        total = len(config["preguntas"])
+        origen = registro.get("respuestas") or {}
+
+        if isinstance(origen, list):
+            origen = {i: valor for i, valor in enumerate(origen, 1)}
+        elif isinstance(origen, dict):
+            origen = {int(clave): valor for clave, valor in origen.items()}
+        else:
+            raise TypeError("respuestas debe ser una lista o un objeto")
+
+        # Igual que el formulario web: las preguntas sin respuesta quedan N/A
+        respuestas = {i: str(origen.get(i, "N/A")) for i in range(1, total + 1)}
+
+        return tipo, respuestas, session_data
+
+    @staticmethod
+    def leer_registros(ruta: str) -> list:
+        """Leer los registros de un archivo JSON (lista u objeto con registros)"""
+        with open(ruta, encoding="utf-8") as f:
+            datos = json.load(f)
+
+        if isinstance(datos, dict):
+            datos = datos.get("registros", [])
+
+        if not isinstance(datos, list):
+            raise ValueError("El archivo debe contener una lista de registros")
+
+        return datos
+
+
+class ArchivoRechazos:
+    """
+    Archivo con los registros que no se pudieron generar
+
+    Tiene el formato de la entrada para poder corregirlo y reprocesarlo: un
+    CSV con las columnas originales más linea y error, o un JSONL con
+    {linea, error, registro}.
+    """
+
+    def __init__(self, ruta: str, formato: str):
+        self.ruta = ruta
+        self.formato = formato
+        self.cantidad = 0
+        self._archivo = None
+        self._escritor = None
+
+    def agregar(self, linea: int, registro, error: str):
+        """Anotar un registro fallido (el archivo se crea con el primero)"""
+        if self._archivo is None:
+            self._archivo = open(self.ruta, "w", encoding="utf-8", newline="")
+
+        if self.formato == "csv" and isinstance(registro, dict):
+            # Columnas de más en la fila (sin encabezado) no se conservan
+            registro = {k: v for k, v in registro.items() if k is not None}
+            if self._escritor is None:
+                self._escritor = csv.DictWriter(
+                    self._archivo,
+                    fieldnames=["linea", "error", *registro],
+                    extrasaction="ignore",
+                )
+                self._escritor.writeheader()
+            self._escritor.writerow({**registro, "linea": linea, "error": error})
+        else:
+            self._archivo.write(
+                json.dumps(
+                    {"linea": linea, "error": error, "registro": registro},
+                    ensure_ascii=False,
+                    default=str,
+                )
+                + "\n"
+            )
+        self.cantidad += 1
+
+    def cerrar(self):
+        """Cerrar el archivo si se llegó a crear"""
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
@@ -0,0 +1,226 @@
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from app.services.metrics import metricas
+
+CERRADO = "cerrado"
+ABIERTO = "abierto"
+SEMIABIERTO = "semiabierto"
+
+ESTADOS = (CERRADO, ABIERTO, SEMIABIERTO)
+
+
+class CompartidaNoDisponible(Exception):
+    """
+    La operación no se intentó o no terminó a tiempo
+
+    El motivo es "abierto" (circuito abierto), "saturado" (todos los hilos
+    ocupados) o "timeout".
+    """
+
+    def __init__(self, motivo: str):
+        super().__init__(motivo)
+        self.motivo = motivo
+
+
+class CircuitBreaker:
+    """
+    Circuito y tiempo máximo para el acceso a la carpeta compartida
+
+    Cada operación corre en un hilo propio del circuito y quien la pide
+    espera a lo sumo SHARE_TIMEOUT segundos: un servidor SMB colgado deja
+    bloqueado ese hilo, no el de la petición. Tras SHARE_BREAKER_THRESHOLD
+    fallos seguidos el circuito se abre y las operaciones se rechazan de
+    inmediato durante SHARE_BREAKER_COOLDOWN segundos. Después, la primera
+    operación hace una prueba liviana (listar la compartida): si responde
+    el circuito se cierra, y si no vuelve a abrirse. Si todos los hilos
+    siguen ocupados con operaciones colgadas al agotarse el tiempo, la
+    operación se rechaza sin intentarse.
+
+    El estado es por proceso: cada worker de gunicorn lo aprende con sus
+    propios fallos y lo expone en /metrics (circuito_red_procesos).
+    """
+
+    def __init__(self):
+        self.timeout = 10.0
+        self.umbral = 3
+        self.enfriamiento = 30.0
+        self.max_hilos = 4
+        self.logger = logging.getLogger(__name__)
+
+        self.estado = CERRADO
+        self.fallos = 0
+        self.abierto_hasta = 0.0
+
+        self._lock = threading.Lock()
+        self._sondeando = False
+        self._executor = None
+        self._cupos = None
+        self._pid = None
+
+    def init_app(self, app):
+        """
+        Configurar los límites del circuito
+
+        Args:
+            app: Aplicación Flask
+        """
+        self.timeout = app.config.get("SHARE_TIMEOUT", self.timeout)
+        self.umbral = max(app.config.get("SHARE_BREAKER_THRESHOLD", self.umbral), 1)
+        self.enfriamiento = app.config.get("SHARE_BREAKER_COOLDOWN", self.enfriamiento)
+        self.max_hilos = max(app.config.get("SHARE_IO_THREADS", self.max_hilos), 1)
+        self.logger = app.logger
+
+        with self._lock:
+            self._executor = None
+            self._pid = None
+            self._transicion(CERRADO)
+
+    def ejecutar(self, operacion, sondeo=None):
+        """
+        Ejecutar una operación sobre la compartida respetando el circuito
+
+        Args:
+            operacion: Función sin argumentos que accede a la compartida
+            sondeo: Prueba liviana para el estado semiabierto (por defecto,
+                la misma operación)
+
+        Returns:
+            Resultado de la operación
+
+        Raises:
+            CompartidaNoDisponible: Circuito abierto, sin hilos libres o
+                tiempo agotado
+            Exception: Cualquier error de la operación
+        """
+        if self._permitir():
+            return self._medir(operacion)
+
+        # Semiabierto: este llamado hace la prueba de recuperación
+        try:
+            self._intentar(sondeo or operacion)
+        except Exception:
+            self._registrar(False)
+            raise CompartidaNoDisponible(ABIERTO)
+        self._registrar(True)
+
+        return self._medir(operacion)
+
+    def _medir(self, operacion):
+        """Ejecutar con tiempo máximo y registrar el resultado en el circuito"""
+        try:
+            resultado = self._intentar(operacion)
+        except CompartidaNoDisponible as e:
+            if e.motivo == "timeout":
+                self._registrar(False)
+            raise
+        except Exception:
+            self._registrar(False)
+            raise
+
+        self._registrar(True)
+        return resultado
+
+    def _permitir(self) -> bool:
+        """
+        True si se puede operar normalmente; False si toca sondear
+
+        Raises:
+            CompartidaNoDisponible: Circuito abierto
+        """
+        with self._lock:
+            if self.estado == CERRADO:
+                return True
+
+            if self.estado == ABIERTO and time.monotonic() >= self.abierto_hasta:
+                self._transicion(SEMIABIERTO)
+
+            if self.estado == SEMIABIERTO and not self._sondeando:
+                self._sondeando = True
+                return False
+
+        raise CompartidaNoDisponible(ABIERTO)
+
+    def _intentar(self, operacion):
+        """
+        Correr la operación en un hilo del circuito y esperarla
+
+        La espera por un hilo libre y la de la operación comparten el mismo
+        tiempo máximo.
+        """
+        limite = time.monotonic() + self.timeout
+        executor, cupos = self._hilos()
+        if not cupos.acquire(timeout=self.timeout):
+            raise CompartidaNoDisponible("saturado")
+
+        try:
+            futuro = executor.submit(operacion)
+        except BaseException:
+            cupos.release()
+            raise
+        # El cupo se libera cuando termina la operación, no cuando se deja
+        # de esperarla: un hilo colgado sigue ocupado
+        futuro.add_done_callback(lambda _: cupos.release())
+
+        try:
+            return futuro.result(timeout=max(limite - time.monotonic(), 0))
+        except FutureTimeout:
+            raise CompartidaNoDisponible("timeout") from None
+
+    def _registrar(self, exito: bool):
+        """Actualizar el circuito con el resultado de una operación"""
+        with self._lock:
+            if exito:
+                self.fallos = 0
+                self._sondeando = False
+                if self.estado != CERRADO:
+                    self._transicion(CERRADO)
+                return
+
+            self.fallos += 1
+            if self.estado == SEMIABIERTO or (
+                self.estado == CERRADO and self.fallos >= self.umbral
+            ):
+                self._sondeando = False
+                self.abierto_hasta = time.monotonic() + self.enfriamiento
+                self._transicion(ABIERTO)
+
+    def _transicion(self, estado: str):
+        """Cambiar de estado, registrándolo en logs y métricas (con el lock)"""
+        anterior, self.estado = self.estado, estado
+        if estado == CERRADO:
+            self.fallos = 0
+
+        for nombre in ESTADOS:
+            metricas.establecer(
+                "circuito_red_procesos", int(nombre == estado), estado=nombre
+            )
+        if anterior == estado:
+            return
+
+        metricas.incrementar("circuito_red_transiciones_total", estado=estado)
+        if estado == ABIERTO:
+            self.logger.warning(
+                f"Circuito de la compartida abierto tras {self.fallos} fallos; "
+                f"se reintenta en {self.enfriamiento:g}s"
+            )
+        elif estado == SEMIABIERTO:
+            self.logger.info("Circuito de la compartida semiabierto: probando")
+        else:
+            self.logger.info("Circuito de la compartida cerrado: compartida disponible")
+
+    def _hilos(self):
+        """Executor y cupos del proceso actual (un proceso hijo crea los suyos)"""
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_hilos, thread_name_prefix="compartida"
+                )
+                self._cupos = threading.BoundedSemaphore(self.max_hilos)
+            return self._executor, self._cupos
+
+
+circuito_red = CircuitBreaker()
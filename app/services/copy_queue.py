@@ -0,0 +1,421 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from contextlib import contextmanager
+
+# Estados reportados por la cola
+PENDIENTE = "pendiente"
+COPIADO = "copiado"
+FALLIDO = "fallido"
+DESCONOCIDO = "desconocido"
+
+# Cada cuánto se renueva el mtime del lock de una copia en curso, y sin
+# renovar por cuánto tiempo se considera huérfano
+LATIDO = 30.0
+LOCK_EXPIRA = 4 * LATIDO
+
+
+class CopyQueue:
+    """
+    Cola en segundo plano para copiar archivos a la carpeta compartida
+
+    Cada copia se registra como un archivo en el directorio de journal:
+        <id>.json        pendiente (con intentos y próximo intento)
+        <id>.<pid>.lock  tomada por el worker <pid>
+        <id>.done        copiada a la compartida
+        <id>.failed      agotó los reintentos
+
+    Al ser archivos en disco, las copias pendientes sobreviven a la caída
+    de un worker y se reanudan en el siguiente arranque. Mientras una copia
+    está en curso su lock se renueva cada LATIDO segundos, así una copia
+    lenta nunca se confunde con una huérfana.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.habilitada = False
+        self.journal_dir = None
+        self.max_workers = 2
+        self.max_intentos = 8
+        self.backoff_base = 2.0
+        self.backoff_max = 300.0
+        self.retener_done = 86400
+
+        self._lock = threading.Lock()
+        self._evento = threading.Event()
+        self._threads = []
+        self._pid = None
+        self._activos = set()
+        self._ultima_purga = 0.0
+
+    def init_app(self, app):
+        """
+        Configurar la cola, recuperar copias huérfanas e iniciar los workers
+
+        Args:
+            app: Aplicación Flask
+        """
+        self.app = app
+        self.journal_dir = str(app.config["COPY_QUEUE_DIR"])
+        self.max_workers = app.config.get("COPY_QUEUE_WORKERS", self.max_workers)
+        self.max_intentos = app.config.get("COPY_QUEUE_MAX_RETRIES", self.max_intentos)
+        self.backoff_base = app.config.get("COPY_QUEUE_BACKOFF", self.backoff_base)
+
+        self.habilitada = app.config.get("COPY_QUEUE_ENABLED", False)
+
+        os.makedirs(self.journal_dir, exist_ok=True)
+
+        if self.habilitada:
+            self.recuperar()
+            self.iniciar()
+
+    def encolar(self, archivo_local: str, nombre_archivo: str) -> str:
+        """
+        Registrar una copia pendiente y despertar a los workers
+
+        Args:
+            archivo_local: Ruta del archivo local
+            nombre_archivo: Nombre del archivo en la compartida
+
+        Returns:
+            str: Identificador de la copia
+        """
+        job_id = self.id_copia(nombre_archivo)
+
+        # Un nuevo envío del mismo archivo reemplaza cualquier estado previo.
+        # Si ya hay una copia en curso, la pendiente queda en espera (una
+        # sola, sin importar cuántas veces se encole) y se toma al terminar,
+        # porque el archivo pudo cambiar después de empezar a copiarse
+        for sufijo in (".done", ".failed"):
+            self._eliminar(self._ruta(job_id, sufijo))
+
+        self._escribir_job(
+            {
+                "id": job_id,
+                "archivo_local": archivo_local,
+                "nombre_archivo": nombre_archivo,
+                "intentos": 0,
+                "proximo_intento": 0,
+                "creado": time.time(),
+            }
+        )
+
+        if self.habilitada:
+            self.iniciar()
+            self._evento.set()
+
+        return job_id
+
+    def estado(self, nombre_archivo: str) -> str:
+        """
+        Consultar si un archivo ya llegó a la compartida
+
+        Args:
+            nombre_archivo: Nombre del archivo
+
+        Returns:
+            str: pendiente, copiado, fallido o desconocido
+        """
+        job_id = self.id_copia(nombre_archivo)
+
+        if os.path.exists(self._ruta(job_id, ".done")):
+            return COPIADO
+        if os.path.exists(self._ruta(job_id, ".json")) or self._locks(job_id):
+            return PENDIENTE
+        if os.path.exists(self._ruta(job_id, ".failed")):
+            return FALLIDO
+
+        return DESCONOCIDO
+
+    def pendientes(self) -> int:
+        """Cantidad de copias pendientes o en curso en el journal"""
+        return sum(
+            1
+            for entry in os.scandir(self.journal_dir)
+            if entry.name.endswith((".json", ".lock"))
+        )
+
+    def iniciar(self):
+        """Iniciar los workers en este proceso (una vez por pid)"""
+        with self._lock:
+            if self._pid == os.getpid() and all(t.is_alive() for t in self._threads):
+                return
+
+            self._pid = os.getpid()
+            self._threads = [
+                threading.Thread(
+                    target=self._worker, name=f"copy-queue-{i}", daemon=True
+                )
+                for i in range(max(self.max_workers, 1))
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def recuperar(self) -> int:
+        """
+        Devolver a pendiente las copias tomadas por workers que ya no existen
+
+        Returns:
+            int: Cantidad de copias recuperadas
+        """
+        recuperadas = 0
+
+        for entry in os.scandir(self.journal_dir):
+            if not entry.name.endswith(".lock"):
+                continue
+
+            job_id, pid, _ = entry.name.rsplit(".", 2)
+            if entry.path in self._activos:
+                continue
+            try:
+                if int(pid) != os.getpid() and _proceso_vivo(
+                    int(pid), entry.stat().st_mtime
+                ):
+                    continue
+            except FileNotFoundError:
+                continue
+
+            # Si se volvió a encolar mientras tanto, la pendiente es la vigente
+            pendiente = self._ruta(job_id, ".json")
+            try:
+                if os.path.exists(pendiente):
+                    os.remove(entry.path)
+                else:
+                    os.replace(entry.path, pendiente)
+                recuperadas += 1
+            except FileNotFoundError:
+                continue
+
+        if recuperadas and self.app:
+            self.app.logger.info(f"Copias a red recuperadas del journal: {recuperadas}")
+
+        return recuperadas
+
+    def procesar_pendientes(self) -> int:
+        """
+        Procesar todas las copias vencidas disponibles (una pasada)
+
+        Returns:
+            int: Cantidad de copias procesadas
+        """
+        procesadas = 0
+        while self._procesar_siguiente():
+            procesadas += 1
+        return procesadas
+
+    def _worker(self):
+        """Bucle de un worker: tomar copias vencidas o esperar"""
+        while True:
+            try:
+                if self._procesar_siguiente():
+                    continue
+                self._purgar()
+            except Exception as e:
+                if self.app:
+                    self.app.logger.error(f"Error en cola de copias a red: {e}")
+
+            self._evento.wait(timeout=1.0)
+            self._evento.clear()
+
+    def _procesar_siguiente(self) -> bool:
+        """Tomar y ejecutar una copia vencida. Retorna False si no hay"""
+        from app.services.file_service import FileService
+
+        ahora = time.time()
+        entradas = list(os.scandir(self.journal_dir))
+        en_curso = {
+            entry.name.split(".", 1)[0]
+            for entry in entradas
+            if entry.name.endswith(".lock")
+        }
+
+        for entry in entradas:
+            if not entry.name.endswith(".json"):
+                continue
+            # Re-encolada durante una copia en curso: esperar a que termine
+            if entry.name[: -len(".json")] in en_curso:
+                continue
+
+            job = self._leer_job(entry.path)
+            if job is None or job["proximo_intento"] > ahora:
+                continue
+
+            # Tomar la copia; si otro worker la tomó primero, seguir buscando
+            lock_path = self._ruta(job["id"], f".{os.getpid()}.lock")
+            try:
+                os.replace(entry.path, lock_path)
+            except FileNotFoundError:
+                continue
+
+            self._activos.add(lock_path)
+            try:
+                os.utime(lock_path)
+                with self._latido(lock_path):
+                    self._ejecutar(job, lock_path, FileService)
+            finally:
+                self._activos.discard(lock_path)
+            return True
+
+        return False
+
+    def _ejecutar(self, job: dict, lock_path: str, file_service):
+        """Copiar un archivo y registrar el resultado en el journal"""
+        job["intentos"] += 1
+
+        if not os.path.exists(job["archivo_local"]):
+            copiado = False
+            job["intentos"] = self.max_intentos
+        else:
+            with self.app.app_context():
+                copiado = file_service.copiar_a_red(
+                    job["archivo_local"], job["nombre_archivo"]
+                )
+
+        if copiado:
+            self._marcar(job, ".done")
+        elif job["intentos"] >= self.max_intentos:
+            self._marcar(job, ".failed")
+            self.app.logger.error(
+                f"Copia a red descartada tras {job['intentos']} intentos: "
+                f"{job['nombre_archivo']}"
+            )
+        elif not os.path.exists(self._ruta(job["id"], ".json")):
+            espera = min(
+                self.backoff_base * (2 ** (job["intentos"] - 1)), self.backoff_max
+            )
+            job["proximo_intento"] = time.time() + espera
+            self._escribir_job(job)
+
+        self._eliminar(lock_path)
+
+    @contextmanager
+    def _latido(self, lock_path: str):
+        """Renovar el mtime del lock mientras dura la copia"""
+        parar = threading.Event()
+
+        def renovar():
+            while not parar.wait(LATIDO):
+                try:
+                    os.utime(lock_path)
+                except FileNotFoundError:
+                    return
+
+        hilo = threading.Thread(target=renovar, name="copy-queue-latido", daemon=True)
+        hilo.start()
+        try:
+            yield
+        finally:
+            parar.set()
+            hilo.join()
+
+    def _marcar(self, job: dict, sufijo: str):
+        """Registrar el estado final de una copia"""
+        with open(self._ruta(job["id"], sufijo), "w", encoding="utf-8") as f:
+            json.dump(job, f)
+
+    def _purgar(self):
+        """Eliminar marcas de copias terminadas con más de un día"""
+        ahora = time.time()
+        if ahora - self._ultima_purga < 3600:
+            return
+        self._ultima_purga = ahora
+        self.recuperar()
+
+        for entry in os.scandir(self.journal_dir):
+            if entry.name.endswith((".done", ".failed")):
+                if entry.stat().st_mtime < ahora - self.retener_done:
+                    self._eliminar(entry.path)
+
+    def _escribir_job(self, job: dict):
+        """Escribir una copia pendiente de forma atómica"""
+        destino = self._ruta(job["id"], ".json")
+        temporal = f"{destino}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(job, f)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temporal, destino)
+
+    @staticmethod
+    def _leer_job(path: str):
+        """Leer una copia pendiente (None si desapareció o está incompleta)"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _locks(self, job_id: str) -> list:
+        """Locks activos de una copia"""
+        prefijo = f"{job_id}."
+        return [
+            entry.name
+            for entry in os.scandir(self.journal_dir)
+            if entry.name.startswith(prefijo) and entry.name.endswith(".lock")
+        ]
+
+    def _ruta(self, job_id: str, sufijo: str) -> str:
+        return os.path.join(self.journal_dir, f"{job_id}{sufijo}")
+
+    @staticmethod
+    def id_copia(nombre_archivo: str) -> str:
+        """Id de la copia de un archivo en el journal"""
+        return hashlib.sha1(nombre_archivo.encode("utf-8")).hexdigest()[:20]
+
+    @staticmethod
+    def _eliminar(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def copias_pendientes(journal_dir: str) -> set:
+    """
+    Ids de las copias pendientes o en curso (una sola lectura del journal)
+
+    Args:
+        journal_dir: Directorio de journal de la cola
+
+    Returns:
+        set: Ids de copia (ver CopyQueue.id_copia)
+    """
+    try:
+        return {
+            entry.name.split(".", 1)[0]
+            for entry in os.scandir(journal_dir)
+            if entry.name.endswith((".json", ".lock"))
+        }
+    except FileNotFoundError:
+        return set()
+
+
+def _proceso_vivo(pid: int, mtime_lock: float, expiracion: float = LOCK_EXPIRA) -> bool:
+    """
+    Verificar si el worker dueño de un lock sigue vivo
+
+    Un worker vivo renueva su lock cada LATIDO segundos; uno sin renovar
+    por más de la expiración se considera huérfano aunque el pid exista,
+    porque los pid se reutilizan al reiniciar el contenedor.
+    """
+    if time.time() - mtime_lock > expiracion:
+        return False
+
+    if os.name != "posix":
+        return True
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+    return True
+
+
+copy_queue = CopyQueue()
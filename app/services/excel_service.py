@@ -1,7 +1,15 @@
+import io
 import os
 from datetime import datetime
-from openpyxl import load_workbook
+from contextlib import contextmanager
 from flask import current_app
+from app.services.metrics import metricas
+from app.services.path_layout import disposicion
+from app.services.template_cache import TemplateCache
+from app.services.template_layout import LayoutCache, TemplateLayout
+from app.services.xml_engine import XmlExcelEngine
+
+ETAPA_METRICA = "checklist_etapa_segundos"
 
 
 class ExcelService:
@@ -22,11 +30,82 @@ class ExcelService:
         """
         from app.models.checklist_data import get_checklist
 
+        with ExcelService._medir_generacion(tipo):
+            plantilla_path, nombre_archivo = ExcelService._resolver_plantilla(
+                tipo, session_data
+            )
+
+            # Guardar archivo con el motor configurado, según OUTPUT_LAYOUT
+            output_path = disposicion(current_app.config).local(
+                nombre_archivo, config=get_checklist(tipo)
+            )
+            ExcelService._escribir(
+                plantilla_path, respuestas, session_data, output_path
+            )
+
+        current_app.logger.info(f"Excel generado: {output_path}")
+
+        return output_path, nombre_archivo
+
+    @staticmethod
+    def generar_excel_en_memoria(
+        tipo: str, respuestas: dict, session_data: dict
+    ) -> tuple:
+        """
+        Generar el checklist completado en un buffer, sin escribir a disco
+
+        Args:
+            tipo: Tipo de checklist
+            respuestas: Diccionario con las respuestas {pregunta_id: valor}
+            session_data: Datos de sesión del usuario
+
+        Returns:
+            tuple: (buffer BytesIO posicionado al inicio, nombre_archivo)
+        """
+        with ExcelService._medir_generacion(tipo):
+            plantilla_path, nombre_archivo = ExcelService._resolver_plantilla(
+                tipo, session_data
+            )
+
+            buffer = io.BytesIO()
+            ExcelService._escribir(plantilla_path, respuestas, session_data, buffer)
+            buffer.seek(0)
+
+        current_app.logger.info(f"Excel generado en memoria: {nombre_archivo}")
+
+        return buffer, nombre_archivo
+
+    @staticmethod
+    @contextmanager
+    def _medir_generacion(tipo: str):
+        """Medir la generación completa y contarla por tipo y resultado"""
+        from app.models.checklist_data import checklist_exists
+
+        motor = current_app.config.get("EXCEL_ENGINE", "openpyxl")
+        etiqueta_tipo = tipo if checklist_exists(tipo) else "desconocido"
+
+        try:
+            with metricas.medir(ETAPA_METRICA, etapa="total", motor=motor):
+                yield
+        except Exception:
+            metricas.incrementar(
+                "checklists_generados_total", tipo=etiqueta_tipo, resultado="error"
+            )
+            raise
+
+        metricas.incrementar(
+            "checklists_generados_total", tipo=etiqueta_tipo, resultado="ok"
+        )
+
+    @staticmethod
+    def _resolver_plantilla(tipo: str, session_data: dict) -> tuple:
+        """Validar el tipo y obtener (ruta de plantilla, nombre de archivo)"""
+        from app.models.checklist_data import get_checklist
+
         config = get_checklist(tipo)
         if not config:
             raise ValueError(f"Checklist tipo '{tipo}' no encontrado")
 
-        # Cargar plantilla
         plantilla_path = os.path.join(
             current_app.config["TEMPLATES_DIR"], config["plantilla"]
         )
@@ -34,59 +113,95 @@ class ExcelService:
         if not os.path.exists(plantilla_path):
             raise FileNotFoundError(f"Plantilla no encontrada: {plantilla_path}")
 
-        wb = load_workbook(plantilla_path)
-        ws = wb.active
+        # Generar nombre de archivo
+        nombre_archivo = ExcelService._generar_nombre_archivo(config, session_data)
 
-        # Llenar respuestas en el Excel
-        final_line = ExcelService._llenar_respuestas(ws, respuestas)
+        return plantilla_path, nombre_archivo
 
-        # Agregar información de validación
-        ExcelService._agregar_validacion(ws, final_line, session_data)
+    @staticmethod
+    def _escribir(plantilla_path, respuestas, session_data, destino):
+        """Escribir el checklist con el motor configurado en una ruta o buffer"""
+        if current_app.config.get("EXCEL_ENGINE", "openpyxl") == "xml":
+            ExcelService._escribir_xml(
+                plantilla_path, respuestas, session_data, destino
+            )
+        else:
+            ExcelService._escribir_openpyxl(
+                plantilla_path, respuestas, session_data, destino
+            )
 
-        # Generar nombre de archivo
-        nombre_archivo = ExcelService._generar_nombre_archivo(config, session_data)
+    @staticmethod
+    def _escribir_openpyxl(plantilla_path, respuestas, session_data, destino):
+        """Llenar la plantilla con openpyxl (carga y guardado completos)"""
+        with metricas.medir(ETAPA_METRICA, etapa="plantilla", motor="openpyxl"):
+            wb = TemplateCache.obtener(plantilla_path)
+            ws = wb.active
+            layout = LayoutCache.obtener(plantilla_path, ws)
 
-        # Guardar archivo
-        output_path = os.path.join(current_app.config["OUTPUT_DIR"], nombre_archivo)
+        with metricas.medir(ETAPA_METRICA, etapa="llenado", motor="openpyxl"):
+            # Llenar respuestas en el Excel
+            final_line = ExcelService._llenar_respuestas(ws, respuestas, layout)
 
-        wb.save(output_path)
-        current_app.logger.info(f"Excel generado: {output_path}")
+            # Agregar información de validación
+            ExcelService._agregar_validacion(ws, final_line, session_data)
 
-        return output_path, nombre_archivo
+        with metricas.medir(ETAPA_METRICA, etapa="guardado", motor="openpyxl"):
+            wb.save(destino)
 
     @staticmethod
-    def _llenar_respuestas(ws, respuestas: dict) -> int:
-        """Llenar las respuestas en la hoja de trabajo"""
-        final_line = None
-
-        for row in range(1, ws.max_row + 1):
-            celda_id = ws.cell(row=row, column=1).value
+    def _escribir_xml(plantilla_path, respuestas, session_data, destino):
+        """Llenar la plantilla parcheando solo las celdas en el XML de la hoja"""
+        with metricas.medir(ETAPA_METRICA, etapa="plantilla", motor="xml"):
+            layout = LayoutCache.obtener(plantilla_path)
+
+        with metricas.medir(ETAPA_METRICA, etapa="llenado", motor="xml"):
+            celdas = {}
+            for pregunta_id, valor in respuestas.items():
+                row = layout.filas.get(pregunta_id)
+                if row is not None:
+                    celdas[(row, layout.columna_respuesta)] = valor
+
+            celdas[(layout.fila_validacion, 1)] = ExcelService._texto_validacion(
+                session_data
+            )
+
+        # En el motor XML el llenado real ocurre al reescribir la hoja
+        with metricas.medir(ETAPA_METRICA, etapa="guardado", motor="xml"):
+            XmlExcelEngine.escribir(plantilla_path, celdas, destino)
 
-            if celda_id and str(celda_id).isdigit():
-                pregunta_id = int(celda_id)
-                if pregunta_id in respuestas:
-                    # Columna 3 para las respuestas
-                    ws.cell(row=row, column=3).value = respuestas[pregunta_id]
+    @staticmethod
+    def _llenar_respuestas(ws, respuestas: dict, layout: TemplateLayout = None) -> int:
+        """Llenar las respuestas en la hoja de trabajo"""
+        if layout is None:
+            layout = TemplateLayout.desde_hoja(ws)
 
-            final_line = row
+        for pregunta_id, valor in respuestas.items():
+            row = layout.filas.get(pregunta_id)
+            if row is not None:
+                ws.cell(row=row, column=layout.columna_respuesta).value = valor
 
-        return final_line
+        return layout.fila_validacion
 
     @staticmethod
     def _agregar_validacion(ws, final_line: int, session_data: dict):
         """Agregar línea de validación al final"""
+        texto_validacion = ExcelService._texto_validacion(session_data)
+
+        ws.cell(row=final_line, column=1).value = texto_validacion
+
+    @staticmethod
+    def _texto_validacion(session_data: dict) -> str:
+        """Construir el texto de la línea de validación"""
         fecha = datetime.now().strftime("%d/%m/%Y")
         tecnico = session_data.get("tecnico", "Desconocido")
         validador = current_app.config["DEFAULT_VALIDATOR"]
 
-        texto_validacion = (
+        return (
             f"Fecha: {fecha}       "
             f"Técnico: {tecnico}       "
             f"Revisado por: {validador}"
         )
 
-        ws.cell(row=final_line, column=1).value = texto_validacion
-
     @staticmethod
     def _generar_nombre_archivo(config: dict, session_data: dict) -> str:
         """Generar nombre de archivo sanitizado"""
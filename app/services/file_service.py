@@ -1,66 +1,199 @@
 import os
 import shutil
+import threading
+from datetime import datetime
 from flask import current_app
+from app.services.metrics import metricas
+from app.services.circuit_breaker import circuito_red, CompartidaNoDisponible
+from app.services.path_layout import disposicion
 
 
 class FileService:
     """Servicio para manejar operaciones con archivos"""
 
     @staticmethod
-    def copiar_a_red(archivo_local: str, nombre_archivo: str) -> bool:
+    def copiar_a_red(
+        archivo_local: str, nombre_archivo: str, relativa: str = None
+    ) -> bool:
         """
         Copiar archivo a carpeta compartida de red
 
         Args:
             archivo_local: Ruta del archivo local
             nombre_archivo: Nombre del archivo
+            relativa: Ruta exacta dentro de la compartida (por defecto, la
+                que corresponde según OUTPUT_LAYOUT)
 
         Returns:
             bool: True si se copió exitosamente, False si falló
         """
-        try:
-            shared_path = current_app.config["SHARED_NETWORK_PATH"]
+        config = current_app.config
+        shared_path = config["SHARED_NETWORK_PATH"]
 
+        def copiar():
             # Crear directorio si no existe
             os.makedirs(shared_path, exist_ok=True)
 
-            destino = os.path.join(shared_path, nombre_archivo)
-            shutil.copy(archivo_local, destino)
+            if relativa:
+                destino = os.path.join(shared_path, relativa)
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+            else:
+                # Mismo directorio que la copia local (según su fecha, no la
+                # de la copia, que puede ocurrir después en la cola)
+                fecha = datetime.fromtimestamp(os.path.getmtime(archivo_local))
+                destino = disposicion(config).en_red(nombre_archivo, fecha)
+
+            FileService.copiar_archivo(archivo_local, destino)
+            return destino
+
+        try:
+            with metricas.medir("copia_red_segundos", operacion="copia"):
+                destino = circuito_red.ejecutar(
+                    copiar, sondeo=lambda: os.listdir(shared_path)
+                )
 
             current_app.logger.info(f"Archivo copiado a red: {destino}")
+            metricas.incrementar("copias_red_total", resultado="copiado")
             return True
 
+        except CompartidaNoDisponible as e:
+            current_app.logger.warning(
+                f"Copia a red no realizada ({e.motivo}): {nombre_archivo}"
+            )
+            metricas.incrementar("copias_red_total", resultado=e.motivo)
+            return False
+
         except Exception as e:
             current_app.logger.error(f"Error al copiar archivo a red: {e}")
+            metricas.incrementar("copias_red_total", resultado="fallido")
             return False
 
     @staticmethod
-    def limpiar_archivos_antiguos(dias: int = 7):
+    def copiar_archivo(origen: str, destino: str):
         """
-        Limpiar archivos antiguos del directorio de salida
+        Copiar un archivo de forma atómica
+
+        shutil.copyfile usa la copia del kernel cuando existe (sendfile en
+        Linux, fcopyfile en macOS) y no copia permisos, que en SMB suelen
+        fallar o costar otro viaje. Se escribe a un temporal oculto y se
+        renombra, así el destino nunca queda a medio copiar.
 
         Args:
-            dias: Días de antigüedad para eliminar archivos
+            origen: Archivo a copiar
+            destino: Ruta final
+        """
+        _reemplazar(destino, lambda temporal: shutil.copyfile(origen, temporal))
+
+    @staticmethod
+    def escribir_archivo(contenido: bytes, destino: str):
+        """
+        Escribir un archivo de forma atómica (temporal oculto y rename)
+
+        Args:
+            contenido: Bytes a escribir
+            destino: Ruta final
         """
-        import time
+
+        def escribir(temporal):
+            with open(temporal, "wb") as f:
+                f.write(contenido)
+
+        _reemplazar(destino, escribir)
+
+    @staticmethod
+    def escribir_en_red(buffer, nombre_archivo: str) -> bool:
+        """
+        Escribir un archivo en memoria directamente en la carpeta compartida
+
+        Args:
+            buffer: Buffer binario con el contenido
+            nombre_archivo: Nombre del archivo
+
+        Returns:
+            bool: True si se escribió exitosamente, False si falló
+        """
+        config = current_app.config
+        shared_path = config["SHARED_NETWORK_PATH"]
+        contenido = buffer.getvalue()
+
+        def escribir():
+            os.makedirs(shared_path, exist_ok=True)
+
+            destino = disposicion(config).en_red(nombre_archivo)
+            FileService.escribir_archivo(contenido, destino)
+            return destino
 
         try:
-            output_dir = current_app.config["OUTPUT_DIR"]
-            now = time.time()
-            cutoff = now - (dias * 86400)  # días en segundos
+            with metricas.medir("copia_red_segundos", operacion="escritura"):
+                destino = circuito_red.ejecutar(
+                    escribir, sondeo=lambda: os.listdir(shared_path)
+                )
 
-            for filename in os.listdir(output_dir):
-                filepath = os.path.join(output_dir, filename)
+            current_app.logger.info(f"Archivo escrito en red: {destino}")
+            metricas.incrementar("copias_red_total", resultado="copiado")
+            return True
 
-                if os.path.isfile(filepath):
-                    file_modified = os.path.getmtime(filepath)
+        except CompartidaNoDisponible as e:
+            current_app.logger.warning(
+                f"Escritura en red no realizada ({e.motivo}): {nombre_archivo}"
+            )
+            metricas.incrementar("copias_red_total", resultado=e.motivo)
+            return False
+
+        except Exception as e:
+            current_app.logger.error(f"Error al escribir archivo en red: {e}")
+            metricas.incrementar("copias_red_total", resultado="fallido")
+            return False
 
-                    if file_modified < cutoff:
-                        os.remove(filepath)
-                        current_app.logger.info(f"Archivo eliminado: {filepath}")
+    @staticmethod
+    def guardar_local(buffer, nombre_archivo: str) -> str:
+        """
+        Guardar un archivo en memoria en el directorio de salida
+
+        Args:
+            buffer: Buffer binario con el contenido
+            nombre_archivo: Nombre del archivo
+
+        Returns:
+            str: Ruta del archivo local
+        """
+        archivo_local = disposicion(current_app.config).local(nombre_archivo)
+        with open(archivo_local, "wb") as f:
+            f.write(buffer.getbuffer())
+
+        return archivo_local
+
+    @staticmethod
+    def limpiar_archivos_antiguos(dias: int = 7) -> dict:
+        """
+        Limpiar archivos antiguos del directorio de salida
+
+        Pasada completa e inmediata; la limpieza programada la hace el
+        servicio de retención (RETENTION_ENABLED).
+
+        Args:
+            dias: Días de antigüedad para eliminar archivos
+
+        Returns:
+            dict: Reporte de la limpieza, o None si falló
+        """
+        from app.services.retention import Politica, limpiar_directorio
+
+        try:
+            reporte = limpiar_directorio(
+                str(current_app.config["OUTPUT_DIR"]),
+                Politica(max_dias=dias),
+                journal_copias=str(current_app.config["COPY_QUEUE_DIR"]),
+            )
+            current_app.logger.info(
+                f"Archivos eliminados: {reporte['eliminados']} "
+                f"({reporte['mb_liberados']} MB)"
+            )
+            return reporte
 
         except Exception as e:
             current_app.logger.error(f"Error al limpiar archivos: {e}")
+            return None
 
     @staticmethod
     def validar_plantilla(tipo: str) -> bool:
@@ -84,3 +217,20 @@ class FileService:
         )
 
         return os.path.exists(plantilla_path)
+
+
+def _reemplazar(destino: str, escribir):
+    """Escribir en un temporal junto a `destino` y renombrarlo encima"""
+    directorio, nombre = os.path.split(destino)
+    temporal = os.path.join(
+        directorio, f".{nombre}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        escribir(temporal)
+        os.replace(temporal, destino)
+    except BaseException:
+        try:
+            os.remove(temporal)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,218 @@
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, has_request_context
+from app.services import worker_pool
+from app.services.profiler import profiler
+
+
+class PoolSaturado(Exception):
+    """La cola de generación de Excel está llena"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("La cola de generación de Excel está llena")
+        self.retry_after = retry_after
+
+
+class GenerationPool:
+    """
+    Pool acotado para generar Excel fuera del worker de gunicorn
+
+    Modos (GENERATION_POOL_MODE):
+        off:     se genera en el hilo de la petición (comportamiento original)
+        thread:  hilos dedicados dentro del worker
+        process: procesos dedicados (el trabajo de openpyxl no compite por el GIL)
+
+    Solo se aceptan GENERATION_POOL_WORKERS en ejecución más
+    GENERATION_POOL_QUEUE en espera; las demás peticiones se rechazan con
+    PoolSaturado para que la ruta responda 503 en lugar de acumularlas.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.modo = "off"
+        self.max_workers = 2
+        self.max_cola = 4
+        self.timeout = 60
+        self.retry_after = 5
+
+        self._lock = threading.Lock()
+        self._cupos = None
+        self._executor = None
+        self._en_vuelo = 0
+        self._completadas = 0
+        self._rechazadas = 0
+        self._esperas = deque(maxlen=200)
+
+    def init_app(self, app):
+        """
+        Configurar el pool según la aplicación
+
+        Args:
+            app: Aplicación Flask
+        """
+        self.app = app
+        self.modo = app.config.get("GENERATION_POOL_MODE", self.modo)
+        self.max_workers = max(app.config.get("GENERATION_POOL_WORKERS", 2), 1)
+        self.max_cola = max(app.config.get("GENERATION_POOL_QUEUE", 4), 0)
+        self.timeout = app.config.get("GENERATION_POOL_TIMEOUT", self.timeout)
+        self.retry_after = app.config.get("GENERATION_POOL_RETRY_AFTER", 5)
+
+        self._cupos = threading.BoundedSemaphore(self.max_workers + self.max_cola)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = None
+
+    def generar(
+        self,
+        tipo: str,
+        respuestas: dict,
+        session_data: dict,
+        en_memoria: bool = False,
+    ) -> tuple:
+        """
+        Generar un checklist en el pool, esperando el resultado
+
+        Args:
+            tipo: Tipo de checklist
+            respuestas: Diccionario con las respuestas {pregunta_id: valor}
+            session_data: Datos de sesión del usuario
+            en_memoria: Devolver un buffer en lugar de escribir en OUTPUT_DIR
+
+        Returns:
+            tuple: (ruta_archivo o buffer, nombre_archivo)
+
+        Raises:
+            PoolSaturado: Si no hay cupo en la cola
+        """
+        # Una petición perfilada genera en su propio hilo para que el perfil
+        # incluya openpyxl
+        perfilando = has_request_context() and profiler.perfilando()
+
+        if self.modo == "off" or perfilando:
+            return worker_pool.generar_checklist(
+                tipo, respuestas, session_data, en_memoria
+            )
+
+        if not self._cupos.acquire(blocking=False):
+            with self._lock:
+                self._rechazadas += 1
+            raise PoolSaturado(self.retry_after)
+
+        with self._lock:
+            self._en_vuelo += 1
+
+        app = current_app._get_current_object()
+        try:
+            futuro = self._enviar(app, tipo, respuestas, session_data, en_memoria)
+        except Exception:
+            self._liberar()
+            raise
+
+        # El cupo se libera cuando termina la tarea, aunque el llamador deje
+        # de esperar por timeout, para que la cota se respete siempre
+        futuro.add_done_callback(lambda _: self._liberar())
+
+        resultado, espera = futuro.result(timeout=self.timeout)
+
+        with self._lock:
+            self._completadas += 1
+            self._esperas.append(espera)
+
+        return resultado
+
+    def precalentar(self) -> int:
+        """
+        Levantar de antemano los procesos del pool (modo process)
+
+        Sin esto, la primera generación de cada worker espera a que arranquen
+        los procesos hijos.
+
+        Returns:
+            int: Procesos listos (0 si el modo no usa procesos)
+        """
+        if self.modo != "process":
+            return 0
+
+        pool = worker_pool.obtener_pool(
+            self.app.config, self.max_workers, nombre="generacion"
+        )
+        futuros = [pool.submit(os.getpid) for _ in range(self.max_workers)]
+        return len({futuro.result() for futuro in futuros})
+
+    def estadisticas(self) -> dict:
+        """
+        Estado del pool para dimensionarlo
+
+        Returns:
+            dict: Profundidad de cola, ocupación y tiempos de espera
+        """
+        with self._lock:
+            esperas = sorted(self._esperas)
+            en_ejecucion = min(self._en_vuelo, self.max_workers)
+
+            return {
+                "modo": self.modo,
+                "workers": self.max_workers,
+                "capacidad_cola": self.max_cola,
+                "en_cola": self._en_vuelo - en_ejecucion,
+                "en_ejecucion": en_ejecucion,
+                "completadas": self._completadas,
+                "rechazadas": self._rechazadas,
+                "espera_promedio_s": (
+                    round(sum(esperas) / len(esperas), 4) if esperas else 0
+                ),
+                "espera_p95_s": (
+                    round(esperas[max(int(len(esperas) * 0.95) - 1, 0)], 4)
+                    if esperas
+                    else 0
+                ),
+                "espera_max_s": round(esperas[-1], 4) if esperas else 0,
+            }
+
+    def _enviar(self, app, tipo, respuestas, session_data, en_memoria):
+        """Enviar la tarea al executor del modo configurado"""
+        enviado = time.time()
+
+        if self.modo == "process":
+            pool = worker_pool.obtener_pool(
+                app.config, self.max_workers, nombre="generacion"
+            )
+            return pool.submit(
+                worker_pool.generar_checklist_medido,
+                enviado,
+                tipo,
+                respuestas,
+                session_data,
+                en_memoria,
+            )
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="excel"
+                )
+            executor = self._executor
+
+        return executor.submit(
+            _generar_en_hilo, app, enviado, tipo, respuestas, session_data, en_memoria
+        )
+
+    def _liberar(self):
+        """Devolver un cupo del pool"""
+        with self._lock:
+            self._en_vuelo -= 1
+        self._cupos.release()
+
+
+def _generar_en_hilo(app, enviado, *args) -> tuple:
+    """Generar dentro de un hilo del pool con el contexto de la aplicación"""
+    espera = time.time() - enviado
+
+    with app.app_context():
+        return worker_pool.generar_checklist(*args), espera
+
+
+generation_pool = GenerationPool()
@@ -0,0 +1,172 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from flask import request
+
+
+class StaticFingerprint:
+    """Huellas de contenido para las URLs de archivos estáticos"""
+
+    _lock = threading.Lock()
+    _huellas = {}  # ruta -> (mtime, huella)
+
+    @classmethod
+    def init_app(cls, app):
+        """
+        Agregar la huella a url_for('static') y cachear los estáticos con huella
+
+        Args:
+            app: Aplicación Flask
+        """
+        max_age = app.config.get("STATIC_MAX_AGE", 31536000)
+
+        @app.url_defaults
+        def agregar_huella(endpoint, values):
+            if endpoint == "static" and "filename" in values and "v" not in values:
+                huella = cls.huella(app.static_folder, values["filename"])
+                if huella:
+                    values["v"] = huella
+
+        @app.after_request
+        def cachear_estaticos(response):
+            # Solo la URL con la huella vigente es inmutable; sin ella se
+            # mantiene la revalidación por defecto de Flask
+            version = request.args.get("v")
+            if (
+                request.endpoint == "static"
+                and version
+                and response.status_code == 200
+                and version
+                == cls.huella(app.static_folder, request.view_args.get("filename"))
+            ):
+                response.cache_control.public = True
+                response.cache_control.max_age = max_age
+                response.cache_control.immutable = True
+                response.cache_control.no_cache = None
+
+            return response
+
+    @classmethod
+    def huella(cls, static_folder: str, filename: str) -> str:
+        """
+        Calcular (o reutilizar) el hash de contenido de un archivo estático
+
+        Args:
+            static_folder: Carpeta de estáticos
+            filename: Ruta relativa del archivo
+
+        Returns:
+            str: Primeros 12 caracteres del sha1, o None si no existe
+        """
+        ruta = os.path.join(static_folder, filename or "")
+        try:
+            mtime = os.path.getmtime(ruta)
+        except OSError:
+            return None
+
+        entrada = cls._huellas.get(ruta)
+        if entrada and entrada[0] == mtime:
+            return entrada[1]
+
+        sha = hashlib.sha1()
+        with open(ruta, "rb") as f:
+            for bloque in iter(lambda: f.read(65536), b""):
+                sha.update(bloque)
+
+        huella = sha.hexdigest()[:12]
+        with cls._lock:
+            cls._huellas[ruta] = (mtime, huella)
+
+        return huella
+
+    @classmethod
+    def version_sitio(cls, app) -> str:
+        """
+        Huella de plantillas Jinja y estáticos del despliegue actual
+
+        Args:
+            app: Aplicación Flask
+
+        Returns:
+            str: Hash que cambia cuando cambia cualquier plantilla o estático
+        """
+        sha = hashlib.sha1()
+        for carpeta in (app.template_folder, app.static_folder):
+            carpeta = os.path.join(app.root_path, carpeta or "")
+            for raiz, _, archivos in sorted(os.walk(carpeta)):
+                for nombre in sorted(archivos):
+                    ruta = os.path.join(raiz, nombre)
+                    sha.update(f"{ruta}:{os.path.getmtime(ruta)}".encode())
+
+        return sha.hexdigest()[:12]
+
+
+class PageCache:
+    """Caché en memoria (por worker) de páginas ya renderizadas"""
+
+    _lock = threading.Lock()
+    _paginas = OrderedDict()  # clave -> (version, html)
+    max_entradas = 64
+    habilitado = True
+    version_sitio = ""
+
+    @classmethod
+    def init_app(cls, app):
+        """
+        Configurar el caché de páginas
+
+        Args:
+            app: Aplicación Flask
+        """
+        cls.habilitado = app.config.get("PAGE_CACHE_ENABLED", True)
+        cls.max_entradas = app.config.get("PAGE_CACHE_SIZE", cls.max_entradas)
+        cls.version_sitio = StaticFingerprint.version_sitio(app)
+        cls.limpiar()
+
+    @classmethod
+    def etag(cls, clave: tuple, version: str) -> str:
+        """
+        ETag de una página para la versión de los checklists
+
+        Args:
+            clave: Identificador de la página y su variante
+            version: Versión de las definiciones de checklists
+
+        Returns:
+            str: ETag fuerte (sin comillas)
+        """
+        texto = f"{version}:{cls.version_sitio}:{clave!r}"
+        return hashlib.sha1(texto.encode()).hexdigest()[:20]
+
+    @classmethod
+    def obtener(cls, clave: tuple, version: str):
+        """
+        Obtener una página renderizada vigente
+
+        Returns:
+            bytes: HTML cacheado, o None si no existe o cambió la versión
+        """
+        with cls._lock:
+            entrada = cls._paginas.get(clave)
+            if entrada is None or entrada[0] != version:
+                return None
+
+            cls._paginas.move_to_end(clave)
+            return entrada[1]
+
+    @classmethod
+    def guardar(cls, clave: tuple, version: str, html: bytes):
+        """Guardar una página renderizada, descartando la menos usada"""
+        with cls._lock:
+            cls._paginas[clave] = (version, html)
+            cls._paginas.move_to_end(clave)
+
+            while len(cls._paginas) > cls.max_entradas:
+                cls._paginas.popitem(last=False)
+
+    @classmethod
+    def limpiar(cls):
+        """Vaciar el caché"""
+        with cls._lock:
+            cls._paginas.clear()
@@ -0,0 +1,72 @@
+import os
+import time
+from jinja2 import FileSystemBytecodeCache
+
+# Extensión de los archivos de bytecode en el directorio compartido
+SUFIJO = ".cache"
+
+
+def init_app(app):
+    """
+    Guardar el bytecode de las plantillas Jinja en JINJA_CACHE_DIR
+
+    Cada proceso que compila una plantilla deja su bytecode en el
+    directorio, y los demás (workers, procesos del pool, reinicios, otros
+    contenedores con el mismo volumen o la misma imagen) lo cargan en lugar
+    de compilarla. Cada entrada guarda un hash del fuente de la plantilla y
+    se descarta si no coincide, así una plantilla editada se recompila
+    aunque su fecha no cambie (p. ej. tras un COPY en la imagen). La
+    escritura es atómica (temporal y rename), segura entre procesos.
+
+    Args:
+        app: Aplicación Flask
+
+    Returns:
+        FileSystemBytecodeCache: Caché configurado, o None si está desactivado
+    """
+    directorio = app.config.get("JINJA_CACHE_DIR")
+    if not directorio:
+        return None
+
+    try:
+        os.makedirs(directorio, exist_ok=True)
+    except OSError as e:
+        app.logger.warning(f"Caché de bytecode Jinja desactivado ({directorio}): {e}")
+        return None
+
+    cache = FileSystemBytecodeCache(str(directorio), f"%s{SUFIJO}")
+    app.jinja_env.bytecode_cache = cache
+    return cache
+
+
+def compilar(app) -> dict:
+    """
+    Compilar todas las plantillas al caché de bytecode (p. ej. en el build)
+
+    Args:
+        app: Aplicación Flask con el caché configurado
+
+    Returns:
+        dict: Reporte {plantillas, errores, archivos, directorio, segundos}
+    """
+    from app.services.warmup import compilar_jinja, _es_plantilla
+
+    inicio = time.perf_counter()
+    directorio = app.config.get("JINJA_CACHE_DIR")
+    if app.jinja_env.bytecode_cache is None:
+        raise RuntimeError("JINJA_CACHE_DIR no está configurado")
+
+    # Sin el caché en memoria cada plantilla pasa por el de bytecode
+    app.jinja_env.cache.clear()
+    total = len(app.jinja_env.list_templates(filter_func=_es_plantilla))
+    compiladas = compilar_jinja(app)
+
+    return {
+        "plantillas": compiladas,
+        "errores": total - compiladas,
+        "archivos": sum(
+            1 for entry in os.scandir(directorio) if entry.name.endswith(SUFIJO)
+        ),
+        "directorio": str(directorio),
+        "segundos": round(time.perf_counter() - inicio, 3),
+    }
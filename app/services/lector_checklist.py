@@ -0,0 +1,283 @@
+import os
+import re
+import json
+from app.services.path_layout import recorrer, checklist_de_nombre
+from app.services.template_layout import COLUMNA_RESPUESTA
+from app.services.xml_engine import XmlExcelEngine
+from app.utils.db import ConexionesSqlite
+
+# Cambiarla descarta las lecturas en caché (p. ej. si cambia el registro)
+VERSION = 1
+
+# Archivos por consulta al caché y por tarea del pool
+LOTE_CACHE = 256
+LOTE_POOL = 8
+
+# Con menos archivos por leer que esto, leer en el proceso actual es más
+# barato que levantar el pool
+MINIMO_POOL = 16
+
+ESQUEMA = """
+    CREATE TABLE IF NOT EXISTS lecturas (
+        ruta TEXT PRIMARY KEY,
+        tamano INTEGER NOT NULL,
+        mtime REAL NOT NULL,
+        version INTEGER NOT NULL,
+        registro TEXT NOT NULL
+    )
+"""
+
+# Línea de validación escrita por ExcelService._texto_validacion
+_RE_VALIDACION = re.compile(
+    r"Fecha:\s*(?P<fecha>.*?)\s+Técnico:\s*(?P<tecnico>.*?)\s+"
+    r"Revisado por:\s*(?P<validador>.*?)\s*$"
+)
+_RE_NOMBRE = re.compile(r"^Activo (?P<activo>.*?) Checklist ")
+
+
+def leer_checklist(ruta: str) -> dict:
+    """
+    Leer las respuestas y la validación de un checklist generado
+
+    Es el inverso de ExcelService._llenar_respuestas y _agregar_validacion,
+    con el mismo criterio que TemplateLayout.desde_xlsx: las columnas A y de
+    respuestas se leen en flujo del XML de la hoja (sin cargar el workbook),
+    cada fila numerada en A da una respuesta y la última fila es la línea de
+    validación. Sirve para archivos de los dos motores.
+
+    Args:
+        ruta: Ruta del .xlsx generado
+
+    Returns:
+        dict: {ruta, nombre_archivo, activo_fijo, respuestas {id: valor},
+            validacion, fecha, tecnico, validador}
+    """
+    columnas, max_fila = XmlExcelEngine.leer_columnas(
+        ruta, (1, COLUMNA_RESPUESTA), recordar_hoja=False
+    )
+    ids, valores = columnas[1], columnas[COLUMNA_RESPUESTA]
+
+    respuestas = {}
+    for fila in sorted(ids):
+        celda_id = ids[fila]
+        if celda_id is not None and str(celda_id).isdigit():
+            respuesta = valores.get(fila)
+            respuestas.setdefault(
+                int(celda_id), None if respuesta is None else str(respuesta)
+            )
+    ultima = ids.get(max_fila)
+
+    nombre_archivo = os.path.basename(ruta)
+    activo = _RE_NOMBRE.match(nombre_archivo)
+    validacion = str(ultima).strip() if isinstance(ultima, str) else None
+    campos = _RE_VALIDACION.match(validacion or "")
+
+    return {
+        "ruta": str(ruta),
+        "nombre_archivo": nombre_archivo,
+        "activo_fijo": activo.group("activo") if activo else None,
+        "respuestas": respuestas,
+        "validacion": validacion,
+        **(
+            campos.groupdict()
+            if campos
+            else {"fecha": None, "tecnico": None, "validador": None}
+        ),
+    }
+
+
+class CacheLecturas:
+    """Registros leídos por ruta, válidos mientras no cambien mtime y tamaño"""
+
+    def __init__(self, ruta: str):
+        self._conexiones = ConexionesSqlite(ruta)
+        self._conexiones.obtener().execute(ESQUEMA)
+
+    def obtener(self, claves: dict) -> dict:
+        """
+        Leer los registros vigentes de un grupo de archivos
+
+        Args:
+            claves: ruta -> (tamano, mtime) actuales
+
+        Returns:
+            dict: ruta -> registro, solo de los que no cambiaron
+        """
+        if not claves:
+            return {}
+
+        marcas = ", ".join("?" * len(claves))
+        filas = (
+            self._conexiones.obtener()
+            .execute(
+                "SELECT ruta, tamano, mtime, version, registro FROM lecturas"
+                f" WHERE ruta IN ({marcas})",
+                list(claves),
+            )
+            .fetchall()
+        )
+        return {
+            ruta: json.loads(registro)
+            for ruta, tamano, mtime, version, registro in filas
+            if version == VERSION and claves[ruta] == (tamano, mtime)
+        }
+
+    def guardar(self, registros: list):
+        """Registrar lecturas nuevas (registros con ruta, tamano y mtime)"""
+        with self._conexiones.transaccion() as conexion:
+            conexion.executemany(
+                "INSERT OR REPLACE INTO lecturas"
+                " (ruta, tamano, mtime, version, registro) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        r["ruta"],
+                        r["tamano"],
+                        r["mtime"],
+                        VERSION,
+                        json.dumps(r, ensure_ascii=False),
+                    )
+                    for r in registros
+                ],
+            )
+
+    def podar(self, raiz: str, vigentes: set) -> int:
+        """Descartar las lecturas de archivos bajo `raiz` que ya no existen"""
+        prefijo = os.path.join(raiz, "")
+        with self._conexiones.transaccion() as conexion:
+            registradas = conexion.execute(
+                "SELECT ruta FROM lecturas WHERE substr(ruta, 1, ?) = ?",
+                (len(prefijo), prefijo),
+            ).fetchall()
+            borrar = [(r,) for (r,) in registradas if r not in vigentes]
+            conexion.executemany("DELETE FROM lecturas WHERE ruta = ?", borrar)
+        return len(borrar)
+
+
+class LectorChecklists:
+    """
+    Lectura en paralelo y con caché de los checklists generados
+
+    Cada archivo se identifica por ruta, mtime y tamaño: si ya se leyó y no
+    cambió, el registro sale del caché (READBACK_DB) sin abrirlo. Los que
+    faltan se leen con leer_checklist, repartidos en lotes entre los
+    procesos del pool "lectura" (o en este proceso si son pocos). Así una
+    segunda pasada sobre el archivo histórico solo abre lo nuevo o cambiado.
+    """
+
+    def __init__(self, config, workers: int = None):
+        self.config = config
+        self.workers = workers or config.get("READBACK_WORKERS") or None
+        self.cache = CacheLecturas(config["READBACK_DB"])
+        self.estadisticas = {"total": 0, "en_cache": 0, "leidos": 0, "errores": 0}
+        self.fallidos = []  # (ruta, error)
+
+    def leer(self, rutas):
+        """
+        Registros de los archivos indicados, en el mismo orden
+
+        Los archivos que no se pueden leer se omiten y quedan en `fallidos`.
+
+        Args:
+            rutas: Iterable de rutas .xlsx
+
+        Yields:
+            dict: Registro de leer_checklist más tipo, tamano y mtime
+        """
+        grupo = []
+        for ruta in rutas:
+            grupo.append(str(ruta))
+            if len(grupo) >= LOTE_CACHE:
+                yield from self._leer_grupo(grupo)
+                grupo = []
+        if grupo:
+            yield from self._leer_grupo(grupo)
+
+    def recorrer(self, raiz: str = None):
+        """
+        Registros de todos los checklists bajo un directorio
+
+        Además descarta del caché los archivos que ya no existen.
+
+        Args:
+            raiz: Directorio a recorrer (por defecto, OUTPUT_DIR)
+
+        Yields:
+            dict: Registro de cada checklist, en orden de ruta
+        """
+        raiz = os.path.abspath(str(raiz or self.config["OUTPUT_DIR"]))
+        rutas = []
+        if os.path.isdir(raiz):
+            rutas = sorted(
+                entry.path
+                for _, entry in recorrer(raiz)
+                if entry.name.endswith(".xlsx") and checklist_de_nombre(entry.name)
+            )
+
+        yield from self.leer(rutas)
+        self.cache.podar(raiz, set(rutas))
+
+    def _leer_grupo(self, rutas: list):
+        """Resolver un grupo contra el caché y leer lo que falte"""
+        from app.services import worker_pool
+
+        claves = {}
+        for ruta in rutas:
+            try:
+                stat = os.stat(ruta)
+            except OSError as e:
+                self._fallido(ruta, e)
+                continue
+            claves[ruta] = (stat.st_size, stat.st_mtime)
+
+        registros = self.cache.obtener(claves)
+        faltantes = [ruta for ruta in claves if ruta not in registros]
+        self.estadisticas["en_cache"] += len(registros)
+
+        if len(faltantes) < MINIMO_POOL:
+            leidos = worker_pool.leer_checklists(faltantes)
+        else:
+            pool = worker_pool.obtener_pool(self.config, self.workers, "lectura")
+            futuros = [
+                pool.submit(worker_pool.leer_checklists, faltantes[i : i + LOTE_POOL])
+                for i in range(0, len(faltantes), LOTE_POOL)
+            ]
+            leidos = [resultado for f in futuros for resultado in f.result()]
+
+        nuevos = []
+        for ruta, registro, error in leidos:
+            if error is not None:
+                self._fallido(ruta, error)
+                continue
+            tamano, mtime = claves[ruta]
+            registro.update(tamano=tamano, mtime=mtime)
+            registros[ruta] = registro
+            nuevos.append(registro)
+
+        if nuevos:
+            self.cache.guardar(nuevos)
+        self.estadisticas["leidos"] += len(nuevos)
+
+        for ruta in rutas:
+            registro = registros.get(ruta)
+            if registro is not None:
+                self.estadisticas["total"] += 1
+                registro["respuestas"] = {
+                    int(k): v for k, v in registro["respuestas"].items()
+                }
+                registro["tipo"] = _tipo_de_nombre(registro["nombre_archivo"])
+                yield registro
+
+    def _fallido(self, ruta: str, error):
+        self.estadisticas["errores"] += 1
+        self.fallidos.append((ruta, str(error)))
+
+
+def _tipo_de_nombre(nombre_archivo: str) -> str:
+    """Clave del checklist (pc, macos, ...) de un nombre generado"""
+    from app.models.checklist_data import get_all_checklists
+
+    config = checklist_de_nombre(nombre_archivo)
+    return next(
+        (tipo for tipo, actual in get_all_checklists().items() if actual is config),
+        None,
+    )
@@ -0,0 +1,314 @@
+import os
+import io
+import gzip
+import json
+import time
+import queue
+import atexit
+import shutil
+import logging
+import threading
+from datetime import datetime, timedelta
+from logging.handlers import QueueHandler, QueueListener
+from flask.logging import default_handler
+from app.utils.bloqueo import bloqueo_archivo
+
+# Segundos que se espera antes de comprimir un respaldo recién rotado
+GRACIA_COMPRESION = 2.0
+
+
+class FormatoJson(logging.Formatter):
+    """Un objeto JSON por línea, para ingestión estructurada"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        datos = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(
+                timespec="milliseconds"
+            ),
+            "nivel": record.levelname,
+            "modulo": record.module,
+            "mensaje": record.getMessage(),
+            "pid": record.process,
+            "hilo": record.threadName,
+        }
+        if record.exc_info:
+            datos["excepcion"] = self.formatException(record.exc_info)
+
+        return json.dumps(datos, ensure_ascii=False)
+
+
+class ArchivoLogRotativo(logging.Handler):
+    """
+    Archivo de log compartido por varios procesos con rotación y compresión
+
+    Cada registro se escribe con una sola llamada write() sobre un
+    descriptor O_APPEND, así las líneas de distintos workers no se mezclan.
+    La rotación (por tamaño o por cambio de día/hora) se hace bajo un
+    bloqueo de archivo: el primer proceso renombra el log a
+    <log>.<fecha>, los demás detectan el cambio de inodo y reabren.
+    """
+
+    def __init__(
+        self,
+        ruta: str,
+        max_bytes: int = 10 * 1024 * 1024,
+        cuando: str = "midnight",
+        respaldos: int = 14,
+        comprimir: bool = True,
+    ):
+        super().__init__()
+        self.ruta = str(ruta)
+        self.max_bytes = max_bytes
+        self.cuando = cuando
+        self.respaldos = respaldos
+        self.comprimir = comprimir
+
+        self._fd = None
+        self._inodo = None
+        self._proxima_rotacion = self._calcular_proxima(time.time())
+        self._proxima_revision = 0.0
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            linea = (self.format(record) + "\n").encode("utf-8")
+
+            if self._fd is None:
+                self._abrir()
+
+            if self._debe_rotar(len(linea)):
+                self._rotar()
+
+            os.write(self._fd, linea)
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        super().close()
+
+    def _abrir(self):
+        """Abrir (o reabrir) el log en modo append"""
+        if self._fd is not None:
+            os.close(self._fd)
+
+        self._fd = os.open(self.ruta, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._inodo = os.fstat(self._fd).st_ino
+
+    def _debe_rotar(self, tamano_linea: int) -> bool:
+        """Verificar (sin bloqueo) si corresponde rotar"""
+        if self.cuando and time.time() >= self._proxima_rotacion:
+            return True
+
+        if (
+            self.max_bytes
+            and os.fstat(self._fd).st_size + tamano_linea > self.max_bytes
+        ):
+            return True
+
+        # Otro proceso ya rotó el archivo (se revisa como máximo cada segundo)
+        ahora = time.monotonic()
+        if ahora < self._proxima_revision:
+            return False
+        self._proxima_revision = ahora + 1.0
+
+        try:
+            return os.stat(self.ruta).st_ino != self._inodo
+        except FileNotFoundError:
+            return True
+
+    def _rotar(self):
+        """Rotar bajo bloqueo entre procesos, o reabrir si otro ya rotó"""
+        with bloqueo_archivo(self.ruta + ".lock"):
+            try:
+                actual = os.stat(self.ruta)
+            except FileNotFoundError:
+                actual = None
+
+            ya_rotado = actual is None or actual.st_ino != self._inodo
+            ahora = time.time()
+            por_tiempo = self.cuando and ahora >= self._proxima_rotacion
+            por_tamano = (
+                actual is not None
+                and self.max_bytes
+                and actual.st_size >= self.max_bytes
+            )
+
+            if not ya_rotado and (por_tiempo or por_tamano) and actual.st_size:
+                destino = self._nombre_respaldo(ahora)
+                os.rename(self.ruta, destino)
+                if self.comprimir:
+                    threading.Thread(
+                        target=self._comprimir_y_purgar, daemon=True
+                    ).start()
+                else:
+                    self._purgar()
+
+            self._proxima_rotacion = self._calcular_proxima(ahora)
+            self._abrir()
+
+    def _nombre_respaldo(self, momento: float) -> str:
+        """<log>.<AAAAmmdd-HHMMSS>[.n] sin pisar respaldos existentes"""
+        base = f"{self.ruta}.{datetime.fromtimestamp(momento):%Y%m%d-%H%M%S}"
+        destino, n = base, 1
+        while os.path.exists(destino) or os.path.exists(destino + ".gz"):
+            destino = f"{base}.{n}"
+            n += 1
+        return destino
+
+    def _comprimir_y_purgar(self):
+        """Comprimir con gzip los respaldos pendientes y aplicar la retención"""
+        # Otros workers pueden terminar una escritura en el archivo recién
+        # renombrado antes de reabrir; se espera a que lo suelten
+        time.sleep(GRACIA_COMPRESION)
+
+        for ruta in self._respaldos():
+            if ruta.endswith(".gz"):
+                continue
+            try:
+                if time.time() - os.path.getmtime(ruta) < GRACIA_COMPRESION:
+                    continue
+                with open(ruta, "rb") as origen, gzip.open(ruta + ".gz", "wb") as gz:
+                    shutil.copyfileobj(origen, gz, io.DEFAULT_BUFFER_SIZE * 16)
+                os.remove(ruta)
+            except OSError:
+                pass
+
+        self._purgar()
+
+    def _respaldos(self) -> list:
+        """Archivos rotados de este log, del más antiguo al más reciente"""
+        directorio = os.path.dirname(self.ruta) or "."
+        prefijo = os.path.basename(self.ruta) + "."
+
+        return sorted(
+            entry.path
+            for entry in os.scandir(directorio)
+            if entry.name.startswith(prefijo)
+            and not entry.name.endswith((".lock", ".tmp"))
+        )
+
+    def _purgar(self):
+        """Conservar solo los últimos `respaldos` archivos rotados"""
+        if not self.respaldos:
+            return
+
+        for ruta in self._respaldos()[: -self.respaldos]:
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+
+    def _calcular_proxima(self, ahora: float) -> float:
+        """Momento de la próxima rotación por tiempo"""
+        momento = datetime.fromtimestamp(ahora)
+
+        if self.cuando == "midnight":
+            siguiente = momento.replace(hour=0, minute=0, second=0, microsecond=0)
+            return (siguiente + timedelta(days=1)).timestamp()
+
+        if self.cuando == "hourly":
+            siguiente = momento.replace(minute=0, second=0, microsecond=0)
+            return (siguiente + timedelta(hours=1)).timestamp()
+
+        return float("inf")
+
+
+class ManejadorCola(QueueHandler):
+    """
+    QueueHandler que inicia su listener en cada proceso
+
+    Los hilos de las peticiones solo encolan; el listener (un hilo por
+    proceso) escribe en archivo y consola. Tras un fork se crea una cola y
+    un listener nuevos, ya que el hilo del padre no existe en el hijo.
+    """
+
+    def __init__(self, handlers: list):
+        super().__init__(queue.SimpleQueue())
+        self.destinos = handlers
+        self.listener = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._atexit = False
+
+    def enqueue(self, record: logging.LogRecord):
+        if self._pid != os.getpid():
+            self._iniciar()
+        self.queue.put_nowait(record)
+
+    def detener(self):
+        """Vaciar la cola y detener el listener"""
+        with self._lock:
+            if self.listener is not None and self._pid == os.getpid():
+                self.listener.stop()
+            self.listener = None
+            self._pid = None
+
+        for handler in self.destinos:
+            handler.close()
+
+    def _iniciar(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+
+            self.queue = queue.SimpleQueue()
+            self.listener = QueueListener(
+                self.queue, *self.destinos, respect_handler_level=True
+            )
+            self.listener.start()
+            self._pid = os.getpid()
+
+            if not self._atexit:
+                atexit.register(self.detener)
+                self._atexit = True
+
+
+def configurar_logger(logger: logging.Logger, config) -> ManejadorCola:
+    """
+    Reemplazar los handlers del logger por la cola con archivo rotativo
+
+    Args:
+        logger: Logger de la aplicación
+        config: Configuración de la aplicación
+
+    Returns:
+        ManejadorCola: Handler instalado
+    """
+    nivel = getattr(logging, config["LOG_LEVEL"])
+
+    os.makedirs(os.path.dirname(str(config["LOG_FILE"])) or ".", exist_ok=True)
+
+    texto = logging.Formatter("[%(asctime)s] %(levelname)s in %(module)s: %(message)s")
+
+    archivo = ArchivoLogRotativo(
+        config["LOG_FILE"],
+        max_bytes=int(config.get("LOG_MAX_MB", 10) * 1024 * 1024),
+        cuando=config.get("LOG_ROTATE_WHEN", "midnight"),
+        respaldos=config.get("LOG_BACKUP_COUNT", 14),
+        comprimir=config.get("LOG_COMPRESS", True),
+    )
+    archivo.setLevel(nivel)
+    archivo.setFormatter(FormatoJson() if config.get("LOG_JSON") else texto)
+
+    consola = logging.StreamHandler()
+    consola.setLevel(nivel)
+    consola.setFormatter(texto)
+
+    # El handler de Flask escribiría cada registro a stderr por segunda vez,
+    # en el hilo de la petición
+    logger.removeHandler(default_handler)
+
+    # Cada create_app reutiliza el mismo logger: quitar la cola anterior
+    for handler in list(logger.handlers):
+        if isinstance(handler, ManejadorCola):
+            logger.removeHandler(handler)
+            handler.detener()
+
+    manejador = ManejadorCola([archivo, consola])
+    manejador.setLevel(nivel)
+    logger.addHandler(manejador)
+    logger.setLevel(nivel)
+
+    return manejador
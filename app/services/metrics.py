@@ -0,0 +1,454 @@
+import os
+import json
+import time
+import atexit
+import threading
+from contextlib import contextmanager
+from flask import g, request
+from app.utils.bloqueo import bloqueo_archivo
+
+# Límites (segundos) de los buckets de los histogramas
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Valores acumulados de los procesos ya terminados
+ARCHIVO_RETIRADOS = "retirados.json"
+
+# nombre -> (tipo, ayuda)
+DEFINICIONES = {
+    "checklist_etapa_segundos": (
+        "histogram",
+        "Duración de cada etapa de la generación de un checklist",
+    ),
+    "copia_red_segundos": (
+        "histogram",
+        "Duración de las copias a la carpeta compartida",
+    ),
+    "checklists_generados_total": (
+        "counter",
+        "Checklists generados por tipo y resultado",
+    ),
+    "copias_red_total": (
+        "counter",
+        "Copias a la carpeta compartida por resultado",
+    ),
+    "circuito_red_procesos": (
+        "gauge",
+        "Procesos con el circuito de la compartida en cada estado",
+    ),
+    "circuito_red_transiciones_total": (
+        "counter",
+        "Cambios de estado del circuito de la compartida",
+    ),
+    "retencion_archivos_total": (
+        "counter",
+        "Archivos eliminados por la retención, por motivo",
+    ),
+    "http_peticion_segundos": (
+        "histogram",
+        "Latencia de las peticiones HTTP por ruta",
+    ),
+    "http_peticiones_total": (
+        "counter",
+        "Peticiones HTTP por ruta, método y código de respuesta",
+    ),
+}
+
+
+class Metricas:
+    """
+    Contadores, gauges e histogramas en formato de exposición de Prometheus
+
+    Cada proceso acumula en memoria y vuelca sus valores a
+    METRICS_DIR/<pid>-<inicio>.json desde un hilo cada METRICS_FLUSH_INTERVAL
+    segundos; /metrics suma los archivos de todos los procesos, así los
+    workers de gunicorn y los procesos del pool se agregan correctamente.
+    Para que los contadores no retrocedan, los valores de procesos
+    terminados se suman a ARCHIVO_RETIRADOS cuando arranca un proceso
+    (consolidar_directorio), así la cantidad de archivos que lee cada
+    scrape queda acotada por los procesos vivos. Los gauges también se
+    suman entre procesos, pero los de procesos terminados se descartan.
+    """
+
+    def __init__(self):
+        self.habilitadas = True
+        self.directorio = None
+        self.intervalo = 1.0
+
+        self._lock = threading.Lock()
+        # (nombre, etiquetas) -> contador | [buckets..., +Inf, suma, cantidad]
+        self._valores = {}
+        self._pid = os.getpid()
+        self._archivo = f"{self._pid}-{time.time_ns()}.json"
+        self._pendiente = False
+        self._hilo_pid = None
+        self._atexit = False
+
+    def init_app(self, app):
+        """
+        Configurar las métricas y medir la latencia de cada petición
+
+        Args:
+            app: Aplicación Flask
+        """
+        self.habilitadas = app.config.get("METRICS_ENABLED", True)
+        self.intervalo = app.config.get("METRICS_FLUSH_INTERVAL", self.intervalo)
+        directorio = app.config.get("METRICS_DIR")
+        self.directorio = str(directorio) if directorio else None
+
+        if not self.habilitadas:
+            return
+
+        if self.directorio:
+            os.makedirs(self.directorio, exist_ok=True)
+            self.consolidar_directorio(self.directorio)
+            if not self._atexit:
+                atexit.register(self.volcar)
+                self._atexit = True
+
+        @app.before_request
+        def iniciar_medicion():
+            g.inicio_peticion = time.perf_counter()
+
+        @app.after_request
+        def registrar_peticion(response):
+            inicio = g.pop("inicio_peticion", None)
+            if inicio is not None:
+                endpoint = request.endpoint or "desconocido"
+                self.observar(
+                    "http_peticion_segundos",
+                    time.perf_counter() - inicio,
+                    endpoint=endpoint,
+                    metodo=request.method,
+                )
+                self.incrementar(
+                    "http_peticiones_total",
+                    endpoint=endpoint,
+                    metodo=request.method,
+                    status=str(response.status_code),
+                )
+            return response
+
+    def incrementar(self, nombre: str, valor: float = 1, **etiquetas):
+        """
+        Sumar a un contador
+
+        Args:
+            nombre: Nombre de la métrica
+            valor: Cantidad a sumar
+            **etiquetas: Etiquetas de la serie
+        """
+        if not self.habilitadas:
+            return
+
+        clave = (nombre, tuple(sorted(etiquetas.items())))
+        with self._lock:
+            self._reiniciar_si_fork()
+            self._valores[clave] = self._valores.get(clave, 0) + valor
+            self._pendiente = True
+
+        self._volcar_periodicamente()
+
+    def establecer(self, nombre: str, valor: float, **etiquetas):
+        """
+        Fijar el valor de un gauge de este proceso
+
+        Args:
+            nombre: Nombre de la métrica
+            valor: Valor actual
+            **etiquetas: Etiquetas de la serie
+        """
+        if not self.habilitadas:
+            return
+
+        clave = (nombre, tuple(sorted(etiquetas.items())))
+        with self._lock:
+            self._reiniciar_si_fork()
+            self._valores[clave] = valor
+            self._pendiente = True
+
+        self._volcar_periodicamente()
+
+    def observar(self, nombre: str, segundos: float, **etiquetas):
+        """
+        Registrar una observación en un histograma
+
+        Args:
+            nombre: Nombre de la métrica
+            segundos: Valor observado
+            **etiquetas: Etiquetas de la serie
+        """
+        if not self.habilitadas:
+            return
+
+        clave = (nombre, tuple(sorted(etiquetas.items())))
+        with self._lock:
+            self._reiniciar_si_fork()
+            serie = self._valores.get(clave)
+            if serie is None:
+                serie = self._valores[clave] = [0] * (len(BUCKETS) + 3)
+
+            for i, limite in enumerate(BUCKETS):
+                if segundos <= limite:
+                    serie[i] += 1
+                    break
+            else:
+                serie[len(BUCKETS)] += 1
+
+            serie[-2] += segundos
+            serie[-1] += 1
+            self._pendiente = True
+
+        self._volcar_periodicamente()
+
+    @contextmanager
+    def medir(self, nombre: str, **etiquetas):
+        """Medir la duración de un bloque en un histograma"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(nombre, time.perf_counter() - inicio, **etiquetas)
+
+    def volcar(self):
+        """Escribir los valores de este proceso en el directorio compartido"""
+        if not self.directorio:
+            return
+
+        with self._lock:
+            if not self._pendiente:
+                return
+            datos = [
+                [n, list(e), list(v) if isinstance(v, list) else v]
+                for (n, e), v in self._valores.items()
+            ]
+            self._pendiente = False
+
+        destino = os.path.join(self.directorio, self._archivo)
+        temporal = f"{destino}.{threading.get_ident()}.tmp"
+
+        try:
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump(datos, f)
+            os.replace(temporal, destino)
+        except OSError:
+            with self._lock:
+                self._pendiente = True
+
+    def exponer(self) -> str:
+        """
+        Generar el texto de exposición con los valores de todos los procesos
+
+        Returns:
+            str: Métricas en formato de texto de Prometheus
+        """
+        self.volcar()
+        totales = self._agregar()
+
+        lineas = []
+        for nombre, (tipo, ayuda) in DEFINICIONES.items():
+            series = sorted(
+                (etiquetas, valor)
+                for (n, etiquetas), valor in totales.items()
+                if n == nombre
+            )
+            lineas.append(f"# HELP {nombre} {ayuda}")
+            lineas.append(f"# TYPE {nombre} {tipo}")
+
+            for etiquetas, valor in series:
+                if tipo != "histogram":
+                    lineas.append(f"{nombre}{_etiquetas(etiquetas)} {valor:g}")
+                    continue
+
+                acumulado = 0
+                limites = [f"{limite:g}" for limite in BUCKETS] + ["+Inf"]
+                for limite, cantidad in zip(limites, valor[:-2]):
+                    acumulado += cantidad
+                    le = etiquetas + (("le", limite),)
+                    lineas.append(f"{nombre}_bucket{_etiquetas(le)} {acumulado}")
+                lineas.append(f"{nombre}_sum{_etiquetas(etiquetas)} {valor[-2]:.6f}")
+                lineas.append(f"{nombre}_count{_etiquetas(etiquetas)} {valor[-1]}")
+
+        return "\n".join(lineas) + "\n"
+
+    def limpiar(self):
+        """Descartar los valores de este proceso (y su archivo)"""
+        with self._lock:
+            self._valores.clear()
+            self._pendiente = False
+
+        if self.directorio:
+            try:
+                os.remove(os.path.join(self.directorio, self._archivo))
+            except OSError:
+                pass
+
+    @staticmethod
+    def limpiar_directorio(directorio):
+        """
+        Eliminar los valores de ejecuciones anteriores del servidor
+
+        Args:
+            directorio: Directorio compartido de métricas
+        """
+        if not os.path.isdir(directorio):
+            return
+
+        for entry in os.scandir(directorio):
+            if entry.name.endswith((".json", ".tmp")):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def consolidar_directorio(directorio) -> int:
+        """
+        Sumar los archivos de procesos terminados en ARCHIVO_RETIRADOS
+
+        Los workers reciclados y los procesos del pool dejan un archivo
+        cada uno; sin consolidar, cada scrape leería más archivos con el
+        tiempo. Si otro proceso ya está consolidando, no hace nada.
+
+        Args:
+            directorio: Directorio compartido de métricas
+
+        Returns:
+            int: Archivos consolidados
+        """
+        directorio = str(directorio)
+        with bloqueo_archivo(os.path.join(directorio, ".consolidar.lock"), False) as ok:
+            if not ok:
+                return 0
+
+            terminados = []
+            for entry in os.scandir(directorio):
+                pid = entry.name.split("-", 1)[0]
+                if (
+                    entry.name.endswith(".json")
+                    and pid.isdigit()
+                    and not _proceso_vivo(int(pid))
+                ):
+                    terminados.append(entry.path)
+
+            if not terminados:
+                return 0
+
+            retirados = os.path.join(directorio, ARCHIVO_RETIRADOS)
+            totales = {}
+            for ruta in [retirados] + terminados:
+                _sumar_archivo(totales, ruta)
+            for clave in [c for c in totales if _tipo(c[0]) == "gauge"]:
+                del totales[clave]
+
+            temporal = f"{retirados}.{os.getpid()}.tmp"
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump([[n, list(e), v] for (n, e), v in totales.items()], f)
+            os.replace(temporal, retirados)
+
+            for ruta in terminados:
+                try:
+                    os.remove(ruta)
+                except OSError:
+                    pass
+
+            return len(terminados)
+
+    def _agregar(self) -> dict:
+        """Sumar los valores de todos los procesos"""
+        if not self.directorio:
+            with self._lock:
+                return {
+                    clave: list(v) if isinstance(v, list) else v
+                    for clave, v in self._valores.items()
+                }
+
+        totales = {}
+        for entry in os.scandir(self.directorio):
+            if entry.name.endswith(".json"):
+                _sumar_archivo(totales, entry.path)
+
+        return totales
+
+    def _volcar_periodicamente(self):
+        """Iniciar (una vez por proceso) el hilo que vuelca cada intervalo"""
+        if not self.directorio or self._hilo_pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._hilo_pid == os.getpid():
+                return
+            self._hilo_pid = os.getpid()
+
+        threading.Thread(
+            target=self._bucle_volcado, name="metricas", daemon=True
+        ).start()
+
+    def _bucle_volcado(self):
+        """Volcar los valores pendientes mientras viva el proceso"""
+        while True:
+            time.sleep(self.intervalo)
+            self.volcar()
+
+    def _reiniciar_si_fork(self):
+        """Un proceso hijo (fork) no debe heredar ni sobrescribir los valores"""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._archivo = f"{self._pid}-{time.time_ns()}.json"
+            self._valores = {}
+
+
+def _sumar_archivo(totales: dict, ruta: str):
+    """Sumar a `totales` los valores volcados en un archivo"""
+    try:
+        with open(ruta, encoding="utf-8") as f:
+            datos = json.load(f)
+    except (OSError, ValueError):
+        return
+
+    for nombre, etiquetas, valor in datos:
+        clave = (nombre, tuple(tuple(e) for e in etiquetas))
+        actual = totales.get(clave)
+        if actual is None:
+            totales[clave] = list(valor) if isinstance(valor, list) else valor
+        elif isinstance(valor, list):
+            totales[clave] = [a + b for a, b in zip(actual, valor)]
+        else:
+            totales[clave] = actual + valor
+
+
+def _proceso_vivo(pid: int) -> bool:
+    """Verificar si existe el proceso `pid` (fuera de POSIX se asume vivo)"""
+    if pid == os.getpid() or os.name != "posix":
+        return True
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+    return True
+
+
+def _tipo(nombre: str) -> str:
+    """Tipo de una métrica según DEFINICIONES"""
+    return DEFINICIONES.get(nombre, ("counter",))[0]
+
+
+def _etiquetas(etiquetas: tuple) -> str:
+    """Formatear etiquetas {k="v",...} escapando comillas y barras"""
+    if not etiquetas:
+        return ""
+
+    partes = []
+    for clave, valor in etiquetas:
+        valor = (
+            str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        partes.append(f'{clave}="{valor}"')
+
+    return "{" + ",".join(partes) + "}"
+
+
+metricas = Metricas()
@@ -0,0 +1,240 @@
+import os
+import time
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# Campos disponibles en OUTPUT_LAYOUT, p. ej. "{empresa}/{tipo}/{anio}/{mes}"
+CAMPOS = ("empresa", "tipo", "anio", "mes", "dia")
+
+# Segmento para archivos cuyo nombre no corresponde a ningún checklist
+SIN_CLASIFICAR = "otros"
+
+CARACTERES_INVALIDOS = r'\/:*?"<>|'
+
+
+class DisposicionRutas:
+    """
+    Ubicación de los checklists dentro de OUTPUT_DIR y de la compartida
+
+    Con un patrón vacío todo queda en la raíz (disposición plana). Con
+    "{empresa}/{tipo}/{anio}/{mes}" cada directorio recibe solo los
+    checklists de un tipo en un mes, y la compartida usa la misma
+    estructura que la salida local. El nombre del archivo no cambia: la
+    copia a red y el journal de copias siguen identificándolo por nombre.
+    """
+
+    def __init__(self, patron: str, salida: str, red: str = None):
+        self.patron = (patron or "").strip("/")
+        self.salida = str(salida)
+        self.red = str(red) if red else None
+
+        # Validar el patrón al configurarlo y no en cada copia
+        self._segmentos(datetime.now(), "", "")
+
+    @property
+    def plana(self) -> bool:
+        """True si los archivos van directo en la raíz"""
+        return not self.patron
+
+    def relativa(
+        self, nombre_archivo: str, fecha: datetime = None, config: dict = None
+    ) -> str:
+        """
+        Ruta de un checklist relativa a la raíz de salida o de la compartida
+
+        Args:
+            nombre_archivo: Nombre generado por ExcelService
+            fecha: Fecha de generación (por defecto, ahora)
+            config: Configuración del checklist; si falta, la empresa y el
+                tipo se deducen del nombre del archivo
+
+        Returns:
+            str: Ruta relativa (solo el nombre si la disposición es plana)
+        """
+        if self.plana:
+            return nombre_archivo
+
+        if config is None:
+            config = checklist_de_nombre(nombre_archivo) or {}
+
+        segmentos = self._segmentos(
+            fecha or datetime.now(), config.get("empresa"), config.get("tipo")
+        )
+        return os.path.join(*segmentos, nombre_archivo)
+
+    def local(self, nombre_archivo: str, fecha=None, config: dict = None) -> str:
+        """Ruta absoluta en OUTPUT_DIR (crea los directorios intermedios)"""
+        return self._ruta(self.salida, nombre_archivo, fecha, config)
+
+    def en_red(self, nombre_archivo: str, fecha=None, config: dict = None) -> str:
+        """Ruta en la compartida (crea los directorios intermedios)"""
+        return self._ruta(self.red, nombre_archivo, fecha, config)
+
+    def migrar(self, raiz: str, workers: int = 8, simulacion: bool = False) -> dict:
+        """
+        Mover los archivos sueltos de la raíz a la disposición configurada
+
+        Cada archivo va al directorio que le corresponde según su nombre y
+        su fecha de modificación. Los movimientos se reparten entre varios
+        hilos porque en una compartida SMB cada rename es un viaje de red.
+        Un archivo que ya existe en el destino no se sobrescribe.
+
+        Args:
+            raiz: OUTPUT_DIR o la compartida
+            workers: Movimientos simultáneos
+            simulacion: Solo contar, sin mover
+
+        Returns:
+            dict: Reporte {movidos, conflictos, errores, segundos}
+        """
+        inicio = time.perf_counter()
+        reporte = {
+            "movidos": 0,
+            "conflictos": 0,
+            "errores": 0,
+            "simulacion": simulacion,
+        }
+        if self.plana:
+            reporte["segundos"] = 0.0
+            return reporte
+
+        lock = threading.Lock()
+
+        def mover(entry):
+            try:
+                fecha = datetime.fromtimestamp(entry.stat().st_mtime)
+                destino = os.path.join(raiz, self.relativa(entry.name, fecha))
+                if os.path.exists(destino):
+                    resultado = "conflictos"
+                elif simulacion:
+                    resultado = "movidos"
+                else:
+                    os.makedirs(os.path.dirname(destino), exist_ok=True)
+                    os.rename(entry.path, destino)
+                    resultado = "movidos"
+            except OSError:
+                resultado = "errores"
+
+            with lock:
+                reporte[resultado] += 1
+
+        with os.scandir(raiz) as entradas:
+            sueltos = [
+                entry
+                for entry in entradas
+                if not entry.name.startswith(".")
+                and entry.is_file(follow_symlinks=False)
+            ]
+
+        with ThreadPoolExecutor(
+            max_workers=max(workers, 1), thread_name_prefix="migrar"
+        ) as executor:
+            list(executor.map(mover, sueltos))
+
+        reporte["segundos"] = round(time.perf_counter() - inicio, 3)
+        return reporte
+
+    def _ruta(self, raiz, nombre_archivo, fecha, config) -> str:
+        ruta = os.path.join(raiz, self.relativa(nombre_archivo, fecha, config))
+        if not self.plana:
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        return ruta
+
+    def _segmentos(self, fecha: datetime, empresa: str, tipo: str) -> list:
+        valores = {
+            "empresa": _segmento(empresa),
+            "tipo": _segmento(tipo),
+            "anio": f"{fecha.year:04d}",
+            "mes": f"{fecha.month:02d}",
+            "dia": f"{fecha.day:02d}",
+        }
+        try:
+            return [
+                parte.format(**valores) for parte in self.patron.split("/") if parte
+            ]
+        except (KeyError, IndexError, ValueError) as e:
+            raise ValueError(
+                f"OUTPUT_LAYOUT inválido '{self.patron}'; campos: {', '.join(CAMPOS)}"
+            ) from e
+
+
+_lock = threading.Lock()
+_disposiciones = {}
+
+
+def disposicion(config) -> DisposicionRutas:
+    """
+    Disposición de rutas de la configuración (una instancia por valores)
+
+    Args:
+        config: Configuración de la aplicación
+
+    Returns:
+        DisposicionRutas: Disposición para OUTPUT_DIR y SHARED_NETWORK_PATH
+    """
+    clave = (
+        config.get("OUTPUT_LAYOUT", ""),
+        str(config["OUTPUT_DIR"]),
+        str(config.get("SHARED_NETWORK_PATH") or ""),
+    )
+    with _lock:
+        actual = _disposiciones.get(clave)
+        if actual is None:
+            actual = _disposiciones[clave] = DisposicionRutas(*clave)
+        return actual
+
+
+def checklist_de_nombre(nombre_archivo: str) -> dict:
+    """
+    Deducir el checklist a partir de un nombre generado por ExcelService
+
+    Args:
+        nombre_archivo: "Activo <af> Checklist <empresa> <tipo> ...xlsx"
+
+    Returns:
+        dict: Configuración del checklist, o None si no coincide ninguno
+    """
+    from app.models.checklist_data import get_all_checklists
+
+    for config in get_all_checklists().values():
+        marca = (
+            f" Checklist {_segmento(config['empresa'])} {_segmento(config['tipo'])} "
+        )
+        if marca in nombre_archivo:
+            return config
+
+    return None
+
+
+def recorrer(directorio: str, relativo: str = "", excluido: str = None):
+    """
+    Recorrer los archivos del directorio y sus subdirectorios
+
+    Args:
+        directorio: Raíz del recorrido
+        relativo: Subdirectorio actual, relativo a la raíz
+        excluido: Ruta absoluta de un subdirectorio a omitir
+
+    Yields:
+        tuple: (ruta relativa, os.DirEntry) de cada archivo
+    """
+    with os.scandir(os.path.join(directorio, relativo)) as entradas:
+        for entry in entradas:
+            if entry.name.startswith("."):
+                continue
+            ruta = os.path.join(relativo, entry.name)
+            if entry.is_dir(follow_symlinks=False):
+                if excluido and os.path.abspath(entry.path) == excluido:
+                    continue
+                yield from recorrer(directorio, ruta, excluido)
+            elif entry.is_file(follow_symlinks=False):
+                yield ruta, entry
+
+
+def _segmento(valor: str) -> str:
+    """Valor de un campo apto como nombre de directorio"""
+    valor = str(valor or "").strip() or SIN_CLASIFICAR
+    for char in CARACTERES_INVALIDOS:
+        valor = valor.replace(char, "_")
+    return valor
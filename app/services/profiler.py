@@ -0,0 +1,218 @@
+import os
+import sys
+import hmac
+import time
+import random
+import threading
+from collections import Counter
+from flask import g, request
+
+
+class PerfiladorMuestreo:
+    """
+    Perfilador por muestreo de pila de un hilo
+
+    Un hilo auxiliar toma la pila del hilo perfilado cada `intervalo`
+    segundos y cuenta cada pila distinta; el resultado se escribe en
+    formato "collapsed" (frame1;frame2;... cantidad), el que leen
+    flamegraph.pl, speedscope e inferno.
+    """
+
+    def __init__(self, thread_id: int, intervalo: float = 0.001):
+        self.thread_id = thread_id
+        self.intervalo = intervalo
+        self.muestras = Counter()
+        self.inicio = None
+        self.duracion = 0.0
+
+        self._nombres = {}  # code -> "funcion (archivo:línea)"
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def iniciar(self):
+        """Comenzar a muestrear"""
+        self.inicio = time.perf_counter()
+        self._hilo = threading.Thread(
+            target=self._muestrear, name="perfilador", daemon=True
+        )
+        self._hilo.start()
+
+    def detener(self) -> Counter:
+        """
+        Dejar de muestrear
+
+        Returns:
+            Counter: Cantidad de muestras por pila
+        """
+        if self._hilo is not None:
+            self._detener.set()
+            self._hilo.join()
+            self._hilo = None
+            self.duracion = time.perf_counter() - self.inicio
+
+        return self.muestras
+
+    def collapsed(self) -> str:
+        """Muestras en formato collapsed, una pila por línea"""
+        return "".join(
+            f"{pila} {cantidad}\n" for pila, cantidad in self.muestras.most_common()
+        )
+
+    def _muestrear(self):
+        """Bucle del hilo auxiliar"""
+        while not self._detener.wait(self.intervalo):
+            frame = sys._current_frames().get(self.thread_id)
+
+            pila = []
+            while frame is not None:
+                pila.append(self._nombre(frame.f_code))
+                frame = frame.f_back
+
+            if pila:
+                self.muestras[";".join(reversed(pila))] += 1
+
+    def _nombre(self, code) -> str:
+        """Nombre legible (y cacheado) de un frame"""
+        nombre = self._nombres.get(code)
+        if nombre is None:
+            partes = code.co_filename.replace("\\", "/").split("/")
+            archivo = "/".join(partes[-2:])
+            nombre = f"{code.co_name} ({archivo}:{code.co_firstlineno})"
+            # ';' separa frames en el formato collapsed
+            nombre = self._nombres[code] = nombre.replace(";", ":")
+        return nombre
+
+
+class Profiler:
+    """
+    Perfilado opcional de peticiones
+
+    Una petición se perfila si trae el encabezado X-Profile con el valor de
+    PROFILING_SECRET, o al azar con probabilidad PROFILING_SAMPLE_RATE.
+    Los perfiles se guardan en PROFILING_DIR (dentro de LOGS_DIR)
+    conservando como máximo PROFILING_MAX_FILES archivos y
+    PROFILING_MAX_MB megabytes.
+    """
+
+    ENCABEZADO = "X-Profile"
+
+    def __init__(self):
+        self.habilitado = False
+        self.secreto = None
+        self.tasa = 0.0
+        self.intervalo = 0.001
+        self.directorio = None
+        self.max_archivos = 50
+        self.max_bytes = 50 * 1024 * 1024
+
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Registrar el perfilado en la aplicación (solo si está habilitado)
+
+        Args:
+            app: Aplicación Flask
+        """
+        self.habilitado = app.config.get("PROFILING_ENABLED", False)
+        self.secreto = app.config.get("PROFILING_SECRET") or None
+        self.tasa = app.config.get("PROFILING_SAMPLE_RATE", 0.0)
+        self.intervalo = app.config.get("PROFILING_INTERVAL_MS", 1) / 1000
+        self.directorio = str(app.config["PROFILING_DIR"])
+        self.max_archivos = app.config.get("PROFILING_MAX_FILES", self.max_archivos)
+        self.max_bytes = int(app.config.get("PROFILING_MAX_MB", 50) * 1024 * 1024)
+
+        if not self.habilitado:
+            return
+
+        os.makedirs(self.directorio, exist_ok=True)
+
+        @app.before_request
+        def iniciar_perfil():
+            if self.debe_perfilar():
+                perfilador = PerfiladorMuestreo(threading.get_ident(), self.intervalo)
+                perfilador.iniciar()
+                g.perfilador = perfilador
+
+        @app.after_request
+        def guardar_perfil(response):
+            perfilador = g.pop("perfilador", None)
+            if perfilador is not None:
+                archivo = self.guardar(perfilador, response.status_code)
+                if archivo and request.headers.get(self.ENCABEZADO):
+                    response.headers["X-Profile-File"] = archivo
+            return response
+
+        @app.teardown_request
+        def descartar_perfil(error):
+            # Si la petición falló antes de after_request, guardar igual
+            perfilador = g.pop("perfilador", None)
+            if perfilador is not None:
+                self.guardar(perfilador, 500)
+
+    def debe_perfilar(self) -> bool:
+        """Decidir si la petición actual se perfila"""
+        valor = request.headers.get(self.ENCABEZADO)
+        if valor and self.secreto and hmac.compare_digest(valor, self.secreto):
+            return True
+
+        return self.tasa > 0 and random.random() < self.tasa
+
+    def perfilando(self) -> bool:
+        """Indicar si la petición actual se está perfilando"""
+        return g.get("perfilador") is not None
+
+    def guardar(self, perfilador: PerfiladorMuestreo, status: int) -> str:
+        """
+        Escribir el perfil y aplicar los límites de retención
+
+        Args:
+            perfilador: Perfilador detenido o en curso
+            status: Código de respuesta de la petición
+
+        Returns:
+            str: Nombre del archivo, o None si no hubo muestras
+        """
+        perfilador.detener()
+        if not perfilador.muestras:
+            return None
+
+        endpoint = (request.endpoint or "desconocido").replace(".", "-")
+        nombre = (
+            f"{time.strftime('%Y%m%d-%H%M%S')}_{os.getpid()}_{endpoint}_"
+            f"{request.method}_{status}_{int(perfilador.duracion * 1000)}ms.collapsed"
+        )
+
+        with open(os.path.join(self.directorio, nombre), "w", encoding="utf-8") as f:
+            f.write(perfilador.collapsed())
+
+        self.purgar()
+
+        return nombre
+
+    def purgar(self):
+        """Eliminar los perfiles más antiguos que excedan los límites"""
+        with self._lock:
+            perfiles = []
+            for entry in os.scandir(self.directorio):
+                if not entry.name.endswith(".collapsed"):
+                    continue
+                # Otro worker pudo eliminarlo entre el listado y el stat
+                try:
+                    estado = entry.stat()
+                except OSError:
+                    continue
+                perfiles.append((estado.st_mtime, estado.st_size, entry.path))
+
+            perfiles.sort(reverse=True)  # más recientes primero
+            total = 0
+            for indice, (_, tamano, ruta) in enumerate(perfiles):
+                total += tamano
+                if indice >= self.max_archivos or total > self.max_bytes:
+                    try:
+                        os.remove(ruta)
+                    except OSError:
+                        pass
+
+
+profiler = Profiler()
@@ -0,0 +1,217 @@
+import os
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from app.models.checklist_data import get_checklist
+from app.services.lector_checklist import LectorChecklists
+from app.services.path_layout import recorrer, checklist_de_nombre
+from app.services.submission_store import submission_store
+
+# Origen de las filas del reporte
+FUENTES = ("envios", "archivos")
+
+# Columnas fijas antes de una columna por pregunta
+ENCABEZADO = (
+    "Activo fijo",
+    "Propietario",
+    "Cargo",
+    "Técnico",
+    "Fecha",
+    "Revisado por",
+    "Archivo",
+)
+
+
+class ReportService:
+    """Servicio para consolidar checklists de un tipo en un solo workbook"""
+
+    @staticmethod
+    def generar_reporte(
+        tipo: str,
+        destino,
+        fuente: str = "envios",
+        desde: str = None,
+        hasta: str = None,
+        todos: bool = False,
+    ) -> dict:
+        """
+        Escribir el reporte consolidado: una fila por equipo, una columna por
+        pregunta
+
+        El workbook se escribe en modo write-only: cada fila va directo al
+        archivo, así la memoria no crece con la cantidad de filas. Las filas
+        salen del registro de envíos o de los .xlsx de OUTPUT_DIR.
+
+        Args:
+            tipo: Tipo de checklist
+            destino: Ruta o buffer binario del .xlsx
+            fuente: "envios" (registro indexado) o "archivos" (OUTPUT_DIR)
+            desde: Fecha inicial AAAA-MM-DD (inclusive)
+            hasta: Fecha final AAAA-MM-DD (inclusive)
+            todos: Una fila por checklist en lugar de solo el más reciente
+                de cada equipo
+
+        Returns:
+            dict: Resumen {tipo, fuente, filas, segundos}
+
+        Raises:
+            ValueError: Tipo o fuente desconocidos, fecha inválida o registro
+                de envíos deshabilitado
+        """
+        inicio = time.perf_counter()
+        config = get_checklist(tipo)
+        if not config:
+            raise ValueError(f"Checklist tipo '{tipo}' no encontrado")
+        if fuente not in FUENTES:
+            raise ValueError(f"Fuente desconocida: {fuente}")
+        # Validar las fechas antes de empezar a escribir (las filas son perezosas)
+        _limite(desde), _limite(hasta)
+
+        if fuente == "envios":
+            if not submission_store.habilitado:
+                raise ValueError("El registro de envíos está deshabilitado")
+            filas = ReportService._filas_envios(tipo, desde, hasta, todos)
+        else:
+            filas = ReportService._filas_archivos(config, desde, hasta, todos)
+
+        preguntas = config["preguntas"]
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title=str(config["tipo"])[:31])
+        ws.freeze_panes = "B2"
+
+        negrita = Font(bold=True)
+        encabezado = []
+        for titulo in (
+            *ENCABEZADO,
+            *(f"{i}. {texto}" for i, texto in enumerate(preguntas, 1)),
+        ):
+            celda = WriteOnlyCell(ws, value=titulo)
+            celda.font = negrita
+            encabezado.append(celda)
+        ws.append(encabezado)
+
+        total = 0
+        for datos, respuestas in filas:
+            ws.append(
+                [
+                    *(datos.get(campo) for campo in ENCABEZADO),
+                    *(respuestas.get(i) for i in range(1, len(preguntas) + 1)),
+                ]
+            )
+            total += 1
+
+        wb.save(destino)
+
+        resumen = {
+            "tipo": tipo,
+            "fuente": fuente,
+            "filas": total,
+            "segundos": round(time.perf_counter() - inicio, 3),
+        }
+        current_app.logger.info(
+            f"Reporte {tipo} ({fuente}): {total} filas en {resumen['segundos']}s"
+        )
+
+        return resumen
+
+    @staticmethod
+    def _filas_envios(tipo, desde, hasta, todos):
+        """Filas del registro de envíos (datos, respuestas)"""
+        for envio in submission_store.iterar(
+            tipo, desde, hasta, ultimo_por_activo=not todos
+        ):
+            datos = {
+                "Activo fijo": envio["activo_fijo"],
+                "Propietario": envio["propietario"],
+                "Cargo": envio["cargo"],
+                "Técnico": envio["tecnico"],
+                "Fecha": envio["creado"],
+                "Archivo": envio["nombre_archivo"],
+            }
+            yield datos, {int(k): v for k, v in envio["respuestas"].items()}
+
+    @staticmethod
+    def _filas_archivos(config, desde, hasta, todos):
+        """
+        Filas de los checklists generados en OUTPUT_DIR (datos, respuestas)
+
+        El rango de fechas se aplica a la fecha de modificación del archivo,
+        antes de abrirlo. Solo se guardan en memoria las rutas candidatas,
+        no su contenido; se leen con LectorChecklists (en paralelo y con
+        caché), así un reporte repetido solo abre los archivos nuevos.
+        """
+        raiz = str(current_app.config["OUTPUT_DIR"])
+        minimo = _limite(desde)
+        maximo = _limite(hasta, dias=1)
+
+        candidatos = []
+        if os.path.isdir(raiz):
+            for _, entry in recorrer(raiz):
+                if not entry.name.endswith(".xlsx"):
+                    continue
+                encontrado = checklist_de_nombre(entry.name)
+                if not encontrado or encontrado["plantilla"] != config["plantilla"]:
+                    continue
+                mtime = entry.stat().st_mtime
+                if (minimo and mtime < minimo) or (maximo and mtime >= maximo):
+                    continue
+                activo = _datos_de_nombre(entry.name, config)["Activo fijo"]
+                candidatos.append((activo.lower(), mtime, entry.path))
+
+        candidatos.sort()
+        if not todos:
+            # Solo el más reciente de cada equipo
+            candidatos = [
+                actual
+                for actual, siguiente in zip(candidatos, candidatos[1:] + [None])
+                if not siguiente or siguiente[0] != actual[0]
+            ]
+
+        lector = LectorChecklists(current_app.config)
+        for leido in lector.leer(ruta for _, _, ruta in candidatos):
+            datos = {
+                **_datos_de_nombre(leido["nombre_archivo"], config),
+                "Técnico": leido["tecnico"],
+                "Fecha": leido["fecha"]
+                or datetime.fromtimestamp(leido["mtime"]).strftime("%d/%m/%Y"),
+                "Revisado por": leido["validador"],
+                "Archivo": leido["nombre_archivo"],
+            }
+            yield datos, leido["respuestas"]
+
+        for ruta, error in lector.fallidos:
+            current_app.logger.warning(f"Reporte: no se pudo leer {ruta}: {error}")
+
+
+def _datos_de_nombre(nombre_archivo: str, config: dict) -> dict:
+    """
+    Activo, propietario y cargo de un nombre generado por ExcelService
+
+    "Activo <af> Checklist <empresa> <tipo> <propietario> <cargo>.xlsx", con
+    los espacios de propietario y cargo cambiados por guiones.
+    """
+    activo, _, resto = nombre_archivo[: -len(".xlsx")].partition(" Checklist ")
+    resto = resto[len(f"{config['empresa']} {config['tipo']} ") :]
+    propietario, _, cargo = resto.rpartition(" ")
+
+    return {
+        "Activo fijo": activo[len("Activo ") :],
+        "Propietario": propietario,
+        "Cargo": cargo,
+    }
+
+
+def _limite(fecha: str, dias: int = 0) -> float:
+    """
+    Timestamp del inicio de una fecha AAAA-MM-DD (más `dias`), o None
+
+    Raises:
+        ValueError: Si la fecha no tiene formato AAAA-MM-DD
+    """
+    if not fecha:
+        return None
+    inicio = datetime.strptime(fecha, "%Y-%m-%d") + timedelta(days=dias)
+    return inicio.timestamp()
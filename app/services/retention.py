@@ -0,0 +1,451 @@
+import os
+import re
+import time
+import zipfile
+import threading
+from datetime import datetime
+from dataclasses import dataclass
+from app.services.copy_queue import CopyQueue, copias_pendientes
+from app.services.metrics import metricas
+from app.services.path_layout import recorrer
+from app.utils.bloqueo import bloqueo_archivo
+
+# Activo dentro del nombre que arma ExcelService._generar_nombre_archivo
+PATRON_ACTIVO = re.compile(r"^Activo (.+?) Checklist ")
+
+# Motivos de eliminación
+POR_ANTIGUEDAD = "antiguedad"
+POR_ACTIVO = "por_activo"
+POR_TAMANO = "tamano"
+
+
+@dataclass(frozen=True)
+class Politica:
+    """
+    Reglas de retención; 0 desactiva cada una
+
+    Args:
+        max_dias: Eliminar archivos con más días de antigüedad
+        max_mb: Eliminar los más antiguos mientras el total supere este tamaño
+        max_por_activo: Conservar solo los N más recientes de cada activo
+        archivar_en: Directorio donde archivar antes de eliminar (opcional)
+    """
+
+    max_dias: float = 0
+    max_mb: float = 0
+    max_por_activo: int = 0
+    archivar_en: str = None
+
+
+class Barrido:
+    """
+    Estado de una pasada completa sobre el directorio
+
+    El recorrido con os.scandir avanza por lotes y puede repartirse entre
+    varias ejecuciones; las reglas por activo y por tamaño se aplican al
+    terminar el recorrido, sobre los archivos que no venció la antigüedad.
+    Se recorren también los subdirectorios (OUTPUT_LAYOUT), y cada archivo
+    se identifica por su ruta relativa al directorio.
+    """
+
+    def __init__(self, directorio: str, politica: Politica):
+        self.directorio = directorio
+        self.politica = politica
+        self.limite_mtime = (
+            time.time() - politica.max_dias * 86400 if politica.max_dias else None
+        )
+        self.inicio = time.time()
+
+        self.escaneados = 0
+        self.inventario = []  # (mtime, tamaño, nombre) de los que se conservan
+        self.por_activo = {}  # activo -> [(mtime, tamaño, nombre)]
+        self.candidatos = []  # (nombre, tamaño, mtime, motivo) a eliminar
+        self.escaneo_completo = False
+        self.reglas_aplicadas = False
+
+        # Un directorio de archivo dentro de la salida no se recorre
+        excluido = politica.archivar_en and os.path.abspath(politica.archivar_en)
+        self._iterador = recorrer(directorio, excluido=excluido)
+
+    def escanear(self, lote: int) -> bool:
+        """
+        Procesar hasta `lote` entradas
+
+        Returns:
+            bool: True si el recorrido terminó
+        """
+        for _ in range(lote):
+            siguiente = next(self._iterador, None)
+            if siguiente is None:
+                self.escaneo_completo = True
+                return True
+
+            relativa, entry = siguiente
+            try:
+                estado = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+
+            self.escaneados += 1
+            archivo = (estado.st_mtime, estado.st_size, relativa)
+
+            # No tocar lo recién creado en esta pasada (p. ej. en escritura)
+            if estado.st_mtime >= self.inicio:
+                continue
+
+            if self.limite_mtime is not None and estado.st_mtime < self.limite_mtime:
+                self.candidatos.append(
+                    (relativa, estado.st_size, estado.st_mtime, POR_ANTIGUEDAD)
+                )
+                continue
+
+            self.inventario.append(archivo)
+            if self.politica.max_por_activo:
+                coincidencia = PATRON_ACTIVO.match(entry.name)
+                if coincidencia:
+                    self.por_activo.setdefault(coincidencia.group(1), []).append(
+                        archivo
+                    )
+
+        return False
+
+    def aplicar_reglas(self):
+        """Agregar los candidatos por activo y por tamaño total"""
+        eliminados = set()
+
+        if self.politica.max_por_activo:
+            for archivos in self.por_activo.values():
+                if len(archivos) <= self.politica.max_por_activo:
+                    continue
+                archivos.sort(reverse=True)  # más recientes primero
+                for mtime, tamano, nombre in archivos[self.politica.max_por_activo :]:
+                    self.candidatos.append((nombre, tamano, mtime, POR_ACTIVO))
+                    eliminados.add(nombre)
+
+        if self.politica.max_mb:
+            maximo = self.politica.max_mb * 1024 * 1024
+            restantes = [a for a in self.inventario if a[2] not in eliminados]
+            total = sum(tamano for _, tamano, _ in restantes)
+            restantes.sort()  # más antiguos primero
+            for mtime, tamano, nombre in restantes:
+                if total <= maximo:
+                    break
+                self.candidatos.append((nombre, tamano, mtime, POR_TAMANO))
+                total -= tamano
+
+        # Se procesan desde el final: los más antiguos primero, y cada lote
+        # cae en pocos zips diarios al archivar
+        self.candidatos.sort(key=lambda c: c[2], reverse=True)
+
+        self.inventario = []
+        self.por_activo = {}
+        self.reglas_aplicadas = True
+
+
+class Retencion:
+    """
+    Limpieza programada del directorio de salida
+
+    Un hilo por proceso ejecuta cada RETENTION_INTERVAL segundos; un
+    bloqueo de archivo asegura que solo un worker limpie a la vez. Cada
+    ejecución tiene un presupuesto de RETENTION_BUDGET segundos: si el
+    directorio es grande, la pasada continúa en la siguiente ejecución.
+    Los archivos con copia pendiente a la compartida nunca se eliminan.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.habilitada = False
+        self.directorio = None
+        self.politica = Politica()
+        self.intervalo = 3600.0
+        self.presupuesto = 5.0
+        self.lote = 500
+        self.journal_copias = None
+        self.ultimo_reporte = None
+
+        self._barrido = None
+        self._reporte = None
+        self._lock = threading.Lock()
+        self._hilo_pid = None
+        self._bloqueo = None
+
+    def init_app(self, app, programar: bool = True):
+        """
+        Configurar la retención y, si está habilitada, programarla
+
+        Args:
+            app: Aplicación Flask
+            programar: Iniciar el hilo de ejecución periódica
+        """
+        self.app = app
+        self.habilitada = app.config.get("RETENTION_ENABLED", False)
+        self.directorio = str(app.config["OUTPUT_DIR"])
+        self.politica = politica_desde_config(app.config)
+        self.intervalo = app.config.get("RETENTION_INTERVAL", self.intervalo)
+        self.presupuesto = app.config.get("RETENTION_BUDGET", self.presupuesto)
+        self.lote = app.config.get("RETENTION_BATCH", self.lote)
+        self.journal_copias = str(app.config["COPY_QUEUE_DIR"])
+        self._bloqueo = os.path.join(str(app.config["DATA_DIR"]), "retention.lock")
+
+        if self.habilitada and programar:
+            self.iniciar()
+
+    def iniciar(self):
+        """Iniciar el hilo periódico en este proceso (una vez por pid)"""
+        with self._lock:
+            if self._hilo_pid == os.getpid():
+                return
+            self._hilo_pid = os.getpid()
+
+        threading.Thread(target=self._bucle, name="retencion", daemon=True).start()
+
+    def ejecutar(self, presupuesto: float = None) -> dict:
+        """
+        Avanzar la pasada actual dentro del presupuesto de tiempo
+
+        Args:
+            presupuesto: Segundos disponibles (None = sin límite)
+
+        Returns:
+            dict: Reporte de la pasada si terminó, o None si otro proceso
+                está limpiando o la pasada continúa en la próxima ejecución
+        """
+        with self._lock, bloqueo_archivo(self._bloqueo, esperar=False) as obtenido:
+            if not obtenido:
+                return None
+
+            if self._barrido is None:
+                self._barrido = Barrido(self.directorio, self.politica)
+                self._reporte = _reporte_vacio(simulacion=False)
+
+            reporte = limpiar(
+                self._barrido,
+                self._reporte,
+                presupuesto,
+                self.lote,
+                self.journal_copias,
+            )
+            if reporte is None:
+                return None
+
+            self._barrido = None
+            self.ultimo_reporte = reporte
+            if reporte["eliminados"] and self.app:
+                self.app.logger.info(
+                    f"Retención: {reporte['eliminados']} archivos eliminados "
+                    f"({reporte['mb_liberados']} MB, "
+                    f"{reporte['archivados']} archivados) de "
+                    f"{reporte['escaneados']} en {reporte['segundos']}s"
+                )
+            return reporte
+
+    def _bucle(self):
+        """Ejecutar periódicamente mientras viva el proceso"""
+        espera = self.intervalo
+        while True:
+            time.sleep(espera)
+            try:
+                reporte = self.ejecutar(self.presupuesto)
+                # Una pasada sin terminar continúa pronto, no en una hora
+                espera = (
+                    self.intervalo if reporte is not None else min(self.intervalo, 60)
+                )
+            except Exception as e:
+                espera = self.intervalo
+                if self.app:
+                    self.app.logger.error(f"Error en retención de archivos: {e}")
+
+
+def limpiar(
+    barrido: Barrido,
+    reporte: dict,
+    presupuesto: float = None,
+    lote: int = 500,
+    journal_copias: str = None,
+) -> dict:
+    """
+    Recorrer, aplicar las reglas y eliminar (o archivar) por lotes
+
+    Args:
+        barrido: Pasada en curso
+        reporte: Reporte acumulado de la pasada
+        presupuesto: Segundos disponibles (None = sin límite)
+        lote: Entradas por lote entre verificaciones del presupuesto
+        journal_copias: Journal de la cola de copias (para no eliminar
+            archivos con copia pendiente)
+
+    Returns:
+        dict: Reporte final, o None si se agotó el presupuesto
+    """
+    limite = time.monotonic() + presupuesto if presupuesto else None
+    inicio = time.perf_counter()
+    lotes = 0
+
+    def queda_tiempo():
+        # Al menos un lote por ejecución, para avanzar aun con poco presupuesto
+        return limite is None or lotes == 0 or time.monotonic() < limite
+
+    try:
+        while not barrido.escaneo_completo and queda_tiempo():
+            barrido.escanear(lote)
+            lotes += 1
+
+        if barrido.escaneo_completo and not barrido.reglas_aplicadas:
+            barrido.aplicar_reglas()
+
+        while barrido.reglas_aplicadas and barrido.candidatos and queda_tiempo():
+            siguientes = barrido.candidatos[-lote:]
+            del barrido.candidatos[-lote:]
+            _procesar_lote(barrido, siguientes, reporte, journal_copias)
+            lotes += 1
+    finally:
+        reporte["segundos"] = round(
+            reporte["segundos"] + time.perf_counter() - inicio, 3
+        )
+
+    if not barrido.reglas_aplicadas or barrido.candidatos:
+        return None
+
+    reporte["escaneados"] = barrido.escaneados
+    reporte["mb_liberados"] = _mb(
+        sum(d["bytes"] for d in reporte["por_motivo"].values())
+    )
+    for detalle in reporte["por_motivo"].values():
+        detalle["mb"] = _mb(detalle.pop("bytes"))
+    return reporte
+
+
+def limpiar_directorio(
+    directorio: str,
+    politica: Politica,
+    journal_copias: str = None,
+    simulacion: bool = False,
+) -> dict:
+    """
+    Pasada completa e inmediata, sin presupuesto de tiempo
+
+    Args:
+        directorio: Directorio a limpiar
+        politica: Reglas de retención
+        journal_copias: Journal de la cola de copias
+        simulacion: Solo reportar lo que se eliminaría (con la lista de
+            archivos y su motivo), sin eliminar nada
+
+    Returns:
+        dict: Reporte de la pasada
+    """
+    barrido = Barrido(directorio, politica)
+    reporte = _reporte_vacio(simulacion)
+    return limpiar(barrido, reporte, journal_copias=journal_copias)
+
+
+def politica_desde_config(config) -> Politica:
+    """Construir la política de retención desde la configuración"""
+    archivar = config.get("RETENTION_ARCHIVE_DIR")
+    return Politica(
+        max_dias=config.get("RETENTION_MAX_DAYS", 0),
+        max_mb=config.get("RETENTION_MAX_MB", 0),
+        max_por_activo=config.get("RETENTION_KEEP_PER_ACTIVO", 0),
+        archivar_en=str(archivar) if archivar else None,
+    )
+
+
+def _procesar_lote(barrido, candidatos, reporte, journal_copias):
+    """Archivar (si corresponde) y eliminar un lote de candidatos"""
+    pendientes = copias_pendientes(journal_copias) if journal_copias else set()
+
+    seleccionados = []
+    for nombre, tamano, mtime, motivo in candidatos:
+        if pendientes and CopyQueue.id_copia(os.path.basename(nombre)) in pendientes:
+            reporte["omitidos_copia_pendiente"] += 1
+            continue
+        seleccionados.append((nombre, tamano, mtime, motivo))
+
+    if reporte["simulacion"]:
+        for nombre, tamano, mtime, motivo in seleccionados:
+            _contar(reporte, tamano, motivo)
+            reporte["archivos"].append({"nombre": nombre, "motivo": motivo})
+        return
+
+    archivados = set()
+    if barrido.politica.archivar_en and seleccionados:
+        archivados = _archivar(barrido, seleccionados)
+        reporte["archivados"] += len(archivados)
+
+    for nombre, tamano, mtime, motivo in seleccionados:
+        if barrido.politica.archivar_en and nombre not in archivados:
+            continue
+        try:
+            os.remove(os.path.join(barrido.directorio, nombre))
+        except FileNotFoundError:
+            continue
+        _contar(reporte, tamano, motivo)
+        metricas.incrementar("retencion_archivos_total", motivo=motivo)
+
+
+def _archivar(barrido, seleccionados) -> set:
+    """
+    Agregar los archivos a zips por día de modificación
+
+    Los .xlsx ya están comprimidos, así que se guardan sin recomprimir.
+
+    Returns:
+        set: Nombres archivados (los que fallen no se eliminan)
+    """
+    os.makedirs(barrido.politica.archivar_en, exist_ok=True)
+
+    por_dia = {}
+    for nombre, _, mtime, _ in seleccionados:
+        dia = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d")
+        por_dia.setdefault(dia, []).append(nombre)
+
+    archivados = set()
+    for dia, nombres in por_dia.items():
+        destino = os.path.join(barrido.politica.archivar_en, f"checklists-{dia}.zip")
+        with zipfile.ZipFile(destino, "a", zipfile.ZIP_STORED) as zf:
+            existentes = set(zf.namelist())
+            for nombre in nombres:
+                # Un archivo regenerado con el mismo nombre no pisa al anterior
+                base, extension = os.path.splitext(nombre)
+                interno, n = nombre, 1
+                while interno in existentes:
+                    interno = f"{base} ({n}){extension}"
+                    n += 1
+                try:
+                    zf.write(os.path.join(barrido.directorio, nombre), interno)
+                except FileNotFoundError:
+                    continue
+                existentes.add(interno)
+                archivados.add(nombre)
+
+    return archivados
+
+
+def _contar(reporte: dict, tamano: int, motivo: str):
+    reporte["eliminados"] += 1
+    detalle = reporte["por_motivo"].setdefault(motivo, {"archivos": 0, "bytes": 0})
+    detalle["archivos"] += 1
+    detalle["bytes"] += tamano
+
+
+def _mb(total_bytes: int) -> float:
+    return round(total_bytes / 1024 / 1024, 2)
+
+
+def _reporte_vacio(simulacion: bool) -> dict:
+    reporte = {
+        "simulacion": simulacion,
+        "escaneados": 0,
+        "eliminados": 0,
+        "archivados": 0,
+        "omitidos_copia_pendiente": 0,
+        "por_motivo": {},
+        "segundos": 0.0,
+    }
+    if simulacion:
+        reporte["archivos"] = []
+    return reporte
+
+
+retencion = Retencion()
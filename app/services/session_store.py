@@ -0,0 +1,287 @@
+import json
+import time
+import secrets
+import threading
+from collections import OrderedDict
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+from flask.sessions import SessionInterface, SessionMixin
+from app.utils.db import ConexionesSqlite
+
+
+class SesionServidor(CallbackDict, SessionMixin):
+    """Sesión cuyos datos viven en el servidor; la cookie solo lleva el id"""
+
+    def __init__(self, datos: dict = None, sid: str = None, nueva: bool = False):
+        def al_modificar(_):
+            self.modified = True
+
+        super().__init__(datos, al_modificar)
+        self.sid = sid
+        self.new = nueva
+        self.modified = False
+        self.expira = 0.0
+
+
+class AlmacenMemoria:
+    """
+    Sesiones en memoria del proceso, LRU con expiración
+
+    Lo más rápido, pero cada worker tiene las suyas: sirve con un solo
+    proceso o con sesiones fijas (sticky) en el balanceador.
+    """
+
+    def __init__(self, max_sesiones: int = 10000, intervalo_purga: float = 60.0):
+        self.max_sesiones = max_sesiones
+        self.intervalo_purga = intervalo_purga
+        self._sesiones = OrderedDict()  # sid -> (expira, datos)
+        self._lock = threading.Lock()
+        self._proxima_purga = 0.0
+
+    def obtener(self, sid: str) -> tuple:
+        """
+        Leer una sesión vigente
+
+        Args:
+            sid: Id de la sesión
+
+        Returns:
+            tuple: (datos, expira) o None si no existe o ya expiró
+        """
+        ahora = time.time()
+        with self._lock:
+            entrada = self._sesiones.get(sid)
+            if entrada is None:
+                return None
+            if entrada[0] <= ahora:
+                del self._sesiones[sid]
+                return None
+            self._sesiones.move_to_end(sid)
+            return dict(entrada[1]), entrada[0]
+
+    def guardar(self, sid: str, datos: dict, expira: float):
+        """Guardar (o renovar) una sesión hasta `expira`"""
+        with self._lock:
+            self._sesiones[sid] = (expira, dict(datos))
+            self._sesiones.move_to_end(sid)
+            while len(self._sesiones) > self.max_sesiones:
+                self._sesiones.popitem(last=False)
+
+        if time.monotonic() >= self._proxima_purga:
+            self._proxima_purga = time.monotonic() + self.intervalo_purga
+            self.purgar()
+
+    def eliminar(self, sid: str):
+        """Eliminar una sesión"""
+        with self._lock:
+            self._sesiones.pop(sid, None)
+
+    def purgar(self) -> int:
+        """
+        Eliminar las sesiones expiradas
+
+        Returns:
+            int: Sesiones eliminadas
+        """
+        ahora = time.time()
+        with self._lock:
+            expiradas = [sid for sid, (e, _) in self._sesiones.items() if e <= ahora]
+            for sid in expiradas:
+                del self._sesiones[sid]
+        return len(expiradas)
+
+    def __len__(self):
+        return len(self._sesiones)
+
+
+class AlmacenSqlite:
+    """
+    Sesiones en una base SQLite local (modo WAL)
+
+    Compartida por todos los workers de gunicorn del nodo (y entre nodos si
+    DATA_DIR es un volumen compartido con bloqueos confiables). Cada hilo
+    usa su propia conexión; las expiradas se purgan como máximo una vez por
+    `intervalo_purga` segundos.
+    """
+
+    def __init__(self, ruta: str, intervalo_purga: float = 60.0):
+        self.intervalo_purga = intervalo_purga
+        self._conexiones = ConexionesSqlite(ruta)
+        self._proxima_purga = 0.0
+
+        conexion = self._conexion()
+        conexion.execute(
+            "CREATE TABLE IF NOT EXISTS sesiones ("
+            " sid TEXT PRIMARY KEY, datos TEXT NOT NULL, expira REAL NOT NULL)"
+        )
+        conexion.execute(
+            "CREATE INDEX IF NOT EXISTS sesiones_expira ON sesiones (expira)"
+        )
+
+    def obtener(self, sid: str) -> tuple:
+        """
+        Leer una sesión vigente con una sola consulta
+
+        Args:
+            sid: Id de la sesión
+
+        Returns:
+            tuple: (datos, expira) o None si no existe o ya expiró
+        """
+        fila = (
+            self._conexion()
+            .execute(
+                "SELECT datos, expira FROM sesiones WHERE sid = ? AND expira > ?",
+                (sid, time.time()),
+            )
+            .fetchone()
+        )
+        if fila is None:
+            return None
+        return json.loads(fila[0]), fila[1]
+
+    def guardar(self, sid: str, datos: dict, expira: float):
+        """Guardar (o renovar) una sesión hasta `expira`"""
+        self._conexion().execute(
+            "INSERT OR REPLACE INTO sesiones (sid, datos, expira) VALUES (?, ?, ?)",
+            (sid, json.dumps(datos, ensure_ascii=False), expira),
+        )
+        self._purgar_periodicamente()
+
+    def eliminar(self, sid: str):
+        """Eliminar una sesión"""
+        self._conexion().execute("DELETE FROM sesiones WHERE sid = ?", (sid,))
+
+    def purgar(self) -> int:
+        """
+        Eliminar las sesiones expiradas
+
+        Returns:
+            int: Sesiones eliminadas
+        """
+        cursor = self._conexion().execute(
+            "DELETE FROM sesiones WHERE expira <= ?", (time.time(),)
+        )
+        return cursor.rowcount
+
+    def __len__(self):
+        return self._conexion().execute("SELECT COUNT(*) FROM sesiones").fetchone()[0]
+
+    def _purgar_periodicamente(self):
+        ahora = time.monotonic()
+        if ahora < self._proxima_purga:
+            return
+        self._proxima_purga = ahora + self.intervalo_purga
+        self.purgar()
+
+    def _conexion(self):
+        return self._conexiones.obtener()
+
+
+class SesionesServidor(SessionInterface):
+    """
+    Interfaz de sesiones de Flask respaldada por un almacén del servidor
+
+    La cookie contiene solo un id aleatorio firmado con SECRET_KEY, que se
+    envía únicamente cuando se crea o elimina la sesión. Los datos se
+    guardan solo si cambiaron; la expiración (SESSION_TIMEOUT minutos de
+    inactividad) se renueva cuando ha transcurrido más de la mitad.
+    """
+
+    def __init__(self, almacen, ttl: float):
+        self.almacen = almacen
+        self.ttl = ttl
+
+    @classmethod
+    def init_app(cls, app):
+        """
+        Instalar las sesiones del servidor (salvo SESSION_TYPE=cookie)
+
+        Args:
+            app: Aplicación Flask
+        """
+        almacen = crear_almacen(app.config)
+        if almacen is None:
+            return
+
+        ttl = app.config["PERMANENT_SESSION_LIFETIME"].total_seconds()
+        app.session_interface = cls(almacen, ttl)
+
+    def open_session(self, app, request) -> SesionServidor:
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        sid = self._verificar(app, cookie) if cookie else None
+
+        if sid:
+            entrada = self.almacen.obtener(sid)
+            if entrada is not None:
+                datos, expira = entrada
+                sesion = SesionServidor(datos, sid)
+                sesion.expira = expira
+                return sesion
+
+        return SesionServidor(sid=secrets.token_urlsafe(32), nueva=True)
+
+    def save_session(self, app, session: SesionServidor, response):
+        nombre = self.get_cookie_name(app)
+        dominio = self.get_cookie_domain(app)
+        ruta = self.get_cookie_path(app)
+
+        # Sesión vaciada (session.clear()): eliminar datos y cookie
+        if not session:
+            if session.modified:
+                if not session.new:
+                    self.almacen.eliminar(session.sid)
+                response.delete_cookie(nombre, domain=dominio, path=ruta)
+            return
+
+        ahora = time.time()
+        renovar = session.expira - ahora < self.ttl / 2
+        if session.modified or renovar:
+            self.almacen.guardar(session.sid, dict(session), ahora + self.ttl)
+
+        if session.new:
+            response.set_cookie(
+                nombre,
+                self._firmar(app, session.sid),
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=dominio,
+                path=ruta,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+            response.vary.add("Cookie")
+
+    @staticmethod
+    def _firmar(app, sid: str) -> str:
+        return Signer(app.secret_key, salt="sesion").sign(sid).decode("ascii")
+
+    @staticmethod
+    def _verificar(app, cookie: str) -> str:
+        try:
+            return Signer(app.secret_key, salt="sesion").unsign(cookie).decode("ascii")
+        except BadSignature:
+            return None
+
+
+def crear_almacen(config):
+    """
+    Construir el almacén de sesiones según SESSION_TYPE
+
+    Args:
+        config: Configuración de la aplicación
+
+    Returns:
+        AlmacenMemoria | AlmacenSqlite | None: None para la cookie firmada
+            de Flask (SESSION_TYPE=cookie)
+    """
+    tipo = config.get("SESSION_TYPE", "cookie")
+
+    if tipo == "memory":
+        return AlmacenMemoria(config.get("SESSION_MAX_ENTRIES", 10000))
+    if tipo == "sqlite":
+        return AlmacenSqlite(config["SESSION_DB"])
+    if tipo == "cookie":
+        return None
+
+    raise ValueError(f"SESSION_TYPE no soportado: {tipo}")
@@ -0,0 +1,369 @@
+import os
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app.services.copy_queue import CopyQueue, copias_pendientes
+from app.services.path_layout import recorrer
+from app.utils.bloqueo import bloqueo_archivo
+from app.utils.db import ConexionesSqlite
+
+LOCAL = "local"
+REMOTO = "remoto"
+
+# Archivos modificados hace menos de esto pueden estar escribiéndose
+MARGEN_RECIENTES = 5.0
+
+ESQUEMA = """
+    CREATE TABLE IF NOT EXISTS manifiesto (
+        lado TEXT NOT NULL,
+        ruta TEXT NOT NULL,
+        tamano INTEGER NOT NULL,
+        mtime REAL NOT NULL,
+        hash TEXT,
+        PRIMARY KEY (lado, ruta)
+    )
+"""
+
+
+class Manifiesto:
+    """
+    Tamaño, mtime y hash de contenido de cada archivo, por lado
+
+    Un hash solo se recalcula si cambió el tamaño o el mtime registrado,
+    así una sincronización sin cambios no lee ningún archivo.
+    """
+
+    def __init__(self, ruta: str):
+        self._conexiones = ConexionesSqlite(ruta)
+        self._conexiones.obtener().execute(ESQUEMA)
+
+    def cargar(self, lado: str) -> dict:
+        """
+        Leer el manifiesto de un lado
+
+        Returns:
+            dict: ruta -> (tamano, mtime, hash)
+        """
+        filas = (
+            self._conexiones.obtener()
+            .execute(
+                "SELECT ruta, tamano, mtime, hash FROM manifiesto WHERE lado = ?",
+                (lado,),
+            )
+            .fetchall()
+        )
+        return {ruta: (tamano, mtime, h) for ruta, tamano, mtime, h in filas}
+
+    def guardar(self, lado: str, entradas: dict, vigentes: set = None):
+        """
+        Registrar entradas y descartar las que ya no existen
+
+        Args:
+            lado: local | remoto
+            entradas: ruta -> (tamano, mtime, hash)
+            vigentes: Rutas que siguen existiendo (None = no descartar)
+        """
+        with self._conexiones.transaccion() as conexion:
+            conexion.executemany(
+                "INSERT OR REPLACE INTO manifiesto (lado, ruta, tamano, mtime, hash)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(lado, ruta, *valores) for ruta, valores in entradas.items()],
+            )
+            if vigentes is not None:
+                registradas = conexion.execute(
+                    "SELECT ruta FROM manifiesto WHERE lado = ?", (lado,)
+                ).fetchall()
+                conexion.executemany(
+                    "DELETE FROM manifiesto WHERE lado = ? AND ruta = ?",
+                    [(lado, r) for (r,) in registradas if r not in vigentes],
+                )
+
+
+class Sincronizacion:
+    """
+    Reconciliación de OUTPUT_DIR con la carpeta compartida
+
+    Compara los dos lados con un manifiesto (tamaño, mtime y hash de
+    contenido) y copia, en paralelo, solo los archivos que faltan o
+    cambiaron en la compartida; sirve para ponerse al día después de una
+    caída del servidor de archivos. Los archivos con copia pendiente en la
+    cola no se tocan, y los que solo existen en la compartida se dejan.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.habilitada = False
+        self.intervalo = 900.0
+        self.workers = 4
+        self.ultimo_reporte = None
+
+        self._manifiesto = None
+        self._ruta_manifiesto = None
+        self._lock = threading.Lock()
+        self._hilo_pid = None
+        self._bloqueo = None
+
+    def init_app(self, app, programar: bool = True):
+        """
+        Configurar la sincronización y, si está habilitada, programarla
+
+        Args:
+            app: Aplicación Flask
+            programar: Iniciar el hilo de ejecución periódica
+        """
+        self.app = app
+        self.habilitada = app.config.get("SYNC_ENABLED", False)
+        self.intervalo = app.config.get("SYNC_INTERVAL", self.intervalo)
+        self.workers = max(app.config.get("SYNC_WORKERS", self.workers), 1)
+        self._ruta_manifiesto = str(app.config["SYNC_DB"])
+        self._manifiesto = None
+        self._bloqueo = os.path.join(str(app.config["DATA_DIR"]), "sync.lock")
+
+        if self.habilitada and programar:
+            self.iniciar()
+
+    def iniciar(self):
+        """Iniciar el hilo periódico en este proceso (una vez por pid)"""
+        with self._lock:
+            if self._hilo_pid == os.getpid():
+                return
+            self._hilo_pid = os.getpid()
+
+        threading.Thread(target=self._bucle, name="sincronizacion", daemon=True).start()
+
+    def ejecutar(self, simulacion: bool = False, workers: int = None) -> dict:
+        """
+        Sincronizar la salida local con la compartida
+
+        Args:
+            simulacion: Solo reportar lo que se copiaría
+            workers: Copias simultáneas (por defecto, SYNC_WORKERS)
+
+        Returns:
+            dict: Resumen, o None si otro proceso está sincronizando
+        """
+        with bloqueo_archivo(self._bloqueo, esperar=False) as obtenido:
+            if not obtenido:
+                return None
+
+            if self._manifiesto is None:
+                self._manifiesto = Manifiesto(self._ruta_manifiesto)
+
+            config = self.app.config
+            reporte = sincronizar(
+                str(config["OUTPUT_DIR"]),
+                str(config["SHARED_NETWORK_PATH"]),
+                self._manifiesto,
+                workers or self.workers,
+                journal_copias=str(config["COPY_QUEUE_DIR"]),
+                simulacion=simulacion,
+            )
+
+        self.ultimo_reporte = reporte
+        if reporte["copiados"] or reporte["errores"]:
+            self.app.logger.info(
+                f"Sincronización con la compartida: {reporte['copiados']} "
+                f"copiados ({reporte['mb_copiados']} MB), {reporte['al_dia']} al "
+                f"día, {reporte['errores']} errores en {reporte['segundos']}s"
+            )
+        return reporte
+
+    def _bucle(self):
+        """Ejecutar periódicamente mientras viva el proceso"""
+        while True:
+            time.sleep(self.intervalo)
+            try:
+                # Con la compartida desmontada no hay nada que comparar
+                if not os.path.isdir(str(self.app.config["SHARED_NETWORK_PATH"])):
+                    continue
+                with self.app.app_context():
+                    self.ejecutar()
+            except Exception as e:
+                self.app.logger.error(f"Error en sincronización con la red: {e}")
+
+
+def sincronizar(
+    local: str,
+    remoto: str,
+    manifiesto: Manifiesto,
+    workers: int = 4,
+    journal_copias: str = None,
+    simulacion: bool = False,
+) -> dict:
+    """
+    Copiar a `remoto` los archivos de `local` que faltan o cambiaron
+
+    Requiere contexto de aplicación: las copias pasan por FileService.
+
+    Args:
+        local: OUTPUT_DIR
+        remoto: Carpeta compartida
+        manifiesto: Manifiesto de los dos lados
+        workers: Comparaciones y copias simultáneas
+        journal_copias: Journal de la cola de copias (se omiten las pendientes)
+        simulacion: Solo reportar
+
+    Returns:
+        dict: Resumen de la sincronización
+    """
+    from flask import current_app
+    from app.services.file_service import FileService
+
+    app = current_app._get_current_object()
+    inicio = time.perf_counter()
+    reporte = {
+        "simulacion": simulacion,
+        "locales": 0,
+        "remotos": 0,
+        "solo_remotos": 0,
+        "al_dia": 0,
+        "faltantes": 0,
+        "cambiados": 0,
+        "copiados": 0,
+        "mb_copiados": 0.0,
+        "omitidos_copia_pendiente": 0,
+        "omitidos_recientes": 0,
+        "errores": 0,
+        "archivos": [],
+    }
+
+    manifiesto_local = manifiesto.cargar(LOCAL)
+    manifiesto_remoto = manifiesto.cargar(REMOTO)
+    locales = _listar(local)
+    remotos = _listar(remoto)
+    reporte["locales"] = len(locales)
+    reporte["remotos"] = len(remotos)
+    reporte["solo_remotos"] = len(remotos.keys() - locales.keys())
+
+    pendientes = copias_pendientes(journal_copias) if journal_copias else set()
+    limite_recientes = time.time() - MARGEN_RECIENTES
+
+    tareas = []
+    for ruta, estado in locales.items():
+        if estado[1] > limite_recientes:
+            reporte["omitidos_recientes"] += 1
+        elif pendientes and CopyQueue.id_copia(os.path.basename(ruta)) in pendientes:
+            reporte["omitidos_copia_pendiente"] += 1
+        else:
+            tareas.append(ruta)
+
+    def procesar(ruta):
+        """Comparar un archivo y copiarlo si hace falta"""
+        origen = os.path.join(local, ruta)
+        destino = os.path.join(remoto, ruta)
+        entrada_local = _con_hash(origen, locales[ruta], manifiesto_local.get(ruta))
+
+        estado_remoto = remotos.get(ruta)
+        if estado_remoto is None:
+            motivo = "faltantes"
+        elif estado_remoto[0] != entrada_local[0]:
+            motivo = "cambiados"
+        else:
+            entrada_remota = _con_hash(
+                destino, estado_remoto, manifiesto_remoto.get(ruta)
+            )
+            if entrada_remota[2] == entrada_local[2]:
+                return ruta, None, entrada_local, entrada_remota
+            motivo = "cambiados"
+
+        if simulacion:
+            return ruta, motivo, entrada_local, None
+
+        nombre = os.path.basename(ruta)
+        if not FileService.copiar_a_red(origen, nombre, relativa=ruta):
+            return ruta, "errores", entrada_local, None
+
+        estado = os.stat(destino)
+        return (
+            ruta,
+            motivo,
+            entrada_local,
+            (
+                estado.st_size,
+                estado.st_mtime,
+                entrada_local[2],
+            ),
+        )
+
+    nuevos_locales, nuevos_remotos = {}, {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sync") as pool:
+        for ruta, motivo, entrada_local, entrada_remota in pool.map(
+            _en_hilo(app, procesar), tareas
+        ):
+            if entrada_local is not None:
+                nuevos_locales[ruta] = entrada_local
+            if entrada_remota is not None:
+                nuevos_remotos[ruta] = entrada_remota
+
+            if motivo is None:
+                reporte["al_dia"] += 1
+                continue
+
+            if motivo == "errores":
+                reporte["errores"] += 1
+            else:
+                reporte[motivo] += 1
+                if not simulacion:
+                    reporte["copiados"] += 1
+                    reporte["mb_copiados"] += entrada_local[0] / (1024 * 1024)
+            reporte["archivos"].append({"ruta": ruta, "motivo": motivo})
+
+    manifiesto.guardar(LOCAL, nuevos_locales, vigentes=set(locales))
+    manifiesto.guardar(
+        REMOTO, nuevos_remotos, vigentes=set(remotos) | set(nuevos_remotos)
+    )
+
+    reporte["mb_copiados"] = round(reporte["mb_copiados"], 2)
+    reporte["segundos"] = round(time.perf_counter() - inicio, 3)
+    return reporte
+
+
+def hash_archivo(ruta: str) -> str:
+    """Hash del contenido (BLAKE2b de 128 bits, leído en bloques de 1 MB)"""
+    resumen = hashlib.blake2b(digest_size=16)
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1024 * 1024), b""):
+            resumen.update(bloque)
+    return resumen.hexdigest()
+
+
+def _listar(raiz: str) -> dict:
+    """ruta relativa -> (tamano, mtime) de los archivos de un lado"""
+    if not os.path.isdir(raiz):
+        return {}
+
+    archivos = {}
+    for ruta, entry in recorrer(raiz):
+        try:
+            estado = entry.stat(follow_symlinks=False)
+        except FileNotFoundError:
+            continue
+        archivos[ruta] = (estado.st_size, estado.st_mtime)
+    return archivos
+
+
+def _con_hash(ruta: str, estado: tuple, registrado: tuple) -> tuple:
+    """(tamano, mtime, hash), reutilizando el hash si el archivo no cambió"""
+    if registrado and registrado[:2] == estado and registrado[2]:
+        return registrado
+    return (*estado, hash_archivo(ruta))
+
+
+def _en_hilo(app, procesar):
+    """
+    Procesar en un hilo del pool con contexto de aplicación; un archivo que
+    falla se reporta como error sin cortar la sincronización
+    """
+
+    def envoltura(ruta):
+        try:
+            with app.app_context():
+                return procesar(ruta)
+        except OSError:
+            return ruta, "errores", None, None
+
+    return envoltura
+
+
+sincronizacion = Sincronizacion()
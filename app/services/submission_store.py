@@ -0,0 +1,323 @@
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from app.utils.db import ConexionesSqlite
+
+# Estado de un envío según sus respuestas
+ESTADO_COMPLETO = "completo"  # sin respuestas PD
+ESTADO_PENDIENTE = "pendiente"  # al menos una respuesta PD
+
+# Filtros de búsqueda por igualdad -> columna
+FILTROS = ("activo_fijo", "tipo", "tecnico", "estado")
+
+ESQUEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS envios (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        creado TEXT NOT NULL,
+        tipo TEXT NOT NULL,
+        activo_fijo TEXT NOT NULL COLLATE NOCASE,
+        propietario TEXT,
+        cargo TEXT,
+        tecnico TEXT NOT NULL COLLATE NOCASE,
+        nombre_archivo TEXT,
+        estado TEXT NOT NULL,
+        total_ok INTEGER NOT NULL,
+        total_na INTEGER NOT NULL,
+        total_pd INTEGER NOT NULL,
+        respuestas TEXT NOT NULL
+    )
+    """,
+    # Cada filtro va junto a la fecha: el rango de fechas y el orden
+    # (creado DESC, id DESC) salen del mismo índice
+    "CREATE INDEX IF NOT EXISTS envios_activo ON envios (activo_fijo, creado)",
+    "CREATE INDEX IF NOT EXISTS envios_tipo ON envios (tipo, creado)",
+    "CREATE INDEX IF NOT EXISTS envios_tecnico ON envios (tecnico, creado)",
+    "CREATE INDEX IF NOT EXISTS envios_estado ON envios (estado, creado)",
+    "CREATE INDEX IF NOT EXISTS envios_creado ON envios (creado)",
+)
+
+COLUMNAS = (
+    "id",
+    "creado",
+    "tipo",
+    "activo_fijo",
+    "propietario",
+    "cargo",
+    "tecnico",
+    "nombre_archivo",
+    "estado",
+    "total_ok",
+    "total_na",
+    "total_pd",
+)
+COLUMNAS_RESUMEN = ", ".join(COLUMNAS)
+
+
+class SubmissionStore:
+    """
+    Registro indexado de los checklists enviados (SQLite)
+
+    Cada envío guarda los datos de sesión, el nombre del archivo generado,
+    el conteo de respuestas y las respuestas completas (JSON). Las
+    búsquedas paginan por cursor (id del último resultado) en lugar de
+    OFFSET, así el costo no crece con la profundidad de la página.
+    """
+
+    def __init__(self):
+        self.habilitado = False
+        self._conexiones = None
+
+    def init_app(self, app):
+        """
+        Abrir (o crear) la base de envíos
+
+        Args:
+            app: Aplicación Flask
+        """
+        self.habilitado = app.config.get("SUBMISSIONS_ENABLED", True)
+        if not self.habilitado:
+            return
+
+        self._conexiones = ConexionesSqlite(app.config["SUBMISSIONS_DB"])
+        with self._conexiones.transaccion() as conexion:
+            for sentencia in ESQUEMA:
+                conexion.execute(sentencia)
+
+        self._actualizar_estadisticas()
+
+    def registrar(
+        self,
+        tipo: str,
+        session_data: dict,
+        respuestas: dict,
+        nombre_archivo: str = None,
+        creado: datetime = None,
+    ) -> int:
+        """
+        Guardar un envío
+
+        Args:
+            tipo: Tipo de checklist
+            session_data: Datos de sesión del usuario
+            respuestas: Respuestas {pregunta_id: valor}
+            nombre_archivo: Nombre del Excel generado
+            creado: Fecha del envío (por defecto, ahora)
+
+        Returns:
+            int: Id del envío, o None si el registro está deshabilitado
+        """
+        if not self.habilitado:
+            return None
+
+        valores = [str(v) for v in respuestas.values()]
+        total_pd = valores.count("PD")
+        creado = creado or datetime.now()
+
+        cursor = self._conexion().execute(
+            "INSERT INTO envios (creado, tipo, activo_fijo, propietario, cargo,"
+            " tecnico, nombre_archivo, estado, total_ok, total_na, total_pd,"
+            " respuestas) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                creado.isoformat(sep=" ", timespec="seconds"),
+                tipo,
+                session_data.get("activo_fijo") or "",
+                session_data.get("propietario"),
+                session_data.get("cargo"),
+                session_data.get("tecnico") or "",
+                nombre_archivo,
+                ESTADO_PENDIENTE if total_pd else ESTADO_COMPLETO,
+                valores.count("OK"),
+                valores.count("N/A"),
+                total_pd,
+                json.dumps(
+                    {str(k): v for k, v in respuestas.items()}, ensure_ascii=False
+                ),
+            ),
+        )
+        return cursor.lastrowid
+
+    def buscar(
+        self,
+        activo_fijo: str = None,
+        tipo: str = None,
+        tecnico: str = None,
+        estado: str = None,
+        desde: str = None,
+        hasta: str = None,
+        cursor: int = None,
+        limite: int = 50,
+    ) -> dict:
+        """
+        Buscar envíos, del más reciente al más antiguo
+
+        Args:
+            activo_fijo: Activo fijo exacto (sin distinguir mayúsculas)
+            tipo: Tipo de checklist
+            tecnico: Técnico exacto (sin distinguir mayúsculas)
+            estado: completo | pendiente
+            desde: Fecha inicial AAAA-MM-DD (inclusive)
+            hasta: Fecha final AAAA-MM-DD (inclusive)
+            cursor: Id del último envío de la página anterior
+            limite: Envíos por página
+
+        Returns:
+            dict: {"envios": [...], "siguiente": cursor o None}
+
+        Raises:
+            ValueError: Si una fecha no tiene formato AAAA-MM-DD
+        """
+        condiciones, parametros = [], []
+
+        filtros = dict(zip(FILTROS, (activo_fijo, tipo, tecnico, estado)))
+        for columna, valor in filtros.items():
+            if valor:
+                condiciones.append(f"{columna} = ?")
+                parametros.append(valor)
+
+        if desde:
+            condiciones.append("creado >= ?")
+            parametros.append(_fecha(desde).isoformat(sep=" "))
+        if hasta:
+            condiciones.append("creado < ?")
+            parametros.append((_fecha(hasta) + timedelta(days=1)).isoformat(sep=" "))
+        if cursor:
+            condiciones.append(
+                "(creado, id) < (SELECT creado, id FROM envios WHERE id = ?)"
+            )
+            parametros.append(int(cursor))
+
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        filas = (
+            self._conexion()
+            .execute(
+                f"SELECT {COLUMNAS_RESUMEN} FROM envios {where}"
+                " ORDER BY creado DESC, id DESC LIMIT ?",
+                (*parametros, limite + 1),
+            )
+            .fetchall()
+        )
+
+        envios = [self._resumen(fila) for fila in filas[:limite]]
+        siguiente = envios[-1]["id"] if len(filas) > limite else None
+
+        return {"envios": envios, "siguiente": siguiente}
+
+    def obtener(self, envio_id: int) -> dict:
+        """
+        Leer un envío con sus respuestas
+
+        Args:
+            envio_id: Id del envío
+
+        Returns:
+            dict: Envío, o None si no existe
+        """
+        fila = (
+            self._conexion()
+            .execute(
+                f"SELECT {COLUMNAS_RESUMEN}, respuestas FROM envios WHERE id = ?",
+                (envio_id,),
+            )
+            .fetchone()
+        )
+        if fila is None:
+            return None
+
+        envio = self._resumen(fila[:-1])
+        envio["respuestas"] = json.loads(fila[-1])
+        return envio
+
+    def iterar(
+        self,
+        tipo: str,
+        desde: str = None,
+        hasta: str = None,
+        ultimo_por_activo: bool = False,
+        lote: int = 500,
+    ):
+        """
+        Recorrer los envíos de un tipo con sus respuestas, en flujo
+
+        Las filas se leen de a `lote` del cursor de SQLite, así un rango de
+        cualquier tamaño no se carga completo en memoria.
+
+        Args:
+            tipo: Tipo de checklist
+            desde: Fecha inicial AAAA-MM-DD (inclusive)
+            hasta: Fecha final AAAA-MM-DD (inclusive)
+            ultimo_por_activo: Solo el envío más reciente de cada activo
+            lote: Filas por lectura
+
+        Yields:
+            dict: Envío con sus respuestas, por activo y fecha
+
+        Raises:
+            ValueError: Si una fecha no tiene formato AAAA-MM-DD
+        """
+        condiciones, parametros = ["tipo = ?"], [tipo]
+        if desde:
+            condiciones.append("creado >= ?")
+            parametros.append(_fecha(desde).isoformat(sep=" "))
+        if hasta:
+            condiciones.append("creado < ?")
+            parametros.append((_fecha(hasta) + timedelta(days=1)).isoformat(sep=" "))
+
+        consulta = (
+            f"SELECT {COLUMNAS_RESUMEN}, respuestas FROM envios"
+            f" WHERE {' AND '.join(condiciones)}"
+        )
+        if ultimo_por_activo:
+            consulta = (
+                f"SELECT {COLUMNAS_RESUMEN}, respuestas FROM ("
+                f"SELECT *, ROW_NUMBER() OVER (PARTITION BY activo_fijo"
+                f" ORDER BY creado DESC, id DESC) AS orden FROM ({consulta})"
+                ") WHERE orden = 1"
+            )
+
+        cursor = self._conexion().execute(
+            f"{consulta} ORDER BY activo_fijo, creado, id", parametros
+        )
+        while True:
+            filas = cursor.fetchmany(lote)
+            if not filas:
+                return
+            for fila in filas:
+                envio = self._resumen(fila[:-1])
+                envio["respuestas"] = json.loads(fila[-1])
+                yield envio
+
+    def _actualizar_estadisticas(self):
+        """
+        Ejecutar ANALYZE si la tabla duplicó su tamaño desde el último
+
+        Sin estadísticas, con varios filtros SQLite puede elegir el índice
+        menos selectivo (p. ej. estado) y recorrer media tabla.
+        """
+        conexion = self._conexion()
+        filas = conexion.execute("SELECT MAX(id) FROM envios").fetchone()[0] or 0
+        try:
+            stat = conexion.execute(
+                "SELECT stat FROM sqlite_stat1 WHERE idx = 'envios_creado'"
+            ).fetchone()
+        except sqlite3.OperationalError:  # sqlite_stat1 aún no existe
+            stat = None
+
+        analizadas = int(stat[0].split()[0]) if stat else 0
+        if filas >= 1000 and filas > 2 * analizadas:
+            conexion.execute("ANALYZE")
+
+    def _conexion(self):
+        return self._conexiones.obtener()
+
+    @staticmethod
+    def _resumen(fila: tuple) -> dict:
+        return dict(zip(COLUMNAS, fila))
+
+
+def _fecha(valor: str) -> datetime:
+    """Convertir AAAA-MM-DD en datetime (inicio del día)"""
+    return datetime.strptime(valor, "%Y-%m-%d")
+
+
+submission_store = SubmissionStore()
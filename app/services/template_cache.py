@@ -0,0 +1,102 @@
+import os
+import copy
+import threading
+from collections import OrderedDict
+from openpyxl import load_workbook
+from openpyxl.utils.indexed_list import IndexedList
+
+
+class TemplateCache:
+    """Caché en memoria (por worker) de plantillas Excel ya parseadas"""
+
+    _lock = threading.Lock()
+    _entradas = OrderedDict()  # plantilla -> (mtime, workbook)
+    max_entradas = 10
+
+    @classmethod
+    def init_app(cls, app):
+        """
+        Configurar el caché (la precarga es parte del precalentamiento)
+
+        Args:
+            app: Aplicación Flask
+        """
+        cls.max_entradas = app.config.get("TEMPLATE_CACHE_SIZE", cls.max_entradas)
+
+    @classmethod
+    def obtener(cls, plantilla_path: str):
+        """
+        Obtener una copia independiente de la plantilla parseada
+
+        Args:
+            plantilla_path: Ruta de la plantilla .xlsx
+
+        Returns:
+            Workbook: Copia lista para modificar sin afectar el caché
+        """
+        return _copiar_workbook(cls._cargar(plantilla_path))
+
+    @classmethod
+    def precargar(cls, templates_dir, checklists: dict, logger=None):
+        """
+        Parsear de antemano las plantillas de todos los checklists
+
+        Args:
+            templates_dir: Directorio de plantillas
+            checklists: Diccionario de checklists {tipo: config}
+            logger: Logger para reportar plantillas faltantes (opcional)
+        """
+        for tipo, config in checklists.items():
+            plantilla_path = os.path.join(templates_dir, config["plantilla"])
+            try:
+                cls._cargar(plantilla_path)
+            except Exception as e:
+                if logger:
+                    logger.warning(f"No se pudo precargar plantilla '{tipo}': {e}")
+
+    @classmethod
+    def limpiar(cls):
+        """Vaciar el caché"""
+        with cls._lock:
+            cls._entradas.clear()
+
+    @classmethod
+    def _cargar(cls, plantilla_path: str):
+        """Obtener el workbook original del caché, parseándolo si cambió"""
+        plantilla_path = str(plantilla_path)
+        mtime = os.path.getmtime(plantilla_path)
+
+        with cls._lock:
+            entrada = cls._entradas.get(plantilla_path)
+            if entrada and entrada[0] == mtime:
+                cls._entradas.move_to_end(plantilla_path)
+                return entrada[1]
+
+        # Parsear fuera del lock para no bloquear otras plantillas
+        wb = load_workbook(plantilla_path)
+
+        with cls._lock:
+            cls._entradas[plantilla_path] = (mtime, wb)
+            cls._entradas.move_to_end(plantilla_path)
+            while len(cls._entradas) > max(cls.max_entradas, 1):
+                cls._entradas.popitem(last=False)
+
+        return wb
+
+
+def _copiar_workbook(wb):
+    """
+    Copia profunda de un workbook de openpyxl
+
+    copy.deepcopy deja vacías las IndexedList (fuentes, bordes, estilos de
+    celda...) porque restaura su índice interno antes de agregar los
+    elementos, así que se reconstruyen con los mismos objetos copiados.
+    """
+    memo = {}
+    copia = copy.deepcopy(wb, memo)
+
+    for nombre, valor in vars(wb).items():
+        if isinstance(valor, IndexedList):
+            setattr(copia, nombre, IndexedList(copy.deepcopy(list(valor), memo)))
+
+    return copia
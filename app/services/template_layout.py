@@ -0,0 +1,174 @@
+import os
+import threading
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+# Columna donde se escriben las respuestas (C)
+COLUMNA_RESPUESTA = 3
+
+
+@dataclass(frozen=True)
+class TemplateLayout:
+    """Estructura compilada de una plantilla: pregunta -> fila"""
+
+    filas: MappingProxyType
+    fila_validacion: int
+    columna_respuesta: int = COLUMNA_RESPUESTA
+    mtime: float = field(default=0.0, compare=False)
+
+    @classmethod
+    def desde_hoja(cls, ws, mtime: float = 0.0) -> "TemplateLayout":
+        """
+        Compilar el layout recorriendo la columna A de la hoja una sola vez
+
+        Args:
+            ws: Hoja de trabajo de openpyxl
+            mtime: Fecha de modificación de la plantilla de origen
+
+        Returns:
+            TemplateLayout: Layout compilado
+        """
+        filas = {}
+        fila_validacion = None
+
+        for row, (celda_id,) in enumerate(
+            ws.iter_rows(min_col=1, max_col=1, values_only=True), 1
+        ):
+            if celda_id and str(celda_id).isdigit():
+                filas.setdefault(int(celda_id), row)
+
+            fila_validacion = row
+
+        return cls(
+            filas=MappingProxyType(filas),
+            fila_validacion=fila_validacion,
+            mtime=mtime,
+        )
+
+    @classmethod
+    def desde_xlsx(cls, plantilla_path: str, mtime: float = 0.0) -> "TemplateLayout":
+        """
+        Compilar el layout leyendo la columna A directamente del XML de la hoja
+
+        Args:
+            plantilla_path: Ruta de la plantilla .xlsx
+            mtime: Fecha de modificación de la plantilla de origen
+
+        Returns:
+            TemplateLayout: Layout compilado (equivalente a desde_hoja)
+        """
+        from app.services.xml_engine import XmlExcelEngine
+
+        valores, max_fila = XmlExcelEngine.leer_columna(plantilla_path, 1)
+
+        filas = {}
+        for row in sorted(valores):
+            celda_id = valores[row]
+            if celda_id and str(celda_id).isdigit():
+                filas.setdefault(int(celda_id), row)
+
+        return cls(
+            filas=MappingProxyType(filas),
+            fila_validacion=max_fila,
+            mtime=mtime,
+        )
+
+    def validar(self, num_preguntas: int) -> list:
+        """
+        Comparar las filas numeradas con la cantidad de preguntas del checklist
+
+        Args:
+            num_preguntas: Cantidad de preguntas definidas en CHECKLISTS
+
+        Returns:
+            list: Advertencias encontradas (vacía si el layout coincide)
+        """
+        advertencias = []
+
+        if len(self.filas) != num_preguntas:
+            advertencias.append(
+                f"La plantilla tiene {len(self.filas)} filas numeradas "
+                f"y el checklist {num_preguntas} preguntas"
+            )
+
+        faltantes = [i for i in range(1, num_preguntas + 1) if i not in self.filas]
+        if faltantes:
+            advertencias.append(f"Preguntas sin fila en la plantilla: {faltantes}")
+
+        return advertencias
+
+
+class LayoutCache:
+    """Caché de layouts compilados, validado contra el mtime de la plantilla"""
+
+    _lock = threading.Lock()
+    _layouts = {}  # plantilla -> TemplateLayout
+
+    @classmethod
+    def obtener(cls, plantilla_path: str, ws=None) -> TemplateLayout:
+        """
+        Obtener el layout de una plantilla, compilándolo si cambió
+
+        Args:
+            plantilla_path: Ruta de la plantilla .xlsx
+            ws: Hoja activa de la plantilla ya cargada (opcional). Sin ella
+                el layout se compila leyendo el XML de la plantilla.
+
+        Returns:
+            TemplateLayout: Layout compilado
+        """
+        plantilla_path = str(plantilla_path)
+        mtime = os.path.getmtime(plantilla_path)
+
+        layout = cls._layouts.get(plantilla_path)
+        if layout and layout.mtime == mtime:
+            return layout
+
+        if ws is not None:
+            layout = TemplateLayout.desde_hoja(ws, mtime)
+        else:
+            layout = TemplateLayout.desde_xlsx(plantilla_path, mtime)
+
+        with cls._lock:
+            cls._layouts[plantilla_path] = layout
+
+        return layout
+
+    @classmethod
+    def precargar(cls, templates_dir, checklists: dict, logger=None) -> dict:
+        """
+        Compilar y validar los layouts de todos los checklists
+
+        Args:
+            templates_dir: Directorio de plantillas
+            checklists: Diccionario de checklists {tipo: config}
+            logger: Logger para reportar inconsistencias (opcional)
+
+        Returns:
+            dict: Advertencias por tipo de checklist {tipo: [advertencias]}
+        """
+        reporte = {}
+
+        for tipo, config in checklists.items():
+            plantilla_path = os.path.join(templates_dir, config["plantilla"])
+            try:
+                layout = cls.obtener(plantilla_path)
+            except Exception as e:
+                if logger:
+                    logger.warning(f"No se pudo compilar layout '{tipo}': {e}")
+                continue
+
+            advertencias = layout.validar(len(config.get("preguntas", [])))
+            if advertencias:
+                reporte[tipo] = advertencias
+                if logger:
+                    for advertencia in advertencias:
+                        logger.warning(f"Plantilla '{tipo}': {advertencia}")
+
+        return reporte
+
+    @classmethod
+    def limpiar(cls):
+        """Vaciar el caché"""
+        with cls._lock:
+            cls._layouts.clear()
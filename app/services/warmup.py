@@ -0,0 +1,100 @@
+import time
+import importlib
+
+# Módulos que la primera petición importaría de forma perezosa
+MODULOS = (
+    "openpyxl",
+    "openpyxl.styles",
+    "openpyxl.reader.excel",
+    "openpyxl.writer.excel",
+    "openpyxl.worksheet._reader",
+    "openpyxl.worksheet._writer",
+    "app.services.excel_service",
+    "app.services.xml_engine",
+    "app.services.bulk_service",
+    "app.services.worker_pool",
+)
+
+
+def precalentar(app) -> dict:
+    """
+    Hacer al iniciar el trabajo que, si no, paga la primera petición
+
+    Importa los módulos pesados, compila todas las plantillas Jinja y
+    parsea los workbooks y layouts de templates_excel. Con gunicorn y
+    preload_app esto ocurre una vez en el proceso principal y los workers
+    lo heredan al hacer fork, compartiendo esa memoria (copy-on-write).
+
+    Args:
+        app: Aplicación Flask
+
+    Returns:
+        dict: Segundos de cada fase {importar, jinja, plantillas} y la
+            cantidad de plantillas Jinja compiladas (plantillas_jinja)
+    """
+    fases = {}
+
+    inicio = time.perf_counter()
+    for modulo in MODULOS:
+        try:
+            importlib.import_module(modulo)
+        except ImportError as e:
+            app.logger.warning(f"Precalentamiento: no se pudo importar {modulo}: {e}")
+    fases["importar"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    fases["plantillas_jinja"] = compilar_jinja(app)
+    fases["jinja"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    if app.config.get("TEMPLATE_CACHE_WARMUP", True):
+        precargar_excel(app)
+    fases["plantillas"] = time.perf_counter() - inicio
+
+    app.logger.info(
+        "Precalentamiento: "
+        f"importar {fases['importar'] * 1000:.0f} ms, "
+        f"jinja {fases['jinja'] * 1000:.0f} ms "
+        f"({fases['plantillas_jinja']} plantillas), "
+        f"excel {fases['plantillas'] * 1000:.0f} ms"
+    )
+    return fases
+
+
+def compilar_jinja(app) -> int:
+    """
+    Compilar todas las plantillas Jinja en el caché del entorno
+
+    Args:
+        app: Aplicación Flask
+
+    Returns:
+        int: Plantillas compiladas
+    """
+    entorno = app.jinja_env
+    compiladas = 0
+
+    for nombre in entorno.list_templates(filter_func=_es_plantilla):
+        try:
+            entorno.get_template(nombre)
+            compiladas += 1
+        except Exception as e:
+            app.logger.warning(f"No se pudo compilar la plantilla '{nombre}': {e}")
+
+    return compiladas
+
+
+def precargar_excel(app):
+    """Parsear los workbooks y compilar los layouts de todos los checklists"""
+    from app.models.checklist_data import get_all_checklists
+    from app.services.template_cache import TemplateCache
+    from app.services.template_layout import LayoutCache
+
+    checklists = get_all_checklists()
+    TemplateCache.precargar(app.config["TEMPLATES_DIR"], checklists, app.logger)
+    LayoutCache.precargar(app.config["TEMPLATES_DIR"], checklists, app.logger)
+
+
+def _es_plantilla(nombre: str) -> bool:
+    """Solo HTML (no archivos sueltos que haya en templates/)"""
+    return nombre.endswith((".html", ".htm", ".j2", ".xml"))
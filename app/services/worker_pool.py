@@ -0,0 +1,149 @@
+import os
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Configuración que los procesos hijos heredan de la aplicación que los crea
+CONFIG_HEREDADA = (
+    "OUTPUT_DIR",
+    "OUTPUT_LAYOUT",
+    "TEMPLATES_DIR",
+    "CHECKLISTS_DIR",
+    "EXCEL_ENGINE",
+    "DEFAULT_VALIDATOR",
+    "METRICS_DIR",
+    "DATA_DIR",
+    "SESSION_DB",
+    "SUBMISSIONS_DB",
+    "JINJA_CACHE_DIR",
+    "SHARED_NETWORK_PATH",
+)
+
+_app = None
+_lock = threading.Lock()
+_pools = {}  # nombre -> (clave, ProcessPoolExecutor)
+
+
+def inicializar_worker(config_overrides: dict):
+    """
+    Crear la aplicación dentro de un proceso del pool
+
+    Cada proceso tiene su propia aplicación (sin hilos en segundo plano) con
+    el contexto activo, así ExcelService funciona fuera de una petición.
+    """
+    global _app
+    from app import create_app
+
+    _app = create_app(config_overrides, background_services=False)
+    _app.app_context().push()
+
+
+def generar_checklist(
+    tipo: str, respuestas: dict, session_data: dict, en_memoria: bool = False
+) -> tuple:
+    """Generar un checklist dentro de un proceso del pool"""
+    from app.services.excel_service import ExcelService
+
+    if en_memoria:
+        return ExcelService.generar_excel_en_memoria(tipo, respuestas, session_data)
+
+    return ExcelService.generar_excel(tipo, respuestas, session_data)
+
+
+def generar_y_copiar(
+    tipo: str, respuestas: dict, session_data: dict, copiar_red: bool = False
+) -> tuple:
+    """
+    Generar un checklist en OUTPUT_DIR y, si se pide, copiarlo a la compartida
+
+    La copia corre en el mismo proceso del pool, así las copias de un lote
+    avanzan en paralelo igual que la generación.
+
+    Returns:
+        tuple: (ruta_archivo, nombre_archivo, copiado: bool o None sin copia)
+    """
+    from app.services.excel_service import ExcelService
+    from app.services.file_service import FileService
+
+    ruta, nombre_archivo = ExcelService.generar_excel(tipo, respuestas, session_data)
+    copiado = FileService.copiar_a_red(ruta, nombre_archivo) if copiar_red else None
+
+    return ruta, nombre_archivo, copiado
+
+
+def leer_checklists(rutas: list) -> list:
+    """
+    Leer checklists generados dentro de un proceso del pool
+
+    Returns:
+        list: (ruta, registro o None, error o None) por cada ruta
+    """
+    from app.services.lector_checklist import leer_checklist
+
+    resultados = []
+    for ruta in rutas:
+        try:
+            resultados.append((ruta, leer_checklist(ruta), None))
+        except Exception as e:
+            resultados.append((ruta, None, f"{type(e).__name__}: {e}"))
+
+    return resultados
+
+
+def generar_checklist_medido(
+    enviado: float, tipo, respuestas, session_data, en_memoria: bool = False
+) -> tuple:
+    """Generar un checklist reportando cuánto esperó en la cola del pool"""
+    espera = time.time() - enviado
+    return generar_checklist(tipo, respuestas, session_data, en_memoria), espera
+
+
+def config_heredada(config) -> dict:
+    """Extraer la configuración que deben compartir los procesos hijos"""
+    # None (p. ej. un caché desactivado) viaja como "" para seguir desactivado
+    return {
+        clave: "" if config[clave] is None else str(config[clave])
+        for clave in CONFIG_HEREDADA
+        if clave in config
+    }
+
+
+def obtener_pool(
+    config, max_workers: int = None, nombre: str = "lote"
+) -> ProcessPoolExecutor:
+    """
+    Obtener (o crear) un pool de procesos de este worker
+
+    El pool se reutiliza entre peticiones y se recrea si cambia la
+    configuración heredada, el tamaño solicitado o el proceso dueño.
+
+    Args:
+        config: Configuración de la aplicación que crea el pool
+        max_workers: Cantidad de procesos (por defecto, núcleos disponibles)
+        nombre: Pool a usar (cada uso tiene el suyo: lote, generacion)
+
+    Returns:
+        ProcessPoolExecutor: Pool listo para recibir tareas
+    """
+    overrides = config_heredada(config)
+    max_workers = max_workers or os.cpu_count() or 1
+    clave = (os.getpid(), max_workers, tuple(sorted(overrides.items())))
+
+    with _lock:
+        actual = _pools.get(nombre)
+        if actual is not None and actual[0] == clave:
+            return actual[1]
+
+        if actual is not None and actual[0][0] == os.getpid():
+            actual[1].shutdown(wait=False, cancel_futures=True)
+
+        pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=inicializar_worker,
+            initargs=(overrides,),
+        )
+        _pools[nombre] = (clave, pool)
+
+        return pool
@@ -0,0 +1,325 @@
+import os
+import re
+import shutil
+import zipfile
+import posixpath
+import threading
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+
+NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+_RE_SHEET_DATA = re.compile(r"<sheetData\b[^>]*?(?:/>|>(.*?)</sheetData>)", re.S)
+_RE_ROW = re.compile(r"<row\b([^>]*?)(?:/>|>(.*?)</row>)", re.S)
+_RE_CELL = re.compile(r"<c\b([^>]*?)(?:/>|>(.*?)</c>)", re.S)
+_RE_ATTR_R = re.compile(r'\br="([A-Z]*)(\d+)"')
+_RE_REF = re.compile(r"([A-Z]+)(\d+)$")
+_RE_ATTR_S = re.compile(r'\bs="(\d+)"')
+_RE_CONTROL = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def columna_a_letra(columna: int) -> str:
+    """Convertir índice de columna (1 = A) a letras"""
+    letras = ""
+    while columna:
+        columna, resto = divmod(columna - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+
+def letra_a_columna(letras: str) -> int:
+    """Convertir letras de columna a índice (A = 1)"""
+    columna = 0
+    for letra in letras:
+        columna = columna * 26 + ord(letra) - 64
+    return columna
+
+
+class XmlExcelEngine:
+    """Motor que rellena plantillas parcheando directamente el XML de la hoja"""
+
+    _lock = threading.Lock()
+    _hojas = {}  # plantilla -> (mtime, ruta de la hoja activa dentro del zip)
+
+    @classmethod
+    def escribir(cls, plantilla_path: str, celdas: dict, destino):
+        """
+        Copiar la plantilla al destino reescribiendo solo las celdas indicadas
+
+        Args:
+            plantilla_path: Ruta de la plantilla .xlsx
+            celdas: Valores a escribir {(fila, columna): valor}
+            destino: Ruta o buffer binario del archivo de salida
+        """
+        hoja = cls.hoja_activa(plantilla_path)
+
+        with zipfile.ZipFile(plantilla_path) as zin, zipfile.ZipFile(
+            destino, "w", zipfile.ZIP_DEFLATED
+        ) as zout:
+            for info in zin.infolist():
+                if info.filename == hoja:
+                    xml = zin.read(info).decode("utf-8")
+                    zout.writestr(info, parchear_hoja(xml, celdas).encode("utf-8"))
+                    continue
+
+                with zin.open(info) as origen, zout.open(info, "w") as salida:
+                    shutil.copyfileobj(origen, salida, 1024 * 64)
+
+    @classmethod
+    def leer_columna(cls, plantilla_path: str, columna: int = 1):
+        """
+        Leer los valores de una columna de la hoja activa
+
+        Args:
+            plantilla_path: Ruta de la plantilla .xlsx
+            columna: Índice de la columna a leer (1 = A)
+
+        Returns:
+            tuple: ({fila: valor}, última fila con celdas)
+        """
+        valores, max_fila = cls.leer_columnas(plantilla_path, (columna,))
+        return valores[columna], max_fila
+
+    @classmethod
+    def leer_columnas(cls, ruta: str, columnas, recordar_hoja: bool = True):
+        """
+        Leer los valores de varias columnas de la hoja activa en una pasada
+
+        Args:
+            ruta: Ruta del .xlsx
+            columnas: Índices de las columnas a leer (1 = A)
+            recordar_hoja: Guardar la hoja activa en el caché de plantillas
+                (no conviene para archivos que se leen una sola vez)
+
+        Returns:
+            tuple: ({columna: {fila: valor}}, última fila con celdas)
+        """
+        valores = {columna: {} for columna in columnas}
+        max_fila = 0
+
+        with zipfile.ZipFile(ruta) as zin:
+            hoja = (
+                cls.hoja_activa(ruta) if recordar_hoja else _resolver_hoja_activa(zin)
+            )
+            shared = _leer_shared_strings(zin)
+
+            with zin.open(hoja) as stream:
+                for _, elem in ET.iterparse(stream):
+                    if elem.tag == f"{{{NS_MAIN}}}c":
+                        ref = _RE_REF.match(elem.get("r", ""))
+                        if ref is None:
+                            raise ValueError("Celda sin referencia explícita")
+                        fila = int(ref.group(2))
+                        max_fila = max(max_fila, fila)
+                        columna = valores.get(letra_a_columna(ref.group(1)))
+                        if columna is not None:
+                            columna[fila] = _valor_celda(elem, shared)
+                    elif elem.tag == f"{{{NS_MAIN}}}row":
+                        elem.clear()
+
+        return valores, max_fila or 1
+
+    @classmethod
+    def hoja_activa(cls, plantilla_path: str) -> str:
+        """Obtener la ruta (dentro del zip) de la hoja activa de la plantilla"""
+        plantilla_path = str(plantilla_path)
+        mtime = os.path.getmtime(plantilla_path)
+
+        entrada = cls._hojas.get(plantilla_path)
+        if entrada and entrada[0] == mtime:
+            return entrada[1]
+
+        with zipfile.ZipFile(plantilla_path) as zin:
+            hoja = _resolver_hoja_activa(zin)
+
+        with cls._lock:
+            cls._hojas[plantilla_path] = (mtime, hoja)
+
+        return hoja
+
+
+def parchear_hoja(xml: str, celdas: dict) -> str:
+    """
+    Reescribir las celdas indicadas dentro del XML de una hoja
+
+    Args:
+        xml: Contenido de xl/worksheets/sheetN.xml
+        celdas: Valores a escribir {(fila, columna): valor}
+
+    Returns:
+        str: XML con las celdas reemplazadas o insertadas
+    """
+    por_fila = {}
+    for (fila, columna), valor in celdas.items():
+        por_fila.setdefault(fila, {})[columna] = valor
+
+    match = _RE_SHEET_DATA.search(xml)
+    if match is None:
+        raise ValueError("La hoja no contiene sheetData")
+
+    contenido = match.group(1) or ""
+    partes = []
+    pos = 0
+
+    for row_match in _RE_ROW.finditer(contenido):
+        ref = re.search(r'\br="(\d+)"', row_match.group(1))
+        if ref is None:
+            raise ValueError("Fila sin referencia explícita en la plantilla")
+        fila = int(ref.group(1))
+
+        # Insertar filas nuevas que van antes de la actual
+        for nueva in sorted(f for f in por_fila if f < fila):
+            partes.append(contenido[pos : row_match.start()])
+            partes.append(_fila_nueva(nueva, por_fila.pop(nueva)))
+            pos = row_match.start()
+
+        if fila in por_fila:
+            partes.append(contenido[pos : row_match.start()])
+            partes.append(
+                _parchear_fila(
+                    row_match.group(1),
+                    row_match.group(2) or "",
+                    fila,
+                    por_fila.pop(fila),
+                )
+            )
+            pos = row_match.end()
+
+    partes.append(contenido[pos:])
+    for nueva in sorted(por_fila):
+        partes.append(_fila_nueva(nueva, por_fila[nueva]))
+
+    sheet_data = f"<sheetData>{''.join(partes)}</sheetData>"
+    return xml[: match.start()] + sheet_data + xml[match.end() :]
+
+
+def _parchear_fila(atributos: str, contenido: str, fila: int, valores: dict) -> str:
+    """Reemplazar o insertar celdas dentro de una fila existente"""
+    partes = []
+    pos = 0
+
+    for cell_match in _RE_CELL.finditer(contenido):
+        ref = _RE_ATTR_R.search(cell_match.group(1))
+        if ref is None:
+            raise ValueError(f"Celda sin referencia explícita en la fila {fila}")
+        columna = letra_a_columna(ref.group(1))
+
+        for nueva in sorted(c for c in valores if c < columna):
+            partes.append(contenido[pos : cell_match.start()])
+            partes.append(_celda(fila, nueva, valores.pop(nueva)))
+            pos = cell_match.start()
+
+        if columna in valores:
+            estilo = _RE_ATTR_S.search(cell_match.group(1))
+            partes.append(contenido[pos : cell_match.start()])
+            partes.append(
+                _celda(
+                    fila,
+                    columna,
+                    valores.pop(columna),
+                    estilo.group(1) if estilo else None,
+                )
+            )
+            pos = cell_match.end()
+
+    partes.append(contenido[pos:])
+    for nueva in sorted(valores):
+        partes.append(_celda(fila, nueva, valores[nueva]))
+
+    return f"<row{atributos}>{''.join(partes)}</row>"
+
+
+def _fila_nueva(fila: int, valores: dict) -> str:
+    """Construir una fila que no existía en la plantilla"""
+    celdas = "".join(_celda(fila, c, valores[c]) for c in sorted(valores))
+    return f'<row r="{fila}">{celdas}</row>'
+
+
+def _celda(fila: int, columna: int, valor, estilo: str = None) -> str:
+    """Construir el XML de una celda con string inline o valor numérico"""
+    ref = f"{columna_a_letra(columna)}{fila}"
+    estilo_attr = f' s="{estilo}"' if estilo is not None else ""
+
+    if valor is None:
+        return f'<c r="{ref}"{estilo_attr}/>'
+
+    if isinstance(valor, bool):
+        return f'<c r="{ref}"{estilo_attr} t="b"><v>{int(valor)}</v></c>'
+
+    if isinstance(valor, (int, float)):
+        return f'<c r="{ref}"{estilo_attr}><v>{valor}</v></c>'
+
+    texto = escape(_RE_CONTROL.sub("", str(valor)))
+    return (
+        f'<c r="{ref}"{estilo_attr} t="inlineStr">'
+        f'<is><t xml:space="preserve">{texto}</t></is></c>'
+    )
+
+
+def _valor_celda(elem, shared: list):
+    """Interpretar el valor de un elemento <c> como lo haría openpyxl"""
+    tipo = elem.get("t", "n")
+
+    if tipo == "inlineStr":
+        return "".join(t.text or "" for t in elem.iter(f"{{{NS_MAIN}}}t"))
+
+    v = elem.find(f"{{{NS_MAIN}}}v")
+    if v is None or v.text is None:
+        return None
+
+    if tipo == "s":
+        return shared[int(v.text)]
+    if tipo in ("str", "e"):
+        return v.text
+    if tipo == "b":
+        return v.text == "1"
+
+    texto = v.text
+    if "." in texto or "E" in texto.upper():
+        return float(texto)
+    return int(texto)
+
+
+def _leer_shared_strings(zin) -> list:
+    """Leer la tabla de shared strings del libro (si existe)"""
+    try:
+        stream = zin.open("xl/sharedStrings.xml")
+    except KeyError:
+        return []
+
+    strings = []
+    with stream:
+        for _, elem in ET.iterparse(stream):
+            if elem.tag == f"{{{NS_MAIN}}}si":
+                # Texto plano (<t>) o rich text (<r><t>), sin guías fonéticas
+                partes = elem.findall(f"{{{NS_MAIN}}}t")
+                partes += elem.findall(f"{{{NS_MAIN}}}r/{{{NS_MAIN}}}t")
+                strings.append("".join(t.text or "" for t in partes))
+                elem.clear()
+
+    return strings
+
+
+def _resolver_hoja_activa(zin) -> str:
+    """Resolver la ruta de la hoja activa a partir de workbook.xml y sus rels"""
+    workbook = ET.fromstring(zin.read("xl/workbook.xml"))
+
+    vista = workbook.find(f"{{{NS_MAIN}}}bookViews/{{{NS_MAIN}}}workbookView")
+    activa = int(vista.get("activeTab", 0)) if vista is not None else 0
+
+    hojas = workbook.findall(f"{{{NS_MAIN}}}sheets/{{{NS_MAIN}}}sheet")
+    if not hojas:
+        raise ValueError("La plantilla no contiene hojas")
+    rel_id = hojas[min(activa, len(hojas) - 1)].get(f"{{{NS_REL}}}id")
+
+    rels = ET.fromstring(zin.read("xl/_rels/workbook.xml.rels"))
+    for rel in rels.iter(f"{{{NS_PKG_REL}}}Relationship"):
+        if rel.get("Id") == rel_id:
+            target = rel.get("Target")
+            if target.startswith("/"):
+                return target.lstrip("/")
+            return posixpath.normpath(posixpath.join("xl", target))
+
+    raise ValueError(f"No se encontró la relación de la hoja activa: {rel_id}")
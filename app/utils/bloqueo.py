@@ -0,0 +1,47 @@
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def bloqueo_archivo(ruta: str, esperar: bool = True):
+    """
+    Bloqueo exclusivo entre procesos sobre un archivo auxiliar
+
+    Args:
+        ruta: Archivo de bloqueo (se crea si no existe)
+        esperar: Esperar a que se libere; si es False y otro proceso lo
+            tiene, se entrega False sin bloquear
+
+    Yields:
+        bool: True si se obtuvo el bloqueo
+    """
+    fd = os.open(ruta, os.O_RDWR | os.O_CREAT, 0o644)
+    obtenido = False
+    try:
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | (0 if esperar else fcntl.LOCK_NB))
+            else:
+                msvcrt.locking(fd, msvcrt.LK_LOCK if esperar else msvcrt.LK_NBLCK, 1)
+            obtenido = True
+        except OSError:
+            if esperar:
+                raise
+
+        yield obtenido
+    finally:
+        try:
+            if obtenido:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                else:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
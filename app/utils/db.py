@@ -0,0 +1,57 @@
+import os
+import sqlite3
+import threading
+
+
+class ConexionesSqlite:
+    """
+    Una conexión SQLite por hilo (y por proceso) a la misma base
+
+    Las conexiones usan modo WAL, así los lectores no bloquean a la
+    escritura, y autocommit: cada sentencia es una transacción por sí misma
+    salvo que se use transaccion(). Tras un fork se abre una conexión nueva,
+    ya que la heredada no puede usarse en el hijo.
+    """
+
+    def __init__(self, ruta: str, timeout: float = 5.0):
+        self.ruta = str(ruta)
+        self.timeout = timeout
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(self.ruta) or ".", exist_ok=True)
+
+    def obtener(self) -> sqlite3.Connection:
+        """Conexión del hilo actual"""
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None or self._local.pid != os.getpid():
+            conexion = sqlite3.connect(
+                self.ruta, timeout=self.timeout, isolation_level=None
+            )
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexion = conexion
+            self._local.pid = os.getpid()
+        return conexion
+
+    def transaccion(self):
+        """
+        Ejecutar varias sentencias en una sola transacción
+
+        Uso:
+            with conexiones.transaccion() as conexion:
+                conexion.execute(...)
+        """
+        return _Transaccion(self.obtener())
+
+
+class _Transaccion:
+    def __init__(self, conexion: sqlite3.Connection):
+        self.conexion = conexion
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conexion.execute("BEGIN IMMEDIATE")
+        return self.conexion
+
+    def __exit__(self, tipo, valor, traza):
+        self.conexion.execute("COMMIT" if tipo is None else "ROLLBACK")
+        return False
@@ -1,28 +1,79 @@
 from functools import wraps
-from flask import session, redirect, url_for, flash
+from flask import session, redirect, url_for, flash, request, make_response
+
+# Datos del formulario inicial que deben estar en sesión
+CAMPOS_SESION = frozenset(("activo_fijo", "propietario", "cargo", "tecnico"))
 
 
 def session_required(f):
     """
     Decorador para verificar que existan datos en sesión
+
+    La sesión se carga una sola vez por petición (una consulta al almacén);
+    aquí solo se compara con sus claves.
     """
 
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        required_keys = ["activo_fijo", "propietario", "cargo", "tecnico"]
-
-        for key in required_keys:
-            if key not in session:
-                flash("Por favor, completa el formulario de datos iniciales", "warning")
-                return redirect(
-                    url_for("checklist.formulario", tipo=kwargs.get("tipo", "pc"))
-                )
+        if not CAMPOS_SESION.issubset(session.keys()):
+            flash("Por favor, completa el formulario de datos iniciales", "warning")
+            return redirect(
+                url_for("checklist.formulario", tipo=kwargs.get("tipo", "pc"))
+            )
 
         return f(*args, **kwargs)
 
     return decorated_function
 
 
+def cached_page(f):
+    """
+    Decorador para cachear una página GET que solo depende de los checklists
+
+    Responde 304 si el navegador ya tiene la versión vigente (ETag) y, si no,
+    reutiliza el HTML renderizado en este worker.
+    """
+
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        from app.models.checklist_data import get_version
+        from app.services.http_cache import PageCache
+
+        if request.method != "GET" or not PageCache.habilitado:
+            return f(*args, **kwargs)
+
+        # La barra de navegación muestra el propietario y activo de la sesión
+        version = get_version()
+        clave = (
+            request.endpoint,
+            tuple(sorted(kwargs.items())),
+            session.get("propietario"),
+            session.get("activo_fijo"),
+        )
+        etag = PageCache.etag(clave, version)
+
+        if request.if_none_match.contains(etag):
+            response = make_response("", 304)
+        else:
+            html = PageCache.obtener(clave, version)
+            if html is None:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                PageCache.guardar(clave, version, response.get_data())
+            else:
+                response = make_response(html)
+
+        response.set_etag(etag)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        response.vary.add("Cookie")
+
+        return response
+
+    return decorated_function
+
+
 def sanitize_filename(filename: str) -> str:
     """
     Sanitizar nombre de archivo eliminando caracteres no permitidos
@@ -0,0 +1,7 @@
+"""
+Benchmarks de rendimiento de App Checklist PQN
+
+Uso:
+    python -m benchmarks.run -o resultados.json
+    python -m benchmarks.run --engines openpyxl,xml --comparar base.json
+"""
@@ -0,0 +1,98 @@
+"""
+Arranque en frío: create_app y primeras peticiones en un proceso nuevo
+
+Lo ejecuta benchmarks.run (grupo arranque) una vez por iteración; imprime
+un JSON con los milisegundos de cada medición.
+
+Uso:
+    python -m benchmarks.arranque <temporal> [--tipo pc] [--sin-precalentar]
+        [--sin-cache-jinja]
+"""
+
+import sys
+import json
+import time
+import argparse
+
+
+def medir_arranque(
+    temporal: str, tipo: str, precalentar: bool, cache_jinja: bool = True
+) -> dict:
+    """
+    Medir la creación de la aplicación y sus primeras peticiones
+
+    Args:
+        temporal: Directorio de trabajo del benchmark
+        tipo: Checklist de las peticiones
+        precalentar: Valor de WARMUP_ENABLED; también levanta el pool de
+            generación como post_worker_init en gunicorn.conf.py
+        cache_jinja: Usar el caché de bytecode Jinja del temporal
+
+    Returns:
+        dict: Milisegundos por medición
+    """
+    inicio = time.perf_counter()
+    from app import create_app
+    from benchmarks.run import SESION, config_benchmark, respuestas_completas
+
+    config = {**config_benchmark(temporal), "WARMUP_ENABLED": precalentar}
+    if not cache_jinja:
+        config["JINJA_CACHE_DIR"] = None
+    app = create_app(config, background_services=False)
+    mediciones = {"create_app": time.perf_counter() - inicio}
+    app.logger.disabled = True
+
+    # Lo que hace post_worker_init en gunicorn.conf.py
+    if precalentar:
+        from app.services.generation_pool import generation_pool
+
+        inicio = time.perf_counter()
+        generation_pool.precalentar()
+        mediciones["precalentar_pool"] = time.perf_counter() - inicio
+
+    cliente = app.test_client()
+    with cliente.session_transaction() as sesion:
+        sesion.update(SESION)
+    formulario = {f"pregunta_{i}": "OK" for i in respuestas_completas(tipo)}
+
+    for nombre, peticion in (
+        ("primer GET /checklist", lambda: cliente.get(f"/checklist/{tipo}")),
+        (
+            "primer POST /checklist/guardar",
+            lambda: cliente.post(f"/checklist/guardar/{tipo}", data=formulario),
+        ),
+        (
+            "segundo POST /checklist/guardar",
+            lambda: cliente.post(f"/checklist/guardar/{tipo}", data=formulario),
+        ),
+    ):
+        inicio = time.perf_counter()
+        status = peticion().status_code
+        if status >= 400:
+            raise RuntimeError(f"{nombre}: HTTP {status}")
+        mediciones[nombre] = time.perf_counter() - inicio
+
+    return {nombre: round(s * 1000, 3) for nombre, s in mediciones.items()}
+
+
+def main(argv=None) -> int:
+    """Punto de entrada"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.arranque")
+    parser.add_argument("temporal")
+    parser.add_argument("--tipo", default="pc")
+    parser.add_argument("--sin-precalentar", action="store_true")
+    parser.add_argument("--sin-cache-jinja", action="store_true")
+    args = parser.parse_args(argv)
+
+    mediciones = medir_arranque(
+        args.temporal,
+        args.tipo,
+        not args.sin_precalentar,
+        not args.sin_cache_jinja,
+    )
+    print(json.dumps(mediciones))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def rss_pico_mb() -> float:
+    """
+    Memoria residente máxima del proceso hasta el momento
+
+    Returns:
+        float: MB, o None si la plataforma no lo reporta
+    """
+    if resource is None:
+        return None
+
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB; macOS, bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+
+    return round(pico / divisor, 1)
+
+
+def percentil(valores: list, p: float) -> float:
+    """Percentil p (0-100) con interpolación lineal sobre valores ordenados"""
+    if not valores:
+        return 0.0
+
+    posicion = (len(valores) - 1) * p / 100
+    inferior = int(posicion)
+    superior = min(inferior + 1, len(valores) - 1)
+    fraccion = posicion - inferior
+
+    return valores[inferior] + (valores[superior] - valores[inferior]) * fraccion
+
+
+def resumir(
+    nombre: str, grupo: str, tiempos: list, segundos: float, errores: int = 0
+) -> dict:
+    """
+    Construir el resultado de un caso
+
+    Args:
+        nombre: Nombre del caso
+        grupo: Grupo del caso (excel, red, rutas)
+        tiempos: Duración de cada iteración en segundos
+        segundos: Tiempo total de pared del caso
+        errores: Iteraciones que fallaron
+
+    Returns:
+        dict: Percentiles en ms, throughput y memoria
+    """
+    ordenados = sorted(tiempos)
+    ms = [t * 1000 for t in ordenados]
+
+    return {
+        "nombre": nombre,
+        "grupo": grupo,
+        "n": len(tiempos),
+        "errores": errores,
+        "p50_ms": round(percentil(ms, 50), 3),
+        "p95_ms": round(percentil(ms, 95), 3),
+        "p99_ms": round(percentil(ms, 99), 3),
+        "media_ms": round(sum(ms) / len(ms), 3) if ms else 0.0,
+        "min_ms": round(ms[0], 3) if ms else 0.0,
+        "max_ms": round(ms[-1], 3) if ms else 0.0,
+        "throughput_por_s": round(len(tiempos) / segundos, 2) if segundos else 0.0,
+        "rss_pico_mb": rss_pico_mb(),
+    }
+
+
+def medir(
+    nombre: str,
+    grupo: str,
+    funcion,
+    iteraciones: int,
+    calentamiento: int = 3,
+    concurrencia: int = 1,
+) -> dict:
+    """
+    Ejecutar una función varias veces y resumir sus tiempos
+
+    Args:
+        nombre: Nombre del caso
+        grupo: Grupo del caso
+        funcion: Función sin argumentos a medir (segura entre hilos si
+            concurrencia > 1)
+        iteraciones: Iteraciones medidas (en total, no por cliente)
+        calentamiento: Iteraciones previas que no se miden
+        concurrencia: Clientes simultáneos
+
+    Returns:
+        dict: Resultado del caso (ver resumir)
+    """
+    for _ in range(calentamiento):
+        funcion()
+
+    def iteracion(_):
+        inicio = time.perf_counter()
+        try:
+            funcion()
+            return time.perf_counter() - inicio, False
+        except Exception:
+            return time.perf_counter() - inicio, True
+
+    inicio = time.perf_counter()
+    if concurrencia > 1:
+        with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+            mediciones = list(pool.map(iteracion, range(iteraciones)))
+    else:
+        mediciones = [iteracion(i) for i in range(iteraciones)]
+    segundos = time.perf_counter() - inicio
+
+    tiempos = [t for t, fallo in mediciones if not fallo]
+    errores = sum(1 for _, fallo in mediciones if fallo)
+
+    return resumir(nombre, grupo, tiempos, segundos, errores)
@@ -0,0 +1,523 @@
+"""
+Suite de benchmarks del guardado de checklists y del renderizado de páginas
+
+Grupos:
+    excel: ExcelService.generar_excel por plantilla y motor, _llenar_respuestas
+    red:   FileService.copiar_a_red contra un directorio local con latencia
+    rutas: /, /checklist/<tipo> y /checklist/guardar/<tipo> con clientes
+           concurrentes (cliente de pruebas de Flask o --url de un servidor)
+    arranque: create_app y primeras peticiones en un proceso nuevo, con y
+           sin precalentamiento
+
+Uso:
+    python -m benchmarks.run -o resultados.json
+    python -m benchmarks.run --grupos rutas --url http://localhost:5000 -c 8
+    python -m benchmarks.run -o nuevo.json --comparar resultados.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import threading
+import subprocess
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+from http.cookiejar import CookieJar
+from unittest import mock
+
+from benchmarks.medicion import medir, resumir
+
+TIPOS = ("pc", "terminales", "macos", "tablets", "calypso")
+GRUPOS = ("excel", "red", "rutas", "arranque", "lectura")
+
+SESION = {
+    "activo_fijo": "90000",
+    "propietario": "Benchmark",
+    "cargo": "Rendimiento",
+    "tecnico": "Benchmark",
+}
+
+
+def respuestas_completas(tipo: str) -> dict:
+    """Respuestas OK para todas las preguntas de un checklist"""
+    from app.models.checklist_data import get_checklist
+
+    total = len(get_checklist(tipo)["preguntas"])
+    return {i: "OK" for i in range(1, total + 1)}
+
+
+def casos_excel(app, args) -> list:
+    """Generación completa por plantilla y motor, y llenado de respuestas"""
+    from app.models.checklist_data import get_checklist
+    from app.services.excel_service import ExcelService
+    from app.services.template_cache import TemplateCache
+    from app.services.template_layout import LayoutCache
+
+    resultados = []
+
+    with app.app_context():
+        for motor in args.engines:
+            app.config["EXCEL_ENGINE"] = motor
+
+            for tipo in args.tipos:
+                respuestas = respuestas_completas(tipo)
+                resultados.append(
+                    medir(
+                        f"generar_excel[{tipo},{motor}]",
+                        "excel",
+                        lambda: ExcelService.generar_excel(tipo, respuestas, SESION),
+                        args.iteraciones,
+                        args.calentamiento,
+                    )
+                )
+
+        for tipo in args.tipos:
+            respuestas = respuestas_completas(tipo)
+            plantilla = os.path.join(
+                app.config["TEMPLATES_DIR"], get_checklist(tipo)["plantilla"]
+            )
+            ws = TemplateCache.obtener(plantilla).active
+            layout = LayoutCache.obtener(plantilla, ws)
+
+            resultados.append(
+                medir(
+                    f"llenar_respuestas[{tipo}]",
+                    "excel",
+                    lambda: ExcelService._llenar_respuestas(ws, respuestas, layout),
+                    args.iteraciones * 10,
+                    args.calentamiento,
+                )
+            )
+
+    return resultados
+
+
+def casos_red(app, args) -> list:
+    """Copia a un directorio local que simula la compartida con latencia"""
+    from app.services import file_service
+    from app.services.excel_service import ExcelService
+    from app.services.file_service import FileService
+
+    resultados = []
+    copiar = shutil.copyfile
+
+    with app.app_context():
+        archivo_local, nombre_archivo = ExcelService.generar_excel(
+            "pc", respuestas_completas("pc"), SESION
+        )
+
+        for latencia_ms in args.latencia_red:
+
+            def copia_lenta(origen, destino, latencia=latencia_ms / 1000):
+                time.sleep(latencia)
+                return copiar(origen, destino)
+
+            with mock.patch.object(file_service.shutil, "copyfile", copia_lenta):
+                resultados.append(
+                    medir(
+                        f"copiar_a_red[{latencia_ms}ms]",
+                        "red",
+                        lambda: _exigir(
+                            FileService.copiar_a_red(archivo_local, nombre_archivo)
+                        ),
+                        args.iteraciones,
+                        args.calentamiento,
+                    )
+                )
+
+    return resultados
+
+
+def casos_lectura(app, args) -> list:
+    """Lectura de checklists generados: completa, read-only y desde el caché"""
+    from openpyxl import load_workbook
+    from app.services.excel_service import ExcelService
+    from app.services.lector_checklist import LectorChecklists, leer_checklist
+
+    resultados = []
+    directorio = os.path.join(args.temporal, "lectura")
+
+    with app.app_context():
+        salida = app.config["OUTPUT_DIR"]
+        app.config["OUTPUT_DIR"] = directorio
+        os.makedirs(directorio, exist_ok=True)
+        try:
+            for numero in range(args.iteraciones):
+                ExcelService.generar_excel(
+                    "pc",
+                    respuestas_completas("pc"),
+                    {**SESION, "activo_fijo": str(90000 + numero)},
+                )
+        finally:
+            app.config["OUTPUT_DIR"] = salida
+
+        archivo = next(os.scandir(directorio)).path
+        resultados.append(
+            medir(
+                "load_workbook[pc]",
+                "lectura",
+                lambda: load_workbook(archivo),
+                args.iteraciones,
+                args.calentamiento,
+            )
+        )
+        resultados.append(
+            medir(
+                "leer_checklist[pc]",
+                "lectura",
+                lambda: leer_checklist(archivo),
+                args.iteraciones,
+                args.calentamiento,
+            )
+        )
+
+        # Pasada completa con el caché ya lleno: no se abre ningún archivo
+        list(LectorChecklists(app.config).recorrer(directorio))
+        resultados.append(
+            medir(
+                f"recorrer_en_cache[{args.iteraciones} archivos]",
+                "lectura",
+                lambda: list(LectorChecklists(app.config).recorrer(directorio)),
+                args.iteraciones,
+                args.calentamiento,
+            )
+        )
+
+    return resultados
+
+
+def casos_arranque(app, args) -> list:
+    """
+    Arranque en frío con y sin precalentamiento, en procesos nuevos
+
+    Cada iteración es un intérprete nuevo (benchmarks.arranque), así las
+    importaciones y cachés en memoria no vienen de casos anteriores. El
+    caché de bytecode Jinja del temporal ya lo llenó la app de este proceso,
+    como lo haría `compilar-plantillas` en el build de la imagen.
+    """
+    repeticiones = max(args.iteraciones // 10, 3)
+    resultados = []
+
+    for modo, extra in (
+        ("sin precalentar", ["--sin-precalentar", "--sin-cache-jinja"]),
+        ("precalentado", ["--sin-cache-jinja"]),
+        ("precalentado + bytecode jinja", []),
+    ):
+        mediciones = {}
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            proceso = subprocess.run(
+                [sys.executable, "-m", "benchmarks.arranque", args.temporal]
+                + ["--tipo", args.tipo_rutas]
+                + extra,
+                capture_output=True,
+                text=True,
+                timeout=300,
+            )
+            if proceso.returncode != 0:
+                raise RuntimeError(f"benchmarks.arranque falló: {proceso.stderr}")
+            for nombre, ms in json.loads(proceso.stdout).items():
+                mediciones.setdefault(nombre, []).append(ms / 1000)
+        segundos = time.perf_counter() - inicio
+
+        resultados.extend(
+            resumir(f"arranque {nombre} [{modo}]", "arranque", tiempos, segundos)
+            for nombre, tiempos in mediciones.items()
+        )
+
+    return resultados
+
+
+def casos_rutas(app, args) -> list:
+    """Rutas principales con clientes concurrentes"""
+    locales = threading.local()
+    contador = iter(range(1, 1_000_000))
+    lock = threading.Lock()
+
+    def cliente():
+        # Un cliente (y una sesión con activo propio) por hilo
+        if not hasattr(locales, "cliente"):
+            with lock:
+                numero = next(contador)
+            sesion = {**SESION, "activo_fijo": str(90000 + numero)}
+            if args.url:
+                locales.cliente = ClienteHttp(args.url, args.tipo_rutas, sesion)
+            else:
+                locales.cliente = ClienteLocal(app, sesion)
+        return locales.cliente
+
+    tipo = args.tipo_rutas
+    formulario = {
+        f"pregunta_{i}": "OK" for i in respuestas_completas(tipo) if i % 7
+    }  # algunas quedan sin responder (N/A) como en el uso real
+
+    casos = (
+        ("GET /", lambda: cliente().get("/")),
+        (f"GET /checklist/{tipo}", lambda: cliente().get(f"/checklist/{tipo}")),
+        (
+            f"POST /checklist/guardar/{tipo}",
+            lambda: cliente().post(f"/checklist/guardar/{tipo}", formulario),
+        ),
+    )
+
+    return [
+        medir(
+            f"{nombre} [c={args.concurrencia}]",
+            "rutas",
+            funcion,
+            args.iteraciones * args.concurrencia,
+            args.calentamiento,
+            args.concurrencia,
+        )
+        for nombre, funcion in casos
+    ]
+
+
+class ClienteLocal:
+    """Cliente de pruebas de Flask con sesión iniciada"""
+
+    def __init__(self, app, sesion: dict):
+        self.client = app.test_client()
+        with self.client.session_transaction() as s:
+            s.update(sesion)
+
+    def get(self, ruta: str):
+        return _exigir_status(self.client.get(ruta).status_code)
+
+    def post(self, ruta: str, datos: dict):
+        return _exigir_status(self.client.post(ruta, data=datos).status_code)
+
+
+class ClienteHttp:
+    """Cliente HTTP contra un servidor en ejecución (sin seguir redirecciones)"""
+
+    class _SinRedireccion(urllib.request.HTTPRedirectHandler):
+        def redirect_request(self, *args, **kwargs):
+            return None
+
+    def __init__(self, url: str, tipo: str, sesion: dict):
+        self.url = url.rstrip("/")
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(CookieJar()), self._SinRedireccion
+        )
+        self.post(f"/checklist/formulario/{tipo}", sesion)
+
+    def get(self, ruta: str):
+        return self._abrir(urllib.request.Request(self.url + ruta))
+
+    def post(self, ruta: str, datos: dict):
+        cuerpo = urllib.parse.urlencode(datos).encode()
+        return self._abrir(urllib.request.Request(self.url + ruta, data=cuerpo))
+
+    def _abrir(self, peticion):
+        try:
+            with self.opener.open(peticion, timeout=120) as respuesta:
+                respuesta.read()
+                return _exigir_status(respuesta.status)
+        except urllib.error.HTTPError as e:
+            return _exigir_status(e.code)
+
+
+def _exigir(ok: bool):
+    """Convertir un resultado False en error para contarlo como fallo"""
+    if not ok:
+        raise RuntimeError("La operación reportó un fallo")
+
+
+def _exigir_status(status: int) -> int:
+    """Contar como fallo cualquier respuesta 4xx/5xx"""
+    if status >= 400:
+        raise RuntimeError(f"HTTP {status}")
+    return status
+
+
+def config_benchmark(temporal: str) -> dict:
+    """Configuración con salida, compartida y estado en disco dentro del temporal"""
+    datos = os.path.join(temporal, "data")
+    return {
+        "TESTING": True,
+        "OUTPUT_DIR": os.path.join(temporal, "salida"),
+        "SHARED_NETWORK_PATH": os.path.join(temporal, "red"),
+        "COPY_QUEUE_ENABLED": False,
+        # Bases, journal y métricas en el temporal, no en el DATA_DIR real
+        "DATA_DIR": datos,
+        "SESSION_DB": os.path.join(datos, "sessions.sqlite3"),
+        "SUBMISSIONS_DB": os.path.join(datos, "submissions.sqlite3"),
+        "COPY_QUEUE_DIR": os.path.join(datos, "copy_queue"),
+        "METRICS_DIR": os.path.join(datos, "metrics"),
+        "SYNC_DB": os.path.join(datos, "sync.sqlite3"),
+        "READBACK_DB": os.path.join(datos, "lecturas.sqlite3"),
+        "JINJA_CACHE_DIR": os.path.join(temporal, "jinja"),
+    }
+
+
+def metadatos(args) -> dict:
+    """Entorno de la ejecución para poder comparar resultados"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "grupos": args.grupos,
+        "engines": args.engines,
+        "iteraciones": args.iteraciones,
+        "concurrencia": args.concurrencia,
+        "url": args.url,
+    }
+
+
+def comparar(actual: list, anterior: list, umbral: float) -> list:
+    """
+    Comparar el p95 de cada caso contra una ejecución anterior
+
+    Args:
+        actual: Resultados de esta ejecución
+        anterior: Resultados de la ejecución de referencia
+        umbral: Porcentaje de aumento del p95 que se considera regresión
+
+    Returns:
+        list: Casos con regresión [(nombre, p95 anterior, p95 actual, %)]
+    """
+    referencia = {r["nombre"]: r for r in anterior}
+    regresiones = []
+
+    for resultado in actual:
+        base = referencia.get(resultado["nombre"])
+        if not base or not base["p95_ms"]:
+            continue
+
+        cambio = (resultado["p95_ms"] - base["p95_ms"]) / base["p95_ms"] * 100
+        if cambio > umbral:
+            regresiones.append(
+                (resultado["nombre"], base["p95_ms"], resultado["p95_ms"], cambio)
+            )
+
+    return regresiones
+
+
+def imprimir_tabla(resultados: list):
+    """Resumen legible por stderr (el JSON queda limpio en stdout)"""
+    print(
+        f"{'caso':<42} {'n':>5} {'p50':>9} {'p95':>9} {'p99':>9} "
+        f"{'ops/s':>9} {'rss MB':>7} {'err':>4}",
+        file=sys.stderr,
+    )
+    for r in resultados:
+        print(
+            f"{r['nombre']:<42} {r['n']:>5} {r['p50_ms']:>9.2f} "
+            f"{r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} "
+            f"{r['throughput_por_s']:>9.1f} {r['rss_pico_mb'] or '-':>7} "
+            f"{r['errores']:>4}",
+            file=sys.stderr,
+        )
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """Construir el parser de argumentos"""
+    lista = lambda texto: [v for v in texto.split(",") if v]  # noqa: E731
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Benchmarks de App Checklist PQN",
+    )
+    parser.add_argument("-o", "--salida", help="Archivo JSON (por defecto, stdout)")
+    parser.add_argument("-n", "--iteraciones", type=int, default=30)
+    parser.add_argument("--calentamiento", type=int, default=3)
+    parser.add_argument("-c", "--concurrencia", type=int, default=4)
+    parser.add_argument("--grupos", type=lista, default=list(GRUPOS))
+    parser.add_argument("--engines", type=lista, default=["openpyxl", "xml"])
+    parser.add_argument("--tipos", type=lista, default=list(TIPOS))
+    parser.add_argument("--tipo-rutas", default="pc")
+    parser.add_argument(
+        "--latencia-red",
+        type=lambda texto: [int(v) for v in lista(texto)],
+        default=[0, 20],
+        help="Latencias simuladas de la compartida en ms (ej. 0,20,100)",
+    )
+    parser.add_argument("--url", help="Medir las rutas contra un servidor real")
+    parser.add_argument("--comparar", help="JSON de una ejecución anterior")
+    parser.add_argument(
+        "--umbral", type=float, default=20, help="%% de aumento del p95 tolerado"
+    )
+
+    return parser
+
+
+def main(argv=None) -> int:
+    """Punto de entrada de los benchmarks"""
+    from app import create_app
+
+    args = crear_parser().parse_args(argv)
+    temporal = tempfile.mkdtemp(prefix="benchmark_checklist_")
+
+    try:
+        os.makedirs(os.path.join(temporal, "salida"))
+
+        app = create_app(config_benchmark(temporal), background_services=False)
+        app.logger.disabled = True
+        args.temporal = temporal
+
+        casos = {
+            "excel": casos_excel,
+            "red": casos_red,
+            "rutas": casos_rutas,
+            "arranque": casos_arranque,
+            "lectura": casos_lectura,
+        }
+        resultados = []
+        for grupo in args.grupos:
+            resultados.extend(casos[grupo](app, args))
+
+    finally:
+        shutil.rmtree(temporal, ignore_errors=True)
+
+    imprimir_tabla(resultados)
+
+    documento = json.dumps(
+        {"meta": metadatos(args), "resultados": resultados},
+        ensure_ascii=False,
+        indent=2,
+    )
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(documento)
+    else:
+        print(documento)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            anterior = json.load(f)["resultados"]
+
+        regresiones = comparar(resultados, anterior, args.umbral)
+        for nombre, antes, ahora, cambio in regresiones:
+            print(
+                f"[REGRESIÓN] {nombre}: p95 {antes:.2f} -> {ahora:.2f} ms "
+                f"(+{cambio:.0f}%)",
+                file=sys.stderr,
+            )
+        if regresiones:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,10 @@ def env(key: str) -> str:
     return value
 
 
+def env_or(key: str, default: str) -> str:
+    return os.getenv(key, default)
+
+
 class Config:
     # Flask
     SECRET_KEY = env("SECRET_KEY")
@@ -25,7 +29,6 @@ class Config:
     PORT = int(env("PORT"))
 
     # Session
-    SESSION_TYPE = "filesystem"
     PERMANENT_SESSION_LIFETIME = timedelta(minutes=int(env("SESSION_TIMEOUT")))
 
     # Paths
@@ -34,6 +37,108 @@ class Config:
     SHARED_NETWORK_PATH = env("SHARED_NETWORK_PATH")
     LOGS_DIR = BASE_DIR / env("LOG_DIR")
     LOG_FILE = BASE_DIR / env("LOG_FILE")
+    DATA_DIR = BASE_DIR / env_or("DATA_DIR", "data")
+
+    # Subdirectorios de OUTPUT_DIR y de la compartida, p. ej.
+    # {empresa}/{tipo}/{anio}/{mes}; vacío = todo en la raíz
+    OUTPUT_LAYOUT = env_or("OUTPUT_LAYOUT", "")
+
+    # Sesiones en el servidor; sqlite las comparte entre workers de gunicorn
+    SESSION_TYPE = env_or("SESSION_TYPE", "sqlite")
+    SESSION_DB = DATA_DIR / "sessions.sqlite3"
+    SESSION_MAX_ENTRIES = int(env_or("SESSION_MAX_ENTRIES", "10000"))
+
+    # Registro indexado de envíos (búsqueda en /api/envios)
+    SUBMISSIONS_ENABLED = env_or("SUBMISSIONS_ENABLED", "True") == "True"
+    SUBMISSIONS_DB = DATA_DIR / "submissions.sqlite3"
+    SUBMISSIONS_PAGE_SIZE = int(env_or("SUBMISSIONS_PAGE_SIZE", "50"))
+
+    # Definiciones de checklists (<tipo>.json o .yaml), revisadas cada N segundos
+    CHECKLISTS_DIR = BASE_DIR / env_or("CHECKLISTS_DIR", "checklists")
+    CHECKLISTS_RELOAD_INTERVAL = float(env_or("CHECKLISTS_RELOAD_INTERVAL", "5"))
+
+    # Plantillas Excel
+    TEMPLATE_CACHE_SIZE = int(env_or("TEMPLATE_CACHE_SIZE", "10"))
+    TEMPLATE_CACHE_WARMUP = env_or("TEMPLATE_CACHE_WARMUP", "True") == "True"
+
+    # Precalentamiento al iniciar: módulos pesados, Jinja y plantillas Excel
+    WARMUP_ENABLED = env_or("WARMUP_ENABLED", "True") == "True"
+
+    # Bytecode de las plantillas Jinja compartido entre procesos y contenedores
+    # (vacío lo desactiva; se llena en el build con `compilar-plantillas`)
+    JINJA_CACHE_DIR = env_or("JINJA_CACHE_DIR", "cache/jinja")
+    JINJA_CACHE_DIR = BASE_DIR / JINJA_CACHE_DIR if JINJA_CACHE_DIR else None
+    EXCEL_ENGINE = env_or("EXCEL_ENGINE", "openpyxl")  # openpyxl | xml
+
+    # Entrega del checklist: redirect (página de confirmación) | download
+    EXCEL_DELIVERY = env_or("EXCEL_DELIVERY", "redirect")
+    DOWNLOAD_SAVE_LOCAL = env_or("DOWNLOAD_SAVE_LOCAL", "True") == "True"
+    DOWNLOAD_COPY_TO_SHARE = env_or("DOWNLOAD_COPY_TO_SHARE", "True") == "True"
+
+    # Cola de copias a la carpeta compartida
+    COPY_QUEUE_ENABLED = env_or("COPY_QUEUE_ENABLED", "True") == "True"
+    COPY_QUEUE_DIR = DATA_DIR / "copy_queue"
+    COPY_QUEUE_WORKERS = int(env_or("COPY_QUEUE_WORKERS", "2"))
+    COPY_QUEUE_MAX_RETRIES = int(env_or("COPY_QUEUE_MAX_RETRIES", "8"))
+    COPY_QUEUE_BACKOFF = float(env_or("COPY_QUEUE_BACKOFF", "2"))
+
+    # Acceso a la compartida: tiempo máximo por operación y circuito
+    SHARE_TIMEOUT = float(env_or("SHARE_TIMEOUT", "10"))
+    SHARE_BREAKER_THRESHOLD = int(env_or("SHARE_BREAKER_THRESHOLD", "3"))
+    SHARE_BREAKER_COOLDOWN = float(env_or("SHARE_BREAKER_COOLDOWN", "30"))
+    SHARE_IO_THREADS = int(env_or("SHARE_IO_THREADS", "4"))
+
+    # Retención del directorio de salida (0 desactiva cada regla)
+    RETENTION_ENABLED = env_or("RETENTION_ENABLED", "False") == "True"
+    RETENTION_MAX_DAYS = float(env_or("RETENTION_MAX_DAYS", "30"))
+    RETENTION_MAX_MB = float(env_or("RETENTION_MAX_MB", "0"))
+    RETENTION_KEEP_PER_ACTIVO = int(env_or("RETENTION_KEEP_PER_ACTIVO", "0"))
+    RETENTION_ARCHIVE_DIR = env_or("RETENTION_ARCHIVE_DIR", "") or None
+    RETENTION_INTERVAL = float(env_or("RETENTION_INTERVAL", "3600"))
+    RETENTION_BUDGET = float(env_or("RETENTION_BUDGET", "5"))
+    RETENTION_BATCH = int(env_or("RETENTION_BATCH", "500"))
+
+    # Sincronización de OUTPUT_DIR con la compartida (por manifiesto)
+    SYNC_ENABLED = env_or("SYNC_ENABLED", "False") == "True"
+    SYNC_INTERVAL = float(env_or("SYNC_INTERVAL", "900"))
+    SYNC_WORKERS = int(env_or("SYNC_WORKERS", "4"))
+    SYNC_DB = DATA_DIR / "sync.sqlite3"
+
+    # Lectura de checklists generados (caché por ruta, mtime y tamaño)
+    READBACK_DB = DATA_DIR / "lecturas.sqlite3"
+    READBACK_WORKERS = int(env_or("READBACK_WORKERS", "0"))  # 0 = núcleos
+
+    # Caché HTTP
+    PAGE_CACHE_ENABLED = env_or("PAGE_CACHE_ENABLED", "True") == "True"
+    PAGE_CACHE_SIZE = int(env_or("PAGE_CACHE_SIZE", "64"))
+    STATIC_MAX_AGE = int(env_or("STATIC_MAX_AGE", "31536000"))  # 1 año
+
+    # Métricas (/metrics); el directorio agrega los workers de gunicorn
+    METRICS_ENABLED = env_or("METRICS_ENABLED", "True") == "True"
+    METRICS_DIR = DATA_DIR / "metrics"
+    METRICS_FLUSH_INTERVAL = float(env_or("METRICS_FLUSH_INTERVAL", "1"))
+
+    # Perfilado opcional de peticiones (encabezado X-Profile o muestreo)
+    PROFILING_ENABLED = env_or("PROFILING_ENABLED", "False") == "True"
+    PROFILING_SECRET = env_or("PROFILING_SECRET", "")
+    PROFILING_SAMPLE_RATE = float(env_or("PROFILING_SAMPLE_RATE", "0"))
+    PROFILING_INTERVAL_MS = float(env_or("PROFILING_INTERVAL_MS", "1"))
+    PROFILING_DIR = LOGS_DIR / "profiles"
+    PROFILING_MAX_FILES = int(env_or("PROFILING_MAX_FILES", "50"))
+    PROFILING_MAX_MB = float(env_or("PROFILING_MAX_MB", "50"))
+
+    # Generación en lote
+    BULK_MAX_ITEMS = int(env_or("BULK_MAX_ITEMS", "500"))
+    BULK_WORKERS = int(env_or("BULK_WORKERS", "0"))  # 0 = núcleos disponibles
+
+    # Pool de generación de Excel para el formulario web
+    GENERATION_POOL_MODE = env_or(
+        "GENERATION_POOL_MODE", "process"
+    )  # off|thread|process
+    GENERATION_POOL_WORKERS = int(env_or("GENERATION_POOL_WORKERS", "2"))
+    GENERATION_POOL_QUEUE = int(env_or("GENERATION_POOL_QUEUE", "4"))
+    GENERATION_POOL_TIMEOUT = float(env_or("GENERATION_POOL_TIMEOUT", "60"))
+    GENERATION_POOL_RETRY_AFTER = int(env_or("GENERATION_POOL_RETRY_AFTER", "5"))
 
     # Empresa
     DEFAULT_VALIDATOR = env("DEFAULT_VALIDATOR")
@@ -50,6 +155,11 @@ class Config:
 
     # Logs
     LOG_LEVEL = env("LOG_LEVEL")
+    LOG_MAX_MB = float(env_or("LOG_MAX_MB", "10"))
+    LOG_ROTATE_WHEN = env_or("LOG_ROTATE_WHEN", "midnight")  # midnight|hourly|""
+    LOG_BACKUP_COUNT = int(env_or("LOG_BACKUP_COUNT", "14"))
+    LOG_COMPRESS = env_or("LOG_COMPRESS", "True") == "True"
+    LOG_JSON = env_or("LOG_JSON", "False") == "True"
 
     # CORS
     ENABLE_CORS = env("ENABLE_CORS").lower() == "true"
@@ -59,6 +169,7 @@ class Config:
         Config.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
         Config.TEMPLATES_DIR.mkdir(parents=True, exist_ok=True)
         Config.LOGS_DIR.mkdir(parents=True, exist_ok=True)
+        Config.DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 
 class DevelopmentConfig(Config):
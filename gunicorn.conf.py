@@ -0,0 +1,46 @@
+"""
+Configuración de gunicorn
+
+Uso:
+    gunicorn -c gunicorn.conf.py app:app
+
+La aplicación se crea y precalienta una sola vez en el proceso principal
+(preload_app) y los workers la heredan al hacer fork: los módulos
+importados, las plantillas Jinja compiladas y los workbooks parseados se
+comparten copy-on-write en lugar de repetirse por worker. Los servicios con
+estado por proceso (conexiones sqlite, hilos del log, cola de copias,
+métricas, circuito de la compartida) se reinician solos en cada worker al
+detectar un pid distinto.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '9015')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+
+# Workers con hilos (gthread) para que las peticiones concurrentes lleguen al
+# pool de generación y el exceso reciba 503
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+preload_app = True
+
+
+def post_worker_init(worker):
+    """Levantar los procesos del pool de generación antes de la primera petición"""
+    from app.services.generation_pool import generation_pool
+
+    procesos = generation_pool.precalentar()
+    if procesos:
+        worker.log.info(f"Pool de generación listo: {procesos} procesos")
+
+
+def on_starting(server):
+    """Descartar las métricas de la ejecución anterior antes de los workers"""
+    from config.settings import get_config
+    from app.services.metrics import Metricas
+
+    directorio = get_config().METRICS_DIR
+    Metricas.limpiar_directorio(str(directorio))
+    server.log.info(f"Métricas anteriores descartadas en {directorio}")
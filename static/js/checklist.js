@@ -7,6 +7,7 @@ let preguntasCompletadas = new Set();
 document.addEventListener('DOMContentLoaded', function() {
     initializeClickableCards();
     initializeAutoRedirect();
+    initializeCopyStatus();
 });
 
 /**
@@ -123,6 +124,37 @@ function initializeAutoRedirect() {
     }
 }
 
+/**
+ * Consultar el estado de la copia a la compartida (cola en segundo plano)
+ */
+function initializeCopyStatus() {
+    const alertEl = document.getElementById('successAlert');
+    const statusEl = document.getElementById('copyStatus');
+    const url = alertEl?.dataset.estadoUrl;
+
+    if (!url || !statusEl) return;
+
+    const textos = {
+        copiado: '✓ Archivo disponible en la compartida',
+        fallido: 'No se pudo enviar a la compartida. El archivo quedó guardado localmente.',
+    };
+
+    const consultar = () => {
+        fetch(url)
+            .then(response => response.json())
+            .then(({ data }) => {
+                if (textos[data.estado]) {
+                    statusEl.textContent = textos[data.estado];
+                } else {
+                    setTimeout(consultar, 2000);
+                }
+            })
+            .catch(() => setTimeout(consultar, 5000));
+    };
+
+    consultar();
+}
+
 /**
  * Validación antes de enviar formulario
  */
@@ -6,10 +6,24 @@ from app.services.excel_service import ExcelService
 from app.services.file_service import FileService
 
 
+def config_aislada(directorio) -> dict:
+    """Estado en disco (bases, journal, métricas) dentro de `directorio`"""
+    return {
+        "DATA_DIR": directorio,
+        "SESSION_DB": directorio / "sessions.sqlite3",
+        "SUBMISSIONS_DB": directorio / "submissions.sqlite3",
+        "COPY_QUEUE_DIR": directorio / "copy_queue",
+        "METRICS_DIR": directorio / "metrics",
+        "SYNC_DB": directorio / "sync.sqlite3",
+        "JINJA_CACHE_DIR": directorio / "jinja",
+        "READBACK_DB": directorio / "lecturas.sqlite3",
+    }
+
+
 @pytest.fixture
-def app():
+def app(tmp_path_factory):
     """Fixture para crear la aplicación de prueba"""
-    app = create_app()
+    app = create_app(config_aislada(tmp_path_factory.mktemp("data")))
     app.config["TESTING"] = True
     app.config["OUTPUT_DIR"] = "test_output"
     app.config["TEMPLATES_DIR"] = "templates_excel"
@@ -102,6 +116,394 @@ class TestExcelService:
         assert ws.cell(row=3, column=3).value == "PD"
         assert final_line >= 3
 
+    def test_generar_excel_en_memoria(self, app_context, tmp_path):
+        """Test para generar el checklist en un buffer sin tocar OUTPUT_DIR"""
+        from openpyxl import load_workbook
+
+        app = app_context
+        app.config["OUTPUT_DIR"] = str(tmp_path)
+
+        session_data = {
+            "activo_fijo": "1",
+            "propietario": "Ana",
+            "cargo": "Dev",
+            "tecnico": "Luis",
+        }
+        buffer, nombre = ExcelService.generar_excel_en_memoria(
+            "macos", {1: "OK"}, session_data
+        )
+
+        assert nombre.endswith(".xlsx")
+        assert os.listdir(tmp_path) == []
+        ws = load_workbook(buffer).active
+        assert "Técnico: Luis" in ws.cell(row=ws.max_row, column=1).value
+
+
+class TestTemplateCache:
+    """Tests para TemplateCache"""
+
+    def test_copias_independientes(self):
+        """Test para verificar que cada copia es independiente del caché"""
+        from app.services.template_cache import TemplateCache
+
+        plantilla_path = os.path.join("templates_excel", "plantilla_pc.xlsx")
+
+        wb1 = TemplateCache.obtener(plantilla_path)
+        wb1.active.cell(row=5, column=3).value = "OK"
+
+        wb2 = TemplateCache.obtener(plantilla_path)
+        assert wb2.active.cell(row=5, column=3).value is None
+
+    def test_copia_guardada_se_puede_abrir(self, tmp_path):
+        """Test para verificar que una copia guardada conserva sus estilos"""
+        from openpyxl import load_workbook
+        from app.services.template_cache import TemplateCache
+
+        plantilla_path = os.path.join("templates_excel", "plantilla_pc.xlsx")
+        original = load_workbook(plantilla_path)
+
+        wb = TemplateCache.obtener(plantilla_path)
+        wb.active.cell(row=5, column=3).value = "OK"
+        assert len(wb._cell_styles) == len(original._cell_styles)
+
+        ruta = tmp_path / "copia.xlsx"
+        wb.save(ruta)
+
+        reabierto = load_workbook(ruta)
+        assert reabierto.active.cell(row=5, column=3).value == "OK"
+        assert len(reabierto._fonts) == len(original._fonts)
+
+    def test_recarga_por_mtime_y_desalojo(self, tmp_path):
+        """Test para recarga al cambiar la plantilla y desalojo LRU"""
+        from openpyxl import Workbook
+        from app.services.template_cache import TemplateCache
+
+        TemplateCache.limpiar()
+        original_max = TemplateCache.max_entradas
+        TemplateCache.max_entradas = 1
+
+        rutas = []
+        for nombre in ("a.xlsx", "b.xlsx"):
+            wb = Workbook()
+            wb.active["A1"] = nombre
+            wb.save(tmp_path / nombre)
+            rutas.append(str(tmp_path / nombre))
+
+        try:
+            assert TemplateCache.obtener(rutas[0]).active["A1"].value == "a.xlsx"
+
+            # Modificar plantilla con un mtime distinto
+            wb = Workbook()
+            wb.active["A1"] = "modificada"
+            wb.save(rutas[0])
+            os.utime(rutas[0], (1, 1))
+            assert TemplateCache.obtener(rutas[0]).active["A1"].value == "modificada"
+
+            TemplateCache.obtener(rutas[1])
+            assert list(TemplateCache._entradas) == [rutas[1]]
+
+        finally:
+            TemplateCache.max_entradas = original_max
+            TemplateCache.limpiar()
+
+
+class TestPrecalentamiento:
+    """Tests para el precalentamiento al iniciar"""
+
+    def test_precalentar(self, tmp_path_factory):
+        """Test para compilar Jinja y parsear las plantillas Excel de antemano"""
+        from app.services.template_cache import TemplateCache
+
+        TemplateCache.limpiar()
+        app = create_app(
+            {
+                **config_aislada(tmp_path_factory.mktemp("data")),
+                "WARMUP_ENABLED": False,
+            },
+            background_services=False,
+        )
+        assert len(app.jinja_env.cache) == 0
+        assert len(TemplateCache._entradas) == 0
+
+        from app.services.warmup import precalentar
+
+        fases = precalentar(app)
+
+        assert fases["plantillas_jinja"] == len(app.jinja_env.list_templates())
+        assert len(app.jinja_env.cache) == fases["plantillas_jinja"]
+        assert len(TemplateCache._entradas) == 5
+
+    def test_configuracion_gunicorn(self):
+        """Test para precargar la aplicación y definir los hooks"""
+        import runpy
+
+        config = runpy.run_path("gunicorn.conf.py")
+
+        assert config["preload_app"] is True
+        assert config["worker_class"] == "gthread"
+        assert callable(config["on_starting"])
+        assert callable(config["post_worker_init"])
+
+    def test_cache_bytecode_jinja(self, tmp_path):
+        """Test para reutilizar el bytecode de otro proceso y recompilar cambios"""
+        from unittest.mock import patch
+        from jinja2 import FileSystemLoader
+        from app.services.jinja_cache import compilar
+
+        plantillas = tmp_path / "templates"
+        plantillas.mkdir()
+        (plantillas / "hola.html").write_text("Hola {{ nombre }}")
+
+        def nueva_app():
+            app = create_app(
+                {**config_aislada(tmp_path), "WARMUP_ENABLED": False},
+                background_services=False,
+            )
+            app.jinja_loader = FileSystemLoader(str(plantillas))
+            return app
+
+        reporte = compilar(nueva_app())
+        assert reporte["plantillas"] == 1
+        assert reporte["archivos"] == 1
+
+        # Otro proceso (otra app) carga el bytecode sin compilar
+        app = nueva_app()
+        with patch.object(app.jinja_env, "compile") as compilar_fuente:
+            plantilla = app.jinja_env.get_template("hola.html")
+        compilar_fuente.assert_not_called()
+        assert plantilla.render(nombre="PQN") == "Hola PQN"
+
+        # Un fuente distinto invalida la entrada aunque la fecha no cambie
+        ruta = plantillas / "hola.html"
+        mtime = ruta.stat().st_mtime
+        ruta.write_text("Chao {{ nombre }}")
+        os.utime(ruta, (mtime, mtime))
+        app = nueva_app()
+        assert app.jinja_env.get_template("hola.html").render(nombre="PQN") == (
+            "Chao PQN"
+        )
+
+
+class TestTemplateLayout:
+    """Tests para TemplateLayout y LayoutCache"""
+
+    def test_layout_desde_hoja(self):
+        """Test para compilar el mapa pregunta -> fila"""
+        from openpyxl import Workbook
+        from app.services.template_layout import TemplateLayout
+
+        wb = Workbook()
+        ws = wb.active
+        ws.cell(row=1, column=1).value = "ID"
+        ws.cell(row=2, column=1).value = 1
+        ws.cell(row=4, column=1).value = 2
+        ws.cell(row=5, column=1).value = None
+
+        layout = TemplateLayout.desde_hoja(ws)
+
+        assert dict(layout.filas) == {1: 2, 2: 4}
+        assert layout.fila_validacion == ws.max_row
+        assert layout.validar(2) == []
+        assert layout.validar(3)
+
+    def test_precargar_detecta_inconsistencias(self):
+        """Test para reportar plantillas que no coinciden con CHECKLISTS"""
+        from app.models.checklist_data import CHECKLISTS
+        from app.services.template_layout import LayoutCache
+
+        reporte = LayoutCache.precargar("templates_excel", CHECKLISTS)
+
+        assert "pc" not in reporte
+        # La plantilla de calypso tiene 53 filas numeradas para 51 preguntas
+        assert "calypso" in reporte
+
+
+class TestXmlExcelEngine:
+    """Tests para el motor de parcheo XML"""
+
+    @pytest.mark.parametrize(
+        "tipo", ["pc", "terminales", "macos", "tablets", "calypso"]
+    )
+    def test_motores_equivalentes(self, app_context, tmp_path, tipo):
+        """Test para verificar que ambos motores producen el mismo contenido"""
+        from openpyxl import load_workbook
+        from app.models.checklist_data import get_checklist
+
+        app = app_context
+        total = len(get_checklist(tipo)["preguntas"])
+        respuestas = {i: ("OK", "N/A", "PD")[i % 3] for i in range(1, total + 1)}
+        session_data = {
+            "activo_fijo": "12345",
+            "propietario": "Test <User> & Co",
+            "cargo": "Cargo",
+            "tecnico": "Técnico Ñandú",
+        }
+
+        hojas = {}
+        for engine in ("openpyxl", "xml"):
+            app.config["EXCEL_ENGINE"] = engine
+            app.config["OUTPUT_DIR"] = str(tmp_path / engine)
+            os.makedirs(app.config["OUTPUT_DIR"])
+
+            archivo_local, _ = ExcelService.generar_excel(
+                tipo, respuestas, session_data
+            )
+            ws = load_workbook(archivo_local).active
+            hojas[engine] = {
+                cell.coordinate: cell.value
+                for row in ws.iter_rows()
+                for cell in row
+                if cell.value is not None
+            }
+
+        assert hojas["openpyxl"] == hojas["xml"]
+
+    def test_layout_xml_igual_a_openpyxl(self):
+        """Test para verificar que el layout leído del XML coincide"""
+        from openpyxl import load_workbook
+        from app.services.template_layout import TemplateLayout
+
+        plantilla_path = os.path.join("templates_excel", "plantilla_calypso.xlsx")
+
+        desde_xml = TemplateLayout.desde_xlsx(plantilla_path)
+        desde_hoja = TemplateLayout.desde_hoja(load_workbook(plantilla_path).active)
+
+        assert desde_xml == desde_hoja
+
+    def test_parchear_hoja_inserta_celdas_y_filas(self):
+        """Test para insertar celdas y filas que no existen en la plantilla"""
+        from app.services.xml_engine import parchear_hoja
+
+        xml = (
+            "<worksheet><sheetData>"
+            '<row r="2"><c r="A2"><v>1</v></c><c r="D2" s="3"/></row>'
+            "</sheetData></worksheet>"
+        )
+
+        resultado = parchear_hoja(xml, {(2, 3): "OK", (2, 4): "PD", (5, 1): 7})
+
+        assert '<c r="A2"><v>1</v></c><c r="C2" t="inlineStr">' in resultado
+        assert '<c r="D2" s="3" t="inlineStr"><is><t xml:space="preserve">PD' in (
+            resultado
+        )
+        assert resultado.endswith(
+            '<row r="5"><c r="A5"><v>7</v></c></row>' "</sheetData></worksheet>"
+        )
+
+
+class TestChecklistData:
+    """Tests para las preguntas precompiladas"""
+
+    def test_compilar_preguntas(self):
+        """Test para detectar secciones y limpiar el marcador"""
+        from app.models.checklist_data import compilar_preguntas
+
+        preguntas = compilar_preguntas(
+            [
+                "CON USUARIO LOCAL SOPORTE. Crear usuario.",
+                "Actualizar.",
+                "CON USUARIO DE AZUREAD: Energía.",
+                "PARA CONTROL DE INVENTARIO. Revisar activo.",
+            ]
+        )
+
+        assert [p.numero for p in preguntas] == [1, 2, 3, 4]
+        assert preguntas[0].texto_limpio == "Crear usuario."
+        assert preguntas[0].inicia_seccion and not preguntas[0].cierra_seccion
+        assert preguntas[1].categoria is None and not preguntas[1].inicia_seccion
+        assert preguntas[2].categoria == "dominio"
+        assert preguntas[2].insignia == "CON USUARIO DE DOMINIO"
+        assert preguntas[2].texto_limpio == "Energía."
+        assert preguntas[3].cierra_seccion
+
+    def test_get_preguntas_inmutable(self):
+        """Test para reutilizar las preguntas compiladas entre llamadas"""
+        import dataclasses
+        from app.models.checklist_data import get_preguntas, get_checklist
+
+        preguntas = get_preguntas("pc")
+
+        assert preguntas is get_preguntas("pc")
+        assert len(preguntas) == len(get_checklist("pc")["preguntas"])
+        assert get_preguntas("inexistente") == ()
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            preguntas[0].numero = 99
+
+    @staticmethod
+    def definir(directorio, tipo, **campos):
+        import json
+
+        definicion = {
+            "titulo": f"Checklist {tipo}",
+            "empresa": "Proquinal",
+            "tipo": tipo,
+            "plantilla": f"plantilla_{tipo}.xlsx",
+            "preguntas": ["CON USUARIO DE DOMINIO. Uno.", "Dos."],
+        }
+        definicion.update(campos)
+        ruta = directorio / f"{tipo}.json"
+        ruta.write_text(json.dumps(definicion), encoding="utf-8")
+        return ruta
+
+    def test_cargar_definiciones(self, tmp_path):
+        """Test para validar, ordenar y congelar las definiciones"""
+        from app.models.checklist_data import (
+            DefinicionInvalida,
+            cargar_definiciones,
+        )
+
+        self.definir(tmp_path, "b", orden=1)
+        self.definir(tmp_path, "a", orden=2)
+        definiciones = cargar_definiciones(tmp_path)
+
+        assert list(definiciones.checklists) == ["b", "a"]
+        assert "orden" not in definiciones.checklists["a"]
+        assert definiciones.preguntas["a"][0].categoria == "dominio"
+        with pytest.raises(TypeError):
+            definiciones.checklists["a"]["titulo"] = "otro"
+
+        # La versión depende del contenido, no del formato ni de las fechas
+        ruta = tmp_path / "a.json"
+        ruta.write_text(
+            ruta.read_text(encoding="utf-8").replace(", ", ",\n  "), encoding="utf-8"
+        )
+        assert cargar_definiciones(tmp_path).version == definiciones.version
+
+        for campos in ({"preguntas": []}, {"titulo": 3}, {"tipos": "x"}):
+            self.definir(tmp_path, "c", **campos)
+            with pytest.raises(DefinicionInvalida):
+                cargar_definiciones(tmp_path)
+
+    def test_recarga_en_caliente(self, tmp_path):
+        """Test para aplicar cambios válidos y conservar la versión ante errores"""
+        import time
+        from app.models import checklist_data
+
+        self.definir(tmp_path, "a")
+        recargas = []
+        checklist_data.al_recargar("test", recargas.append)
+        try:
+            checklist_data.configurar(tmp_path, intervalo=0.01)
+            version = checklist_data.get_version()
+            assert checklist_data.get_all_checklists().keys() == {"a"}
+
+            self.definir(tmp_path, "a", preguntas=["Uno.", "Dos.", "Tres."])
+            time.sleep(0.02)
+            assert len(checklist_data.get_preguntas("a")) == 3
+            assert checklist_data.get_version() != version
+            assert len(recargas) == 2
+
+            # Un archivo inválido no reemplaza las definiciones vigentes
+            version = checklist_data.get_version()
+            (tmp_path / "a.json").write_text("{", encoding="utf-8")
+            time.sleep(0.02)
+            assert checklist_data.checklist_exists("a")
+            assert checklist_data.get_version() == version
+        finally:
+            checklist_data._oyentes.pop("test")
+            checklist_data.configurar()
+
 
 class TestFileService:
     """Tests para FileService"""
@@ -121,9 +523,12 @@ class TestFileService:
             # Mock checklist con plantilla de prueba
             from app.models import checklist_data
 
-            original_checklists = checklist_data.CHECKLISTS.copy()
+            original_checklists = checklist_data.CHECKLISTS
 
-            checklist_data.CHECKLISTS["test"] = {"plantilla": "test_plantilla.xlsx"}
+            checklist_data.CHECKLISTS = {
+                **original_checklists,
+                "test": {"plantilla": "test_plantilla.xlsx"},
+            }
 
             resultado = FileService.validar_plantilla("test")
             assert resultado is True
@@ -177,6 +582,1288 @@ class TestFileService:
                 shutil.rmtree(test_dir)
 
 
+class TestCircuitBreaker:
+    """Tests para el circuito y el tiempo máximo de la compartida"""
+
+    @staticmethod
+    def circuito(app, **config):
+        from app.services.circuit_breaker import CircuitBreaker
+
+        app.config.update(
+            SHARE_TIMEOUT=0.2, SHARE_BREAKER_THRESHOLD=2, SHARE_BREAKER_COOLDOWN=0.1
+        )
+        app.config.update(config)
+        circuito = CircuitBreaker()
+        circuito.init_app(app)
+        return circuito
+
+    def test_timeout_y_apertura(self, app):
+        """Test para cortar una operación colgada y abrir tras los fallos"""
+        import time
+        import threading
+        from app.services.circuit_breaker import CompartidaNoDisponible
+
+        circuito = self.circuito(app)
+        colgada = threading.Event()
+        llamadas = []
+
+        def operacion():
+            llamadas.append(1)
+            colgada.wait(5)
+
+        try:
+            inicio = time.perf_counter()
+            for _ in range(2):
+                with pytest.raises(CompartidaNoDisponible) as error:
+                    circuito.ejecutar(operacion)
+                assert error.value.motivo == "timeout"
+            assert time.perf_counter() - inicio < 1
+            assert circuito.estado == "abierto"
+
+            # Abierto: se rechaza sin intentar
+            with pytest.raises(CompartidaNoDisponible) as error:
+                circuito.ejecutar(operacion)
+            assert error.value.motivo == "abierto" and len(llamadas) == 2
+        finally:
+            colgada.set()
+
+    def test_sondeo_semiabierto(self, app):
+        """Test para cerrar el circuito solo si la prueba responde"""
+        import time
+        from app.services.circuit_breaker import CompartidaNoDisponible
+
+        circuito = self.circuito(app)
+
+        def falla():
+            raise OSError("compartida caída")
+
+        for _ in range(2):
+            with pytest.raises(OSError):
+                circuito.ejecutar(falla)
+        assert circuito.estado == "abierto"
+
+        time.sleep(0.15)
+        with pytest.raises(CompartidaNoDisponible):
+            circuito.ejecutar(lambda: "copiado", sondeo=falla)
+        assert circuito.estado == "abierto"
+
+        time.sleep(0.15)
+        assert circuito.ejecutar(lambda: "copiado", sondeo=lambda: None) == "copiado"
+        assert circuito.estado == "cerrado"
+
+    def test_copia_omitida_con_circuito_abierto(self, app, tmp_path):
+        """Test para no tocar la compartida mientras el circuito está abierto"""
+        from app.services.circuit_breaker import circuito_red
+        from app.services.metrics import metricas
+
+        (tmp_path / "red").write_text("no es un directorio")
+        archivo = tmp_path / "checklist.xlsx"
+        archivo.write_bytes(b"x")
+        app.config["SHARED_NETWORK_PATH"] = str(tmp_path / "red")
+        self.circuito(app, SHARE_BREAKER_COOLDOWN=60)
+        circuito_red.init_app(app)
+
+        with app.app_context():
+            for _ in range(3):
+                assert not FileService.copiar_a_red(str(archivo), archivo.name)
+
+        assert circuito_red.estado == "abierto"
+        texto = metricas.exponer()
+        assert 'circuito_red_procesos{estado="abierto"} 1' in texto
+        assert 'copias_red_total{resultado="abierto"} 1' in texto
+
+
+class TestCopyQueue:
+    """Tests para la cola de copias a red"""
+
+    @pytest.fixture
+    def cola(self, app, tmp_path):
+        """Cola aislada sin workers en segundo plano"""
+        from app.services.copy_queue import CopyQueue
+
+        app.config["COPY_QUEUE_ENABLED"] = False
+        app.config["COPY_QUEUE_DIR"] = str(tmp_path / "journal")
+        app.config["SHARED_NETWORK_PATH"] = str(tmp_path / "compartida")
+
+        cola = CopyQueue()
+        cola.init_app(app)
+        return cola
+
+    def test_copia_y_estado(self, cola, tmp_path):
+        """Test para copiar un archivo encolado y consultar su estado"""
+        archivo = tmp_path / "checklist.xlsx"
+        archivo.write_bytes(b"contenido")
+
+        cola.encolar(str(archivo), "checklist.xlsx")
+        assert cola.estado("checklist.xlsx") == "pendiente"
+
+        assert cola.procesar_pendientes() == 1
+        assert cola.estado("checklist.xlsx") == "copiado"
+        assert (tmp_path / "compartida" / "checklist.xlsx").read_bytes() == (
+            b"contenido"
+        )
+        assert cola.estado("otro.xlsx") == "desconocido"
+
+    def test_reintento_con_backoff(self, cola, tmp_path):
+        """Test para reprogramar una copia fallida"""
+        import json
+        import time
+
+        archivo = tmp_path / "checklist.xlsx"
+        archivo.write_bytes(b"contenido")
+
+        # La compartida es un archivo: la copia falla
+        (tmp_path / "compartida").write_text("no es un directorio")
+
+        job_id = cola.encolar(str(archivo), "checklist.xlsx")
+        assert cola.procesar_pendientes() == 1
+
+        with open(os.path.join(cola.journal_dir, f"{job_id}.json")) as f:
+            job = json.load(f)
+
+        assert job["intentos"] == 1
+        assert job["proximo_intento"] > time.time()
+        assert cola.estado("checklist.xlsx") == "pendiente"
+        # No se reintenta antes de tiempo
+        assert cola.procesar_pendientes() == 0
+
+    def test_recuperar_copias_huerfanas(self, cola, tmp_path):
+        """Test para reanudar copias tomadas por un worker que murió"""
+        archivo = tmp_path / "checklist.xlsx"
+        archivo.write_bytes(b"contenido")
+
+        job_id = cola.encolar(str(archivo), "checklist.xlsx")
+        pendiente = os.path.join(cola.journal_dir, f"{job_id}.json")
+        huerfano = os.path.join(cola.journal_dir, f"{job_id}.999999999.lock")
+        os.replace(pendiente, huerfano)
+
+        assert cola.recuperar() == 1
+        assert os.path.exists(pendiente)
+        assert cola.procesar_pendientes() == 1
+        assert cola.estado("checklist.xlsx") == "copiado"
+
+    def test_reencolar_durante_copia_en_curso(self, cola, tmp_path, monkeypatch):
+        """Test para no copiar dos veces a la vez y renovar el lock vivo"""
+        import time
+        from app.services import copy_queue as modulo
+
+        archivo = tmp_path / "checklist.xlsx"
+        archivo.write_bytes(b"contenido")
+
+        # Copia en curso de este mismo proceso, con el lock ya viejo
+        job_id = cola.encolar(str(archivo), "checklist.xlsx")
+        pendiente = os.path.join(cola.journal_dir, f"{job_id}.json")
+        lock = os.path.join(cola.journal_dir, f"{job_id}.{os.getpid()}.lock")
+        os.replace(pendiente, lock)
+        os.utime(lock, (time.time() - 600, time.time() - 600))
+
+        monkeypatch.setattr(modulo, "LATIDO", 0.01)
+        cola._activos.add(lock)
+        with cola._latido(lock):
+            time.sleep(0.1)
+            assert time.time() - os.path.getmtime(lock) < 5
+
+            # Se vuelve a encolar: queda una sola pendiente en espera
+            cola.encolar(str(archivo), "checklist.xlsx")
+            cola.encolar(str(archivo), "checklist.xlsx")
+            assert os.path.exists(pendiente)
+            assert cola.procesar_pendientes() == 0
+            assert cola.recuperar() == 0
+
+        cola._activos.discard(lock)
+        os.remove(lock)
+        assert cola.procesar_pendientes() == 1
+        assert cola.estado("checklist.xlsx") == "copiado"
+
+
+class TestBulkService:
+    """Tests para la generación en lote"""
+
+    def test_preparar_registro(self):
+        """Test para normalizar respuestas y validar campos"""
+        from app.services.bulk_service import BulkService
+
+        registro = {
+            "tipo": "macos",
+            "activo_fijo": "1",
+            "propietario": "Ana",
+            "cargo": "Dev",
+            "tecnico": "Luis",
+            "respuestas": {"1": "OK", "2": "PD"},
+        }
+
+        tipo, respuestas, session_data = BulkService.preparar_registro(registro)
+
+        assert tipo == "macos"
+        assert respuestas[1] == "OK" and respuestas[2] == "PD"
+        assert respuestas[20] == "N/A"
+        assert session_data["tecnico"] == "Luis"
+
+        with pytest.raises(ValueError):
+            BulkService.preparar_registro({**registro, "tecnico": ""})
+
+    def test_generar_lote(self, app_context, tmp_path):
+        """Test para generar un lote en el pool con errores por registro"""
+        import json
+        import zipfile
+        from app.services.bulk_service import BulkService
+
+        app = app_context
+        app.config["OUTPUT_DIR"] = str(tmp_path / "output")
+
+        base = {"propietario": "Ana", "cargo": "Dev", "tecnico": "Luis"}
+        registros = [
+            {**base, "tipo": "pc", "activo_fijo": "1", "respuestas": ["OK"] * 75},
+            {**base, "tipo": "tablets", "activo_fijo": "2"},
+            {**base, "tipo": "inexistente", "activo_fijo": "3"},
+        ]
+
+        destino = tmp_path / "lote.zip"
+        resumen = BulkService.generar_lote(registros, str(destino), max_workers=2)
+
+        assert resumen["exitosos"] == 2
+        assert resumen["fallidos"] == 1
+        assert resumen["items"][2]["ok"] is False
+        assert resumen["checklists_por_segundo"] > 0
+
+        with zipfile.ZipFile(destino) as zin:
+            nombres = zin.namelist()
+            assert resumen["items"][0]["nombre_archivo"] in nombres
+            assert json.loads(zin.read("resumen.json"))["total"] == 3
+            assert zin.testzip() is None
+
+        # Se genera en memoria: nada se escribe en OUTPUT_DIR
+        assert not (tmp_path / "output").exists()
+
+    def test_iterar_registros_csv(self, tmp_path):
+        """Test para leer un CSV con columnas pregunta_<n> y filas inválidas"""
+        from app.services.bulk_service import BulkService, RegistroInvalido
+
+        entrada = tmp_path / "inventario.csv"
+        entrada.write_text(
+            "tipo,activo_fijo,propietario,cargo,tecnico,pregunta_1,pregunta_3\n"
+            "pc,1,Ana,Dev,Luis,OK,\n"
+            'pc,2,Ana,Dev,Luis,OK,PD,"columna de más"\n',
+            encoding="utf-8",
+        )
+
+        (l1, registro, fila), (l2, invalido, _) = BulkService.iterar_registros(
+            str(entrada)
+        )
+
+        assert (l1, l2) == (2, 3)
+        assert registro["respuestas"] == {1: "OK"}
+        assert fila["pregunta_3"] == ""
+        assert isinstance(invalido, RegistroInvalido)
+
+    def test_generar_flujo(self, app_context, tmp_path):
+        """Test para generar desde JSONL en el pool y anotar los rechazos"""
+        import json
+        from app.services.bulk_service import BulkService, ArchivoRechazos
+
+        app = app_context
+        app.config["OUTPUT_DIR"] = str(tmp_path / "output")
+
+        base = {"propietario": "Ana", "cargo": "Dev", "tecnico": "Luis"}
+        entrada = tmp_path / "inventario.jsonl"
+        entrada.write_text(
+            json.dumps({**base, "tipo": "pc", "activo_fijo": "1"})
+            + "\n{no es json\n\n"
+            + json.dumps({**base, "tipo": "tablets", "activo_fijo": "2"})
+            + "\n"
+            + json.dumps({**base, "tipo": "pc", "activo_fijo": "1"})
+            + "\n",
+            encoding="utf-8",
+        )
+        avances = []
+
+        with ArchivoRechazos(str(tmp_path / "rechazos.jsonl"), "jsonl") as rechazos:
+            resumen = BulkService.generar_flujo(
+                BulkService.iterar_registros(str(entrada)),
+                rechazos=rechazos,
+                max_workers=2,
+                al_avanzar=lambda parcial: avances.append(dict(parcial)),
+            )
+
+        assert resumen["total"] == 4
+        assert resumen["exitosos"] == 2
+        assert resumen["rechazados"] == 2
+        assert resumen["copiados_red"] == 0
+        assert avances[-1]["exitosos"] == 2
+        assert len(list((tmp_path / "output").rglob("*.xlsx"))) == 2
+
+        lineas = (tmp_path / "rechazos.jsonl").read_text(encoding="utf-8")
+        rechazados = [json.loads(linea) for linea in lineas.splitlines()]
+        assert [r["linea"] for r in rechazados] == [2, 5]
+        assert "duplicado" in rechazados[1]["error"]
+
+
+class TestGenerationPool:
+    """Tests para el pool acotado de generación de Excel"""
+
+    def test_generar_en_pool(self, app_context, tmp_path):
+        """Test para generar en un hilo del pool y registrar la espera"""
+        from app.services.generation_pool import GenerationPool
+
+        app = app_context
+        app.config["OUTPUT_DIR"] = str(tmp_path)
+        app.config["GENERATION_POOL_MODE"] = "thread"
+
+        pool = GenerationPool()
+        pool.init_app(app)
+
+        session_data = {
+            "activo_fijo": "123",
+            "propietario": "Ana",
+            "cargo": "Dev",
+            "tecnico": "Luis",
+        }
+        ruta, nombre = pool.generar("macos", {1: "OK"}, session_data)
+
+        assert os.path.exists(ruta)
+        estadisticas = pool.estadisticas()
+        assert estadisticas["completadas"] == 1
+        assert estadisticas["en_cola"] == 0 and estadisticas["en_ejecucion"] == 0
+
+    def test_pool_saturado(self, app_context, monkeypatch):
+        """Test para rechazar peticiones cuando no hay cupo"""
+        import threading
+        from app.services.generation_pool import GenerationPool, PoolSaturado
+
+        app = app_context
+        app.config["GENERATION_POOL_MODE"] = "thread"
+        app.config["GENERATION_POOL_WORKERS"] = 1
+        app.config["GENERATION_POOL_QUEUE"] = 0
+        app.config["GENERATION_POOL_RETRY_AFTER"] = 7
+
+        iniciado = threading.Event()
+        liberar = threading.Event()
+
+        def generar_lento(tipo, respuestas, session_data):
+            iniciado.set()
+            liberar.wait(5)
+            return "ruta", "nombre"
+
+        monkeypatch.setattr(ExcelService, "generar_excel", generar_lento)
+
+        pool = GenerationPool()
+        pool.init_app(app)
+
+        def ocupar():
+            with app.app_context():
+                pool.generar("macos", {}, {})
+
+        hilo = threading.Thread(target=ocupar)
+        hilo.start()
+        assert iniciado.wait(5)
+
+        with pytest.raises(PoolSaturado) as error:
+            pool.generar("macos", {}, {})
+        assert error.value.retry_after == 7
+
+        liberar.set()
+        hilo.join(5)
+
+        estadisticas = pool.estadisticas()
+        assert estadisticas["rechazadas"] == 1
+        assert estadisticas["completadas"] == 1
+        assert pool.generar("macos", {}, {}) == ("ruta", "nombre")
+
+    def test_guardados_concurrentes_reciben_503(self, tmp_path, monkeypatch):
+        """Test para rechazar con 503 los guardados que exceden el pool"""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        app = create_app(
+            {
+                **config_aislada(tmp_path),
+                "GENERATION_POOL_MODE": "thread",
+                "GENERATION_POOL_WORKERS": 1,
+                "GENERATION_POOL_QUEUE": 1,
+                "GENERATION_POOL_RETRY_AFTER": 3,
+                "COPY_QUEUE_ENABLED": False,
+                "SUBMISSIONS_ENABLED": False,
+                "OUTPUT_DIR": str(tmp_path / "salida"),
+                "SHARED_NETWORK_PATH": str(tmp_path / "red"),
+            },
+            background_services=False,
+        )
+        app.config["TESTING"] = True
+
+        en_curso = threading.Semaphore(0)
+        liberar = threading.Event()
+
+        def generar_lento(tipo, respuestas, session_data):
+            en_curso.release()
+            liberar.wait(10)
+            ruta = tmp_path / "salida" / "checklist.xlsx"
+            ruta.parent.mkdir(exist_ok=True)
+            ruta.write_bytes(b"xlsx")
+            return str(ruta), "checklist.xlsx"
+
+        monkeypatch.setattr(ExcelService, "generar_excel", generar_lento)
+
+        def guardar(_):
+            client = app.test_client()
+            with client.session_transaction() as sesion:
+                sesion.update(
+                    activo_fijo="1", propietario="Ana", cargo="Dev", tecnico="Luis"
+                )
+            return client.post("/checklist/guardar/macos", data={"pregunta_1": "OK"})
+
+        # 1 en ejecución + 1 en cola ocupan el pool; los demás se rechazan
+        # sin esperar a que termine la generación en curso
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futuros = [executor.submit(guardar, i) for i in range(5)]
+            assert en_curso.acquire(timeout=5)
+
+            terminados = []
+            for futuro in as_completed(futuros, timeout=10):
+                terminados.append(futuro.result())
+                if len(terminados) == 3:
+                    break
+            assert [r.status_code for r in terminados] == [503] * 3
+
+            liberar.set()
+            respuestas = [f.result(10) for f in futuros]
+
+        codigos = sorted(r.status_code for r in respuestas)
+        assert codigos == [302, 302, 503, 503, 503]
+        assert all(
+            r.headers["Retry-After"] == "3" for r in respuestas if r.status_code == 503
+        )
+
+
+class TestHttpCache:
+    """Tests para ETags, caché de páginas y estáticos con huella"""
+
+    def test_etag_y_304(self, client):
+        """Test para responder 304 cuando el navegador tiene la versión vigente"""
+        respuesta = client.get("/")
+        etag = respuesta.headers["ETag"]
+
+        assert respuesta.status_code == 200
+        assert "no-cache" in respuesta.headers["Cache-Control"]
+
+        revalidacion = client.get("/", headers={"If-None-Match": etag})
+        assert revalidacion.status_code == 304
+        assert revalidacion.data == b""
+
+    def test_cambio_de_version_invalida(self, client, monkeypatch):
+        """Test para invalidar ETag y página cacheada al cambiar los checklists"""
+        from app.models import checklist_data
+
+        etag = client.get("/checklist/formulario/pc").headers["ETag"]
+
+        monkeypatch.setattr(checklist_data, "get_version", lambda: "otra")
+        respuesta = client.get(
+            "/checklist/formulario/pc", headers={"If-None-Match": etag}
+        )
+
+        assert respuesta.status_code == 200
+        assert respuesta.headers["ETag"] != etag
+
+    def test_estaticos_con_huella(self, client):
+        """Test para servir como inmutables solo las URLs con huella vigente"""
+        import re
+
+        html = client.get("/").get_data(as_text=True)
+        url = re.search(r"/static/img/favicon\.ico\?v=[0-9a-f]+", html).group(0)
+
+        inmutable = client.get(url)
+        assert "immutable" in inmutable.headers["Cache-Control"]
+
+        sin_huella = client.get("/static/img/favicon.ico")
+        assert "immutable" not in (sin_huella.headers.get("Cache-Control") or "")
+
+        obsoleta = client.get("/static/img/favicon.ico?v=000000000000")
+        assert "immutable" not in (obsoleta.headers.get("Cache-Control") or "")
+
+
+class TestMetricas:
+    """Tests para las métricas en formato Prometheus"""
+
+    def test_histograma_y_contador(self):
+        """Test para exponer buckets acumulados, suma, conteo y contadores"""
+        from app.services.metrics import Metricas
+
+        metricas = Metricas()
+        metricas.observar("checklist_etapa_segundos", 0.003, etapa="llenado")
+        metricas.observar("checklist_etapa_segundos", 0.2, etapa="llenado")
+        metricas.observar("checklist_etapa_segundos", 99, etapa="llenado")
+        metricas.incrementar("copias_red_total", resultado="copiado")
+
+        texto = metricas.exponer()
+
+        serie = 'checklist_etapa_segundos_bucket{etapa="llenado",le='
+        assert f'{serie}"0.005"}} 1' in texto
+        assert f'{serie}"0.25"}} 2' in texto
+        assert f'{serie}"+Inf"}} 3' in texto
+        assert 'checklist_etapa_segundos_count{etapa="llenado"} 3' in texto
+        assert 'copias_red_total{resultado="copiado"} 1' in texto
+        assert "# TYPE checklist_etapa_segundos histogram" in texto
+
+    def test_agregar_procesos(self, tmp_path):
+        """Test para sumar los valores volcados por varios procesos"""
+        from app.services.metrics import Metricas
+
+        worker_1, worker_2 = Metricas(), Metricas()
+        for worker in (worker_1, worker_2):
+            worker.directorio = str(tmp_path)
+            worker._archivo = f"{id(worker)}.json"
+            worker.incrementar("checklists_generados_total", tipo="pc", resultado="ok")
+            worker.observar("http_peticion_segundos", 0.01, endpoint="main.index")
+            worker.volcar()
+
+        texto = worker_1.exponer()
+
+        assert 'checklists_generados_total{resultado="ok",tipo="pc"} 2' in texto
+        assert 'http_peticion_segundos_count{endpoint="main.index"} 2' in texto
+
+        Metricas.limpiar_directorio(str(tmp_path))
+        assert os.listdir(tmp_path) == []
+
+    def test_consolidar_procesos_terminados(self, tmp_path):
+        """Test para sumar los archivos de procesos muertos sin perder valores"""
+        from app.services.metrics import Metricas, ARCHIVO_RETIRADOS
+
+        # Dos procesos ya terminados (pid inexistente) y este proceso
+        for archivo in ("999999991-1.json", "999999992-1.json", None):
+            worker = Metricas()
+            worker.directorio = str(tmp_path)
+            worker._archivo = archivo or worker._archivo
+            worker.incrementar("copias_red_total", resultado="ok")
+            worker.observar("copia_red_segundos", 0.2)
+            worker.volcar()
+
+        antes = worker.exponer()
+        assert Metricas.consolidar_directorio(tmp_path) == 2
+        assert Metricas.consolidar_directorio(tmp_path) == 0
+
+        nombres = {n for n in os.listdir(tmp_path) if n.endswith(".json")}
+        assert nombres == {ARCHIVO_RETIRADOS, worker._archivo}
+        assert worker.exponer() == antes
+        assert 'copias_red_total{resultado="ok"} 3' in antes
+
+    def test_endpoint_metrics(self, client):
+        """Test para exponer las etapas de la generación en /metrics"""
+        with client.session_transaction() as sesion:
+            sesion.update(activo_fijo="1", propietario="A", cargo="B", tecnico="C")
+
+        client.get("/")
+        respuesta = client.get("/metrics")
+        texto = respuesta.get_data(as_text=True)
+
+        assert respuesta.status_code == 200
+        assert respuesta.headers["Content-Type"].startswith("text/plain")
+        assert 'http_peticiones_total{endpoint="main.index"' in texto
+
+
+class TestProfiler:
+    """Tests para el perfilado opcional de peticiones"""
+
+    def test_perfilador_collapsed(self):
+        """Test para muestrear la pila y escribirla en formato collapsed"""
+        import threading
+        import time
+        from app.services.profiler import PerfiladorMuestreo
+
+        def trabajo_lento():
+            fin = time.perf_counter() + 0.05
+            while time.perf_counter() < fin:
+                pass
+
+        perfilador = PerfiladorMuestreo(threading.get_ident(), 0.001)
+        perfilador.iniciar()
+        trabajo_lento()
+        perfilador.detener()
+
+        lineas = perfilador.collapsed().splitlines()
+        assert lineas
+        pila, cantidad = lineas[0].rsplit(" ", 1)
+        assert int(cantidad) > 0
+        assert any("trabajo_lento" in linea for linea in lineas)
+
+    def test_encabezado_y_retencion(self, tmp_path, tmp_path_factory):
+        """Test para perfilar con el secreto y conservar solo los últimos"""
+        app = create_app(
+            {
+                **config_aislada(tmp_path_factory.mktemp("data")),
+                "PROFILING_ENABLED": True,
+                "PROFILING_SECRET": "clave",
+                "PROFILING_DIR": str(tmp_path),
+                "PROFILING_MAX_FILES": 2,
+            },
+            background_services=False,
+        )
+        client = app.test_client()
+
+        sin_secreto = client.get("/", headers={"X-Profile": "otra"})
+        assert "X-Profile-File" not in sin_secreto.headers
+
+        for _ in range(3):
+            client.get("/checklist/formulario/pc", headers={"X-Profile": "clave"})
+
+        guardados = sorted(os.listdir(tmp_path))
+        assert len(guardados) <= 2
+        assert all(nombre.endswith(".collapsed") for nombre in guardados)
+
+
+class TestLogPipeline:
+    """Tests para el logging en segundo plano con rotación"""
+
+    def test_rotacion_por_tamano_y_compresion(self, tmp_path, monkeypatch):
+        """Test para rotar al superar el tamaño, comprimir y conservar N"""
+        import glob
+        import logging
+        import time
+        from app.services import log_pipeline
+        from app.services.log_pipeline import ArchivoLogRotativo
+
+        monkeypatch.setattr(log_pipeline, "GRACIA_COMPRESION", 0)
+
+        ruta = tmp_path / "app.log"
+        handler = ArchivoLogRotativo(
+            ruta, max_bytes=200, cuando="", respaldos=2, comprimir=True
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+
+        for i in range(40):
+            handler.emit(logging.makeLogRecord({"msg": f"linea {i:03d} " + "x" * 20}))
+        handler.close()
+
+        time.sleep(0.3)  # la compresión corre en un hilo aparte
+        respaldos = glob.glob(str(tmp_path / "app.log.*.gz"))
+
+        assert ruta.stat().st_size <= 200
+        assert 1 <= len(respaldos) <= 2
+        assert "linea 039" in ruta.read_text()
+
+    def test_cola_y_json(self, tmp_path):
+        """Test para escribir desde el listener en formato JSON"""
+        import json
+        import logging
+        from app.services.log_pipeline import configurar_logger
+
+        logger = logging.getLogger("test_log_pipeline")
+        config = {
+            "LOG_LEVEL": "INFO",
+            "LOG_FILE": str(tmp_path / "app.log"),
+            "LOG_JSON": True,
+        }
+
+        manejador = configurar_logger(logger, config)
+        logger.info("Excel generado: %s", "prueba.xlsx")
+        configurar_logger(logger, config)  # reconfigurar no duplica handlers
+        manejador.detener()
+
+        assert len(logger.handlers) == 1
+        registro = json.loads((tmp_path / "app.log").read_text().splitlines()[0])
+        assert registro["mensaje"] == "Excel generado: prueba.xlsx"
+        assert registro["nivel"] == "INFO"
+
+    def test_sin_handler_por_defecto_de_flask(self, tmp_path):
+        """Test para no duplicar registros con el handler de Flask"""
+        import logging
+        from flask.logging import default_handler
+        from app.services.log_pipeline import configurar_logger
+
+        # Flask lo agrega cuando ningún handler del logger atiende el nivel
+        logger = logging.getLogger("test_default_handler")
+        logger.addHandler(default_handler)
+        config = {"LOG_LEVEL": "INFO", "LOG_FILE": str(tmp_path / "app.log")}
+
+        manejador = configurar_logger(logger, config)
+        manejador.detener()
+
+        assert logger.handlers == [manejador]
+
+
+class TestSesiones:
+    """Tests para las sesiones en el servidor"""
+
+    def test_memoria_ttl_y_lru(self, monkeypatch):
+        """Test para expirar sesiones y descartar las menos usadas"""
+        import time
+        from app.services.session_store import AlmacenMemoria
+
+        almacen = AlmacenMemoria(max_sesiones=2)
+        ahora = time.time()
+        almacen.guardar("a", {"tecnico": "Ana"}, ahora + 60)
+        almacen.guardar("b", {"tecnico": "Beto"}, ahora + 60)
+        almacen.obtener("a")  # "b" pasa a ser la menos usada
+        almacen.guardar("c", {"tecnico": "Caro"}, ahora + 60)
+
+        assert almacen.obtener("b") is None
+        assert almacen.obtener("a")[0] == {"tecnico": "Ana"}
+
+        monkeypatch.setattr(time, "time", lambda: ahora + 120)
+        assert almacen.obtener("a") is None
+        assert almacen.purgar() == 1
+        assert len(almacen) == 0
+
+    def test_sqlite_compartida_y_ttl(self, tmp_path):
+        """Test para compartir sesiones entre instancias y purgar expiradas"""
+        import time
+        from app.services.session_store import AlmacenSqlite
+
+        ruta = tmp_path / "sesiones.sqlite3"
+        almacen = AlmacenSqlite(ruta)
+        almacen.guardar("vigente", {"activo_fijo": "AF-1"}, time.time() + 60)
+        almacen.guardar("vencida", {"activo_fijo": "AF-2"}, time.time() - 1)
+
+        otro_worker = AlmacenSqlite(ruta)
+        assert otro_worker.obtener("vigente")[0] == {"activo_fijo": "AF-1"}
+        assert otro_worker.obtener("vencida") is None
+        assert otro_worker.purgar() == 1
+        assert len(almacen) == 1
+
+    def test_flujo_con_cookie_de_id(self, tmp_path):
+        """Test para guardar datos en el servidor y enviar la cookie una vez"""
+        app = create_app(
+            {**config_aislada(tmp_path), "SESSION_TYPE": "sqlite"},
+            background_services=False,
+        )
+        client = app.test_client()
+
+        respuesta = client.post(
+            "/checklist/formulario/pc",
+            data={
+                "activo_fijo": "AF-9",
+                "propietario": "Ana",
+                "cargo": "Analista",
+                "tecnico": "Luis",
+            },
+        )
+        cookie = respuesta.headers["Set-Cookie"]
+        assert "AF-9" not in cookie and "HttpOnly" in cookie
+
+        checklist = client.get("/checklist/pc")
+        assert checklist.status_code == 200
+        assert "Set-Cookie" not in checklist.headers
+
+        limpiar = client.get("/home")
+        assert "Set-Cookie" in limpiar.headers
+        assert len(app.session_interface.almacen) == 0
+
+        sin_sesion = client.get("/checklist/pc")
+        assert sin_sesion.status_code == 302
+        assert "formulario" in sin_sesion.headers["Location"]
+
+
+class TestSubmissionStore:
+    """Tests para el registro indexado de envíos"""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        from app.services.submission_store import SubmissionStore
+
+        class App:
+            config = {
+                "SUBMISSIONS_ENABLED": True,
+                "SUBMISSIONS_DB": tmp_path / "envios.sqlite3",
+            }
+
+        store = SubmissionStore()
+        store.init_app(App)
+        return store
+
+    def test_filtros_y_estado(self, store):
+        """Test para filtrar por activo, técnico, fechas y estado"""
+        from datetime import datetime
+
+        store.registrar(
+            "pc",
+            {"activo_fijo": "AF-1", "tecnico": "Luis"},
+            {1: "OK", 2: "PD"},
+            creado=datetime(2025, 3, 1, 10),
+        )
+        store.registrar(
+            "macos",
+            {"activo_fijo": "AF-1", "tecnico": "Ana"},
+            {1: "OK", 2: "N/A"},
+            creado=datetime(2025, 3, 2, 9),
+        )
+        store.registrar(
+            "pc",
+            {"activo_fijo": "AF-2", "tecnico": "luis"},
+            {1: "OK", 2: "OK"},
+            creado=datetime(2025, 3, 5, 18),
+        )
+
+        activo = store.buscar(activo_fijo="af-1")["envios"]
+        assert [e["tipo"] for e in activo] == ["macos", "pc"]
+
+        assert len(store.buscar(tecnico="LUIS")["envios"]) == 2
+        assert len(store.buscar(desde="2025-03-02", hasta="2025-03-05")["envios"]) == 2
+
+        pendientes = store.buscar(estado="pendiente")["envios"]
+        assert len(pendientes) == 1
+        assert pendientes[0]["total_pd"] == 1
+
+        with pytest.raises(ValueError):
+            store.buscar(desde="05/03/2025")
+
+    def test_paginacion_por_cursor(self, store):
+        """Test para recorrer todas las páginas sin repetir envíos"""
+        for i in range(7):
+            store.registrar("pc", {"activo_fijo": f"AF-{i}", "tecnico": "T"}, {})
+
+        vistos, cursor = [], None
+        while True:
+            pagina = store.buscar(tecnico="t", cursor=cursor, limite=3)
+            vistos += [e["id"] for e in pagina["envios"]]
+            cursor = pagina["siguiente"]
+            if cursor is None:
+                break
+
+        assert len(vistos) == 7
+        assert vistos == sorted(vistos, reverse=True)
+
+    def test_api_envios(self, tmp_path):
+        """Test para buscar y consultar envíos por la API"""
+        from app.services.submission_store import submission_store
+
+        app = create_app(config_aislada(tmp_path), background_services=False)
+        client = app.test_client()
+
+        envio_id = submission_store.registrar(
+            "pc", {"activo_fijo": "AF-7", "tecnico": "Luis"}, {1: "OK"}, "af7.xlsx"
+        )
+
+        busqueda = client.get("/api/envios?activo_fijo=AF-7").get_json()
+        assert busqueda["data"]["envios"][0]["nombre_archivo"] == "af7.xlsx"
+
+        detalle = client.get(f"/api/envios/{envio_id}").get_json()
+        assert detalle["data"]["respuestas"] == {"1": "OK"}
+
+        assert client.get("/api/envios?desde=ayer").status_code == 400
+        assert client.get("/api/envios/999").status_code == 404
+
+
+class TestReportService:
+    """Tests para el reporte consolidado y la lectura de checklists generados"""
+
+    def test_reporte_envios_api(self, tmp_path):
+        """Test para descargar el último envío de cada equipo en un workbook"""
+        import io
+        from datetime import datetime
+        from openpyxl import load_workbook
+        from app.services.submission_store import submission_store
+
+        app = create_app(config_aislada(tmp_path), background_services=False)
+        client = app.test_client()
+
+        for activo, dia, respuestas in (
+            ("AF-1", 1, {1: "PD"}),
+            ("AF-1", 3, {1: "OK", 2: "N/A"}),
+            ("AF-2", 2, {1: "OK"}),
+        ):
+            submission_store.registrar(
+                "pc",
+                {"activo_fijo": activo, "tecnico": "Luis"},
+                respuestas,
+                creado=datetime(2026, 7, dia),
+            )
+        submission_store.registrar("macos", {"activo_fijo": "AF-3", "tecnico": "A"}, {})
+
+        response = client.get("/api/reporte/pc?desde=2026-07-01&hasta=2026-09-30")
+        assert response.status_code == 200
+        assert response.headers["X-Reporte-Filas"] == "2"
+
+        ws = load_workbook(io.BytesIO(response.data)).active
+        filas = list(ws.iter_rows(values_only=True))
+        assert filas[0][7].startswith("1. ")
+        assert ws.max_column == 7 + 75
+        assert [(f[0], f[7], f[8]) for f in filas[1:]] == [
+            ("AF-1", "OK", "N/A"),
+            ("AF-2", "OK", None),
+        ]
+
+        todos = client.get("/api/reporte/pc?todos=1")
+        assert todos.headers["X-Reporte-Filas"] == "3"
+        assert client.get("/api/reporte/pc?desde=julio").status_code == 400
+        assert client.get("/api/reporte/inexistente").status_code == 400
+
+    def test_reporte_archivos(self, app_context, tmp_path):
+        """Test para leer los .xlsx de OUTPUT_DIR en modo read-only"""
+        from openpyxl import load_workbook
+        from app.services.lector_checklist import leer_checklist
+        from app.services.report_service import ReportService
+
+        app = app_context
+        app.config["OUTPUT_DIR"] = str(tmp_path / "output")
+        os.makedirs(app.config["OUTPUT_DIR"])
+
+        sesion = {"activo_fijo": "77", "propietario": "Ana María", "cargo": "Dev"}
+        ruta, _ = ExcelService.generar_excel(
+            "tablets", {1: "OK", 2: "PD"}, {**sesion, "tecnico": "Luis"}
+        )
+        ExcelService.generar_excel("tablets", {1: "N/A"}, {**sesion, "cargo": "QA"})
+        ExcelService.generar_excel("pc", {1: "OK"}, {**sesion, "activo_fijo": "78"})
+
+        leido = leer_checklist(ruta)
+        assert leido["activo_fijo"] == "77"
+        assert leido["respuestas"][1] == "OK" and leido["respuestas"][2] == "PD"
+        assert leido["tecnico"] == "Luis"
+        assert leido["validador"] == app.config["DEFAULT_VALIDATOR"]
+
+        destino = tmp_path / "reporte.xlsx"
+        resumen = ReportService.generar_reporte(
+            "tablets", str(destino), fuente="archivos", todos=True
+        )
+        assert resumen["filas"] == 2
+
+        filas = list(load_workbook(destino).active.iter_rows(values_only=True))[1:]
+        assert sorted((f[1], f[2]) for f in filas) == [
+            ("Ana-María", "Dev"),
+            ("Ana-María", "QA"),
+        ]
+        ultimos = ReportService.generar_reporte(
+            "tablets", str(destino), fuente="archivos"
+        )
+        assert ultimos["filas"] == 1
+
+    def test_lector_incremental(self, app_context, tmp_path, monkeypatch):
+        """Test para leer en el pool y releer solo los archivos nuevos o cambiados"""
+        from app.services import lector_checklist
+        from app.services.lector_checklist import LectorChecklists
+
+        app = app_context
+        app.config["OUTPUT_DIR"] = str(tmp_path / "output")
+        os.makedirs(app.config["OUTPUT_DIR"])
+        sesion = {"propietario": "Ana", "cargo": "Dev", "tecnico": "Luis"}
+        rutas = [
+            ExcelService.generar_excel(
+                "macos", {1: "OK"}, {**sesion, "activo_fijo": str(i)}
+            )[0]
+            for i in range(3)
+        ]
+        (tmp_path / "output" / "otro.xlsx").write_bytes(b"no es un checklist")
+
+        # Todos los faltantes van al pool
+        monkeypatch.setattr(lector_checklist, "MINIMO_POOL", 1)
+        lector = LectorChecklists(app.config, workers=1)
+        registros = list(lector.recorrer())
+        assert lector.estadisticas["leidos"] == 3
+        assert [r["activo_fijo"] for r in registros] == ["0", "1", "2"]
+        assert {r["tipo"] for r in registros} == {"macos"}
+
+        lector = LectorChecklists(app.config)
+        assert len(list(lector.recorrer())) == 3
+        assert lector.estadisticas == {
+            "total": 3,
+            "en_cache": 3,
+            "leidos": 0,
+            "errores": 0,
+        }
+
+        # Un archivo cambiado se relee; uno eliminado sale del caché
+        ExcelService.generar_excel("macos", {1: "PD"}, {**sesion, "activo_fijo": "1"})
+        os.utime(rutas[1], (0, 1_000_000))
+        os.remove(rutas[2])
+
+        lector = LectorChecklists(app.config)
+        registros = list(lector.recorrer())
+        assert lector.estadisticas["leidos"] == 1
+        assert lector.estadisticas["en_cache"] == 1
+        assert registros[1]["respuestas"][1] == "PD"
+        filas = lector.cache._conexiones.obtener().execute(
+            "SELECT COUNT(*) FROM lecturas"
+        )
+        assert filas.fetchone()[0] == 2
+
+
+class TestDisposicionRutas:
+    """Tests para la disposición de OUTPUT_DIR y la compartida"""
+
+    PATRON = "{empresa}/{tipo}/{anio}/{mes}"
+    NOMBRE = "Activo 7 Checklist Proquinal MacOS Ana Dev.xlsx"
+
+    def test_ruta_relativa(self, tmp_path):
+        """Test para ubicar un archivo por checklist y fecha"""
+        from app.services.path_layout import DisposicionRutas
+
+        fecha = datetime(2026, 3, 9)
+        layout = DisposicionRutas(self.PATRON, tmp_path)
+
+        assert layout.relativa(self.NOMBRE, fecha) == os.path.join(
+            "Proquinal", "MacOS", "2026", "03", self.NOMBRE
+        )
+        assert layout.relativa("suelto.xlsx", fecha).startswith("otros")
+        assert DisposicionRutas("", tmp_path).relativa(self.NOMBRE) == self.NOMBRE
+
+        with pytest.raises(ValueError):
+            DisposicionRutas("{empresa}/{semana}", tmp_path)
+
+    def test_generar_y_copiar_en_subdirectorios(self, app_context, tmp_path):
+        """Test para generar y copiar a red con la misma disposición"""
+        app = app_context
+        app.config["OUTPUT_DIR"] = str(tmp_path / "salida")
+        app.config["SHARED_NETWORK_PATH"] = str(tmp_path / "red")
+        app.config["OUTPUT_LAYOUT"] = self.PATRON
+
+        session_data = {
+            "activo_fijo": "7",
+            "propietario": "Ana",
+            "cargo": "Dev",
+            "tecnico": "Luis",
+        }
+        ruta, nombre = ExcelService.generar_excel("macos", {1: "OK"}, session_data)
+        assert FileService.copiar_a_red(ruta, nombre)
+
+        hoy = datetime.now()
+        relativa = os.path.join("Proquinal", "MacOS", f"{hoy:%Y}", f"{hoy:%m}", nombre)
+        assert ruta == str(tmp_path / "salida" / relativa)
+        assert (tmp_path / "red" / relativa).exists()
+
+    def test_migrar_en_paralelo(self, tmp_path):
+        """Test para mover los archivos sueltos sin sobrescribir"""
+        import time
+        from app.services.path_layout import DisposicionRutas
+
+        marzo = time.mktime(datetime(2026, 3, 9).timetuple())
+        for activo in range(20):
+            ruta = tmp_path / self.NOMBRE.replace("7", str(activo))
+            ruta.write_bytes(b"x")
+            os.utime(ruta, (marzo, marzo))
+        (tmp_path / ".gitkeep").write_bytes(b"")
+
+        destino = tmp_path / "Proquinal" / "MacOS" / "2026" / "03"
+        destino.mkdir(parents=True)
+        (destino / self.NOMBRE.replace("7", "0")).write_bytes(b"previo")
+
+        layout = DisposicionRutas(self.PATRON, tmp_path)
+        assert layout.migrar(str(tmp_path), simulacion=True)["movidos"] == 19
+        reporte = layout.migrar(str(tmp_path), workers=4)
+
+        assert reporte["movidos"] == 19 and reporte["conflictos"] == 1
+        assert len(os.listdir(destino)) == 20
+        assert (destino / self.NOMBRE.replace("7", "0")).read_bytes() == b"previo"
+        assert sorted(os.listdir(tmp_path)) == [
+            ".gitkeep",
+            "Activo 0 Checklist Proquinal MacOS Ana Dev.xlsx",
+            "Proquinal",
+        ]
+
+    def test_retencion_en_subdirectorios(self, tmp_path):
+        """Test para aplicar la retención a los archivos de cada subdirectorio"""
+        from app.services.retention import Politica, limpiar_directorio
+
+        destino = tmp_path / "Proquinal" / "MacOS" / "2025" / "01"
+        destino.mkdir(parents=True)
+        TestRetencion.crear(destino, self.NOMBRE, 40)
+        TestRetencion.crear(tmp_path, "reciente.xlsx", 1)
+
+        reporte = limpiar_directorio(str(tmp_path), Politica(max_dias=30))
+
+        assert reporte["eliminados"] == 1
+        assert os.listdir(destino) == []
+        assert (tmp_path / "reciente.xlsx").exists()
+
+
+class TestRetencion:
+    """Tests para la retención del directorio de salida"""
+
+    @staticmethod
+    def crear(directorio, nombre, dias, tamano=100):
+        import time
+
+        ruta = directorio / nombre
+        ruta.write_bytes(b"x" * tamano)
+        momento = time.time() - dias * 86400
+        os.utime(ruta, (momento, momento))
+        return ruta
+
+    def test_politicas_y_simulacion(self, tmp_path):
+        """Test para antigüedad, máximo por activo y tamaño total"""
+        from app.services.retention import Politica, limpiar_directorio
+
+        self.crear(tmp_path, "Activo 1 Checklist Proquinal PC A B.xlsx", 40)
+        self.crear(tmp_path, "Activo 2 Checklist Proquinal PC A B.xlsx", 3)
+        self.crear(tmp_path, "Activo 2 Checklist Proquinal MacOS A B.xlsx", 2)
+        self.crear(tmp_path, "Activo 2 Checklist Proquinal Calypso A B.xlsx", 1)
+        self.crear(tmp_path, "Activo 3 Checklist Proquinal PC A B.xlsx", 5, 2 * 1024**2)
+        self.crear(tmp_path, ".gitkeep", 400)
+
+        politica = Politica(max_dias=30, max_mb=1, max_por_activo=2)
+        simulacion = limpiar_directorio(str(tmp_path), politica, simulacion=True)
+
+        motivos = {a["nombre"]: a["motivo"] for a in simulacion["archivos"]}
+        assert motivos == {
+            "Activo 1 Checklist Proquinal PC A B.xlsx": "antiguedad",
+            "Activo 2 Checklist Proquinal PC A B.xlsx": "por_activo",
+            "Activo 3 Checklist Proquinal PC A B.xlsx": "tamano",
+        }
+        assert len(os.listdir(tmp_path)) == 6  # la simulación no elimina
+
+        reporte = limpiar_directorio(str(tmp_path), politica)
+        assert reporte["eliminados"] == 3
+        assert sorted(os.listdir(tmp_path)) == [
+            ".gitkeep",
+            "Activo 2 Checklist Proquinal Calypso A B.xlsx",
+            "Activo 2 Checklist Proquinal MacOS A B.xlsx",
+        ]
+
+    def test_presupuesto_y_copia_pendiente(self, tmp_path):
+        """Test para repartir la pasada en lotes y respetar la cola de copias"""
+        from app.services.copy_queue import CopyQueue
+        from app.services.retention import Barrido, Politica, limpiar, _reporte_vacio
+
+        salida, journal = tmp_path / "salida", tmp_path / "journal"
+        salida.mkdir()
+        journal.mkdir()
+        for i in range(25):
+            self.crear(salida, f"viejo_{i}.xlsx", 10)
+        (journal / f"{CopyQueue.id_copia('viejo_0.xlsx')}.json").write_text("{}")
+
+        barrido = Barrido(str(salida), Politica(max_dias=7))
+        reporte = _reporte_vacio(simulacion=False)
+        ejecuciones = 1
+        while limpiar(barrido, reporte, 1e-9, 4, str(journal)) is None:
+            ejecuciones += 1
+
+        assert ejecuciones > 1
+        assert reporte["eliminados"] == 24
+        assert reporte["omitidos_copia_pendiente"] == 1
+        assert os.listdir(salida) == ["viejo_0.xlsx"]
+
+    def test_archivar_antes_de_eliminar(self, tmp_path):
+        """Test para archivar en zips diarios antes de eliminar"""
+        import zipfile
+        from app.services.retention import Politica, limpiar_directorio
+
+        salida = tmp_path / "salida"
+        salida.mkdir()
+        ruta = self.crear(salida, "Activo 9 Checklist Proquinal PC A B.xlsx", 45)
+
+        politica = Politica(max_dias=30, archivar_en=str(tmp_path / "archivo"))
+        reporte = limpiar_directorio(str(salida), politica)
+
+        zips = os.listdir(tmp_path / "archivo")
+        assert reporte["archivados"] == 1 and not ruta.exists()
+        assert len(zips) == 1 and zips[0].startswith("checklists-")
+        with zipfile.ZipFile(tmp_path / "archivo" / zips[0]) as zf:
+            assert zf.namelist() == [ruta.name]
+
+
+class TestSincronizacion:
+    """Tests para la sincronización por manifiesto con la compartida"""
+
+    @staticmethod
+    def preparar(app, tmp_path):
+        from app.services.share_sync import Manifiesto
+
+        app.config["OUTPUT_DIR"] = str(tmp_path / "salida")
+        app.config["SHARED_NETWORK_PATH"] = str(tmp_path / "red")
+        (tmp_path / "salida" / "sub").mkdir(parents=True)
+        (tmp_path / "red").mkdir()
+        return Manifiesto(str(tmp_path / "sync.sqlite3"))
+
+    @staticmethod
+    def escribir(ruta, contenido: bytes, hace: float = 60):
+        import time
+
+        ruta.write_bytes(contenido)
+        momento = time.time() - hace
+        os.utime(ruta, (momento, momento))
+
+    def test_copiar_faltantes_y_cambiados(self, app_context, tmp_path):
+        """Test para copiar solo lo que falta o difiere en contenido"""
+        from app.services.share_sync import sincronizar
+
+        manifiesto = self.preparar(app_context, tmp_path)
+        salida, red = tmp_path / "salida", tmp_path / "red"
+        self.escribir(salida / "igual.xlsx", b"igual")
+        self.escribir(red / "igual.xlsx", b"igual")
+        self.escribir(salida / "sub" / "faltante.xlsx", b"nuevo")
+        self.escribir(salida / "cambiado.xlsx", b"local")
+        self.escribir(red / "cambiado.xlsx", b"viejo")
+        self.escribir(red / "solo_red.xlsx", b"x")
+        self.escribir(salida / "reciente.xlsx", b"x", hace=0)
+
+        simulado = sincronizar(str(salida), str(red), manifiesto, simulacion=True)
+        assert simulado["faltantes"] == 1 and simulado["copiados"] == 0
+        assert not (red / "sub").exists()
+
+        reporte = sincronizar(str(salida), str(red), manifiesto, workers=2)
+
+        assert reporte["faltantes"] == 1 and reporte["cambiados"] == 1
+        assert reporte["copiados"] == 2 and reporte["al_dia"] == 1
+        assert reporte["solo_remotos"] == 1 and reporte["omitidos_recientes"] == 1
+        assert (red / "sub" / "faltante.xlsx").read_bytes() == b"nuevo"
+        assert (red / "cambiado.xlsx").read_bytes() == b"local"
+        assert (red / "solo_red.xlsx").exists()
+        assert [e for e in os.listdir(red) if e.startswith(".")] == []
+
+    def test_segunda_pasada_sin_lecturas(self, app_context, tmp_path, monkeypatch):
+        """Test para no copiar ni recalcular hashes si nada cambió"""
+        from app.services import share_sync
+
+        manifiesto = self.preparar(app_context, tmp_path)
+        salida, red = tmp_path / "salida", tmp_path / "red"
+        for i in range(5):
+            self.escribir(salida / f"Activo {i}.xlsx", b"x" * i)
+        share_sync.sincronizar(str(salida), str(red), manifiesto)
+
+        hashes = []
+        original = share_sync.hash_archivo
+        monkeypatch.setattr(
+            share_sync,
+            "hash_archivo",
+            lambda ruta: hashes.append(ruta) or original(ruta),
+        )
+        reporte = share_sync.sincronizar(str(salida), str(red), manifiesto)
+
+        assert reporte["al_dia"] == 5 and reporte["copiados"] == 0
+        assert hashes == []
+
+    def test_omitir_copias_pendientes(self, app_context, tmp_path):
+        """Test para dejar a la cola los archivos que aún tiene pendientes"""
+        from app.services.copy_queue import CopyQueue
+        from app.services.share_sync import sincronizacion
+
+        self.preparar(app_context, tmp_path)
+        ruta = tmp_path / "salida" / "pendiente.xlsx"
+        self.escribir(ruta, b"x")
+        app_context.config["COPY_QUEUE_ENABLED"] = False
+        cola = CopyQueue()
+        cola.init_app(app_context)
+        cola.encolar(str(ruta), ruta.name)
+
+        sincronizacion.init_app(app_context, programar=False)
+        reporte = sincronizacion.ejecutar()
+
+        assert reporte["omitidos_copia_pendiente"] == 1
+        assert not (tmp_path / "red" / ruta.name).exists()
+
+
+class TestBenchmarks:
+    """Tests para las utilidades de la suite de benchmarks"""
+
+    def test_resumir_percentiles(self):
+        """Test para calcular percentiles y throughput"""
+        from benchmarks.medicion import resumir
+
+        resultado = resumir("caso", "excel", [i / 1000 for i in range(1, 101)], 2.0)
+
+        assert resultado["n"] == 100
+        assert resultado["p50_ms"] == pytest.approx(50.5)
+        assert resultado["p99_ms"] == pytest.approx(99.01)
+        assert resultado["throughput_por_s"] == 50.0
+
+    def test_comparar_regresiones(self):
+        """Test para detectar regresiones del p95 sobre el umbral"""
+        from benchmarks.run import comparar
+
+        anterior = [{"nombre": "a", "p95_ms": 10.0}, {"nombre": "b", "p95_ms": 10.0}]
+        actual = [{"nombre": "a", "p95_ms": 11.0}, {"nombre": "b", "p95_ms": 15.0}]
+
+        regresiones = comparar(actual, anterior, umbral=20)
+
+        assert [r[0] for r in regresiones] == ["b"]
+
+
 class TestIntegration:
     """Tests de integración"""
 
@@ -232,6 +1919,40 @@ class TestIntegration:
 
                 shutil.rmtree("test_output")
 
+    def test_descarga_directa_sin_copia_local(self, app, tmp_path):
+        """Test del modo descarga: el Excel se genera en memoria y se transmite"""
+        from io import BytesIO
+        from openpyxl import load_workbook
+
+        app.config["OUTPUT_DIR"] = str(tmp_path / "salida")
+        app.config["SHARED_NETWORK_PATH"] = str(tmp_path / "red")
+        app.config["EXCEL_DELIVERY"] = "download"
+        app.config["DOWNLOAD_SAVE_LOCAL"] = False
+        app.config["WTF_CSRF_ENABLED"] = False
+        os.makedirs(app.config["OUTPUT_DIR"])
+
+        client = app.test_client()
+        with client.session_transaction() as sesion:
+            sesion.update(
+                activo_fijo="777",
+                propietario="Ana",
+                cargo="Dev",
+                tecnico="Luis",
+            )
+
+        respuesta = client.post("/checklist/guardar/macos", data={"pregunta_1": "OK"})
+
+        assert respuesta.status_code == 200
+        assert respuesta.headers["X-Checklist-Copia"] == "copiado"
+        assert "attachment" in respuesta.headers["Content-Disposition"]
+
+        wb = load_workbook(BytesIO(respuesta.data))
+        assert "Técnico: Luis" in wb.active.cell(wb.active.max_row, 1).value
+
+        # Sin copia local; la compartida se escribe desde el mismo buffer
+        assert os.listdir(app.config["OUTPUT_DIR"]) == []
+        assert len(os.listdir(app.config["SHARED_NETWORK_PATH"])) == 1
+
 
 class TestHelpers:
     """Tests para funciones auxiliares"""